@@ -1,341 +1,548 @@
 import sqlite3
 import re
 import csv
+import contextlib
+import functools
+import gzip
 import io
-from datetime import datetime, date, timedelta
-from zoneinfo import ZoneInfo
+import multiprocessing
+import os
+import threading
+import weakref
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
 import streamlit as st
 
+from rkl_extract import (
+    detect_captains, detect_postseason_info, extract_game_result, extract_mentions,
+    extract_mentions_by_team, forget_team_aliases, guess_kind, guess_teams, init_review_schema,
+    rebuild_team_aliases, record_team_aliases, team_key,
+)
+from rkl_extract.auto import extract_thread, infer_game_date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 DB = "rkl.db"
-EASTERN = ZoneInfo("America/New_York")
 
 # ----------------------------
 # DB helpers
 # ----------------------------
+# Every session reads on its own connection; all writes in this process go
+# through one writer connection (or a background worker's own) under
+# _write_lock, so reviewers never queue on each other's SQLite locks.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",     # durable at WAL checkpoints, no fsync per commit
+    "PRAGMA cache_size=-65536",      # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",    # read up to 256 MiB through the page map
+    "PRAGMA temp_store=MEMORY",
+)
+# Seconds a connection waits for another process's lock before failing
+BUSY_TIMEOUT = 30
+
+def connect(path: str | None = None, readonly: bool = False) -> sqlite3.Connection:
+    """A tuned connection to rkl.db (or path); readonly ones refuse writes."""
+    con = sqlite3.connect(path or DB, check_same_thread=False, timeout=BUSY_TIMEOUT)
+    con.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        con.execute(pragma)
+    if readonly:
+        con.execute("PRAGMA query_only=ON")
+    else:
+        con.set_trace_callback(_note_write)
+    return con
+
 @st.cache_resource
 def db():
-    con = sqlite3.connect(DB, check_same_thread=False)
-    con.row_factory = sqlite3.Row
+    """The writer connection, shared by every session; use it through transaction()."""
+    con = connect()
+    # Readers see the last commit while a write is in progress (persists in the file)
+    con.execute("PRAGMA journal_mode=WAL")
     _init_db(con)
     return con
 
+# Background workers bind their own connection here so they never share
+# the UI's connection (and its open transaction) across threads; tx is the
+# connection of the transaction this thread has open, if any
+_thread_con = threading.local()
+_write_lock = threading.RLock()
+
+def _writer() -> sqlite3.Connection:
+    return getattr(_thread_con, "con", None) or db()
+
+def _bound_connection() -> sqlite3.Connection | None:
+    """This thread's open transaction or a worker's own connection, if any."""
+    return getattr(_thread_con, "tx", None) or getattr(_thread_con, "con", None)
+
+class _SessionReader:
+    """A session's read connection, closed once Streamlit drops the session's state."""
+
+    def __init__(self):
+        self.con = connect(readonly=True)
+        weakref.finalize(self, self.con.close)
+
+def _session_reader() -> sqlite3.Connection:
+    """The session's read connection; only for script-run threads (workers have no session)."""
+    if "_read_con" not in st.session_state:
+        db()  # schema and WAL before the first read
+        st.session_state["_read_con"] = _SessionReader()
+    return st.session_state["_read_con"].con
+
+def _reader() -> sqlite3.Connection:
+    """This thread's open transaction, a worker's own connection, or the session's read connection."""
+    return _bound_connection() or _session_reader()
+
+@contextlib.contextmanager
+def transaction():
+    """
+    Serialized write transaction: commits on success, rolls back on error.
+    q() inside the block reads through it, so it sees the block's own writes.
+    Nested blocks join the outer transaction.
+    """
+    with _write_lock:
+        if getattr(_thread_con, "tx", None) is not None:
+            yield _thread_con.tx
+            return
+        con = _writer()
+        query_cache.check_external()
+        # A connection's data_version only moves for other connections' commits,
+        # and _write_lock keeps this process's other writers out until we are done
+        version = con.execute("PRAGMA data_version").fetchone()[0]
+        _thread_con.tx = con
+        _thread_con.written = written = set()
+        try:
+            with con:
+                yield con
+        finally:
+            _thread_con.tx = None
+            _thread_con.written = None
+            external = con.execute("PRAGMA data_version").fetchone()[0] != version
+            # After the commit (or rollback), so no reader caches the old rows again
+            query_cache.bump(written, external)
+
 def q(sql, params=()):
-    return db().execute(sql, params).fetchall()
+    con = _bound_connection()
+    if con is not None:
+        # Transactions must see their own writes; workers read their own connection
+        return con.execute(sql, params).fetchall()
+    con = _session_reader()
+    query_cache.check_external()
+    key = (sql, tuple(params))
+    rows = query_cache.get(key)
+    if rows is None:
+        tables = _read_tables(sql)
+        generations = query_cache.generations(tables)
+        rows = con.execute(sql, params).fetchall()
+        query_cache.put(key, tables, generations, rows)
+    return list(rows)
 
 def x(sql, params=()):
-    db().execute(sql, params)
-    db().commit()
+    """Run one write statement in its own transaction."""
+    with transaction() as con:
+        con.execute(sql, params)
+
+# ----------------------------
+# Query cache
+# ----------------------------
+# Session reads are cached by SQL and parameters. Each table has a generation
+# counter that committed transactions bump for every table they wrote, and a
+# cached result is only used while the generations of the tables it read are
+# unchanged. Commits by other processes (e.g. the batch parser's --db) clear
+# the whole cache: see QueryCache.check_external.
+QUERY_CACHE_ENTRIES = 512
+READ_TABLES_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)", re.IGNORECASE)
+WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+([A-Za-z_]\w*)",
+    re.IGNORECASE,
+)
+# Tables written by triggers (see _init_db) when the key table is written
+TRIGGER_WRITES = {
+    "manual_extract": ("thread_summary",),
+    "thread_state": ("thread_summary",),
+    "rkl_comments": ("thread_summary", "rkl_comments_fts"),
+}
+
+class QueryCache:
+    """
+    LRU of read results, invalidated per table through generation counters.
+
+    Other processes' commits are found through PRAGMA data_version, which is
+    per connection, so one read-only monitor connection serves the whole
+    process: version is its data_version as of the last commit this process
+    made (or the last check), and any other value means someone else wrote.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.external = 0  # times another process's commit cleared the cache
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (sql, params) -> (tables, generations, rows)
+        self._generations = defaultdict(int)
+        self._monitor = None
+        self._version = None
+
+    def _monitor_version(self) -> int:
+        """The monitor connection's data_version; call with _lock held."""
+        if self._monitor is None:
+            self._monitor = connect(readonly=True)
+        return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def _clear_external(self):
+        self._entries.clear()
+        self.external += 1
+
+    def check_external(self):
+        """Clear the cache if any commit happened since the last one this process made."""
+        with self._lock:
+            version = self._monitor_version()
+            if self._version is not None and version != self._version:
+                self._clear_external()
+            self._version = version
+
+    def generations(self, tables: tuple) -> tuple:
+        with self._lock:
+            return tuple(self._generations[t] for t in tables)
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            tables, generations, rows = entry
+            if generations != tuple(self._generations[t] for t in tables):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return rows
+
+    def put(self, key: tuple, tables: tuple, generations: tuple, rows: list):
+        with self._lock:
+            self._entries[key] = (tables, generations, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, tables, external: bool = False):
+        """
+        After a local transaction: bump what it wrote and take its commit as
+        the version this process produced. external means another process
+        committed while it was open (see transaction()).
+        """
+        with self._lock:
+            if external:
+                self._clear_external()
+            for table in tables:
+                self._generations[table] += 1
+                for implied in TRIGGER_WRITES.get(table, ()):
+                    self._generations[implied] += 1
+            self._version = self._monitor_version()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+query_cache = QueryCache()
+
+@functools.lru_cache(maxsize=1024)
+def _read_tables(sql: str) -> tuple:
+    return tuple(sorted({t.lower() for t in READ_TABLES_RE.findall(sql)}))
+
+def _note_write(statement: str):
+    """Trace callback on writer connections: remember tables the open transaction writes."""
+    written = getattr(_thread_con, "written", None)
+    if written is not None:
+        m = WRITE_TABLE_RE.match(statement)
+        if m:
+            written.add(m.group(1).lower())
 
 def _init_db(con: sqlite3.Connection):
+    # manual_extract and team_alias are shared with the batch parser's --db sink
+    init_review_schema(con)
     cur = con.cursor()
-    cur.executescript("""
-    CREATE TABLE IF NOT EXISTS thread_state (
-        thread_id INTEGER PRIMARY KEY,
-        status TEXT NOT NULL DEFAULT 'todo',   -- todo | done | review | skipped
-        updated_at TEXT
-    );
-    CREATE INDEX IF NOT EXISTS idx_thread_state_status ON thread_state(status);
 
-    CREATE TABLE IF NOT EXISTS manual_extract (
+    # Background auto-extract jobs (see ExtractJobRunner)
+    cur.executescript("""
+    CREATE TABLE IF NOT EXISTS extract_job (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         created_at TEXT,
+        updated_at TEXT,
+        status TEXT NOT NULL DEFAULT 'queued',  -- queued | running | cancelled | done | failed
+        extract_mode TEXT,                      -- lineup | result | both
+        skip_existing INTEGER,
+        workers INTEGER DEFAULT 1,              -- extraction processes
+        total INTEGER DEFAULT 0,                -- threads in the job
+        done_count INTEGER DEFAULT 0,           -- threads processed so far
+        extracted INTEGER DEFAULT 0,
+        skipped INTEGER DEFAULT 0,
+        error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_extract_job_status ON extract_job(status);
+
+    CREATE TABLE IF NOT EXISTS extract_job_thread (
+        job_id INTEGER,
+        position INTEGER,
         thread_id INTEGER,
-        comment_id INTEGER,
-        source TEXT,          -- feed/replies
-        kind TEXT,            -- lineup/result/leaderboard/other
-        game_date TEXT,       -- YYYY-MM-DD
-        team_a TEXT,
-        team_b TEXT,
-        mentions TEXT,        -- comma-separated (legacy)
-        notes TEXT,
-        raw_text TEXT
+        done INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (job_id, position)
     );
-    CREATE INDEX IF NOT EXISTS idx_manual_extract_thread ON manual_extract(thread_id);
     """)
     con.commit()
-    
-    # Migration: add columns if missing
-    migrations = [
-        ("captain_a", "TEXT"),
-        ("captain_b", "TEXT"),
-        ("mentions_a", "TEXT"),  # Team A players
-        ("mentions_b", "TEXT"),  # Team B players
-        ("seed_a", "TEXT"),      # Postseason seed
-        ("seed_b", "TEXT"),
-        ("round_name", "TEXT"),  # e.g., "RKL Finals", "Round 1"
-        # Result-specific fields
-        ("score_a", "REAL"),     # Team A score
-        ("score_b", "REAL"),     # Team B score
-        ("winner", "TEXT"),      # "A", "B", or null
-        ("adjustment_a", "REAL"),  # Score adjustment for team A
-        ("adjustment_b", "REAL"),  # Score adjustment for team B
-        # Linking results to lineups
-        ("linked_extract_id", "INTEGER"),  # FK to another manual_extract (lineup)
-    ]
-    for col_name, col_type in migrations:
-        try:
-            cur.execute(f"SELECT {col_name} FROM manual_extract LIMIT 1")
-        except sqlite3.OperationalError:
-            cur.execute(f"ALTER TABLE manual_extract ADD COLUMN {col_name} {col_type}")
-            con.commit()
+    try:
+        cur.execute("SELECT workers FROM extract_job LIMIT 1")
+    except sqlite3.OperationalError:
+        cur.execute("ALTER TABLE extract_job ADD COLUMN workers INTEGER DEFAULT 1")
+        con.commit()
+
+    if cur.execute("SELECT 1 FROM team_alias LIMIT 1").fetchone() is None:
+        with con:
+            rebuild_team_aliases(con)
+
+    # One row per rkl_comments row with everything the thread list filters and
+    # sorts on. Triggers keep extract_count and status current; comments are
+    # loaded from the offline dump, so sync_thread_summary picks them up here
+    # and sync_comment_search's triggers follow later changes.
+    cur.executescript("""
+    CREATE TABLE IF NOT EXISTS thread_summary (
+        thread_id INTEGER PRIMARY KEY,   -- rkl_comments.comment_id
+        source TEXT,
+        created_at_ts TEXT,
+        reply_count INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'todo',
+        extract_count INTEGER NOT NULL DEFAULT 0,
+        likely_lineup INTEGER NOT NULL DEFAULT 0,       -- queue heuristics, see THREAD_HINT_SQL
+        likely_result INTEGER NOT NULL DEFAULT 0,
+        likely_leaderboard INTEGER NOT NULL DEFAULT 0,
+        game_date TEXT                                  -- rkl_comments.eastern_date
+    );
+    CREATE INDEX IF NOT EXISTS idx_thread_summary_recent ON thread_summary(created_at_ts DESC, thread_id DESC);
+    CREATE INDEX IF NOT EXISTS idx_thread_summary_source_recent
+        ON thread_summary(source, created_at_ts DESC, thread_id DESC);
+    CREATE INDEX IF NOT EXISTS idx_thread_summary_game_date ON thread_summary(game_date);
+    -- Short ✅/❌ keyword searches scan only these (see SHORT_KEYWORD_HINTS)
+    CREATE INDEX IF NOT EXISTS idx_thread_summary_likely_result ON thread_summary(thread_id) WHERE likely_result = 1;
+
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_extract_insert AFTER INSERT ON manual_extract BEGIN
+        UPDATE thread_summary SET extract_count = extract_count + 1 WHERE thread_id = NEW.thread_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_extract_delete AFTER DELETE ON manual_extract BEGIN
+        UPDATE thread_summary SET extract_count = extract_count - 1 WHERE thread_id = OLD.thread_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_extract_move AFTER UPDATE OF thread_id ON manual_extract
+    WHEN OLD.thread_id IS NOT NEW.thread_id BEGIN
+        UPDATE thread_summary SET extract_count = extract_count - 1 WHERE thread_id = OLD.thread_id;
+        UPDATE thread_summary SET extract_count = extract_count + 1 WHERE thread_id = NEW.thread_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_state_insert AFTER INSERT ON thread_state BEGIN
+        UPDATE thread_summary SET status = NEW.status WHERE thread_id = NEW.thread_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_state_update AFTER UPDATE OF status ON thread_state BEGIN
+        UPDATE thread_summary SET status = NEW.status WHERE thread_id = NEW.thread_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_thread_summary_state_delete AFTER DELETE ON thread_state BEGIN
+        UPDATE thread_summary SET status = 'todo' WHERE thread_id = OLD.thread_id;
+    END;
+    """)
+    con.commit()
 
-# ----------------------------
-# Lightweight heuristics (assistive, not perfect)
-# ----------------------------
-VS_ANY_RE = re.compile(r"\bvs\.?\b", re.IGNORECASE)
-MENTION_RE = re.compile(r"@([A-Za-z0-9._]+)")
-# Score patterns: matches "34,565" or "51458" or "47,547.5"
-SCORE_NUM_RE = re.compile(r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b|\b\d{4,6}(?:\.\d+)?\b")
-TOP_SCORES_RE = re.compile(r"top\s+team\s+scores", re.IGNORECASE)
-MEDIAN_RE = re.compile(r"\bmedian\b", re.IGNORECASE)
-# Win/loss markers including RealApp emojis
-WINLOSS_MARK_RE = re.compile(r"[✅❌🏆]|:check_mark_button|:cross_mark")
-LINEUPS_WORD_RE = re.compile(r"\blineups\b", re.IGNORECASE)
-# Result indicator: team record pattern like "(10-4)" or "(1-4)"
-RECORD_PATTERN_RE = re.compile(r"\(\d+-\d+(?:-\d+)?\)")
-
-INLINE_VS_SPLIT_RE = re.compile(r"\bvs\.?\b", re.IGNORECASE)
-
-# Team name parsing patterns
-# Matches: "TeamName (W-L)" or "TeamName (W-L-T)" with optional trailing stuff
-TEAM_RECORD_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)")
-# Matches result lines: "TeamName (W-L) - 47,502 ✅" or "TeamName (W-L) - 48,858 ❌"
-RESULT_LINE_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]\s*[\d,]+\s*[✅❌]", re.UNICODE)
-# Matches leaderboard rank lines: "1. TeamName (W-L) - 51,513 ✅"
-LEADERBOARD_LINE_RE = re.compile(r"^\d+\.\s*(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]\s*[\d,]+", re.UNICODE)
-# Standalone vs line (just "vs" or "vs." on its own line)
-STANDALONE_VS_RE = re.compile(r"^\s*vs\.?\s*$", re.IGNORECASE)
-
-# Captain detection patterns
-# Explicit captain marker: "@username (c)" or "@username (C)"
-CAPTAIN_EXPLICIT_RE = re.compile(r"@([A-Za-z0-9._]+)\s*\([cC]\)")
-# Plain 'c' marker: "@username c" (space + lowercase c + end/space/newline)
-CAPTAIN_PLAIN_C_RE = re.compile(r"@([A-Za-z0-9._]+)\s+[cC](?:\s|$)")
-# Mention with trailing content (to check if only non-alphanumeric follows)
-MENTION_WITH_TRAIL_RE = re.compile(r"@([A-Za-z0-9._]+)(.*?)(?=@[A-Za-z0-9._]+|$)", re.DOTALL)
-# RealApp emoji pattern: :emoji_name (single colon at start, no closing colon)
-REALAPP_EMOJI_RE = re.compile(r":[a-z_0-9]+")
-
-# Postseason patterns
-# Round names like "RKL Finals", "Round 1", "Semifinals", "Quarter Finals", etc.
-ROUND_NAME_RE = re.compile(r"(RKL\s+Finals|Finals|Semi\s*-?\s*Finals?|Quarter\s*-?\s*Finals?|Round\s+\d+|Playoffs?\s+Round\s+\d+|Wild\s*Card|Game\s+\d+)", re.IGNORECASE)
-# Seed pattern: "1 TeamName" or "(1) TeamName" or "1. TeamName" at start of line
-SEED_TEAM_RE = re.compile(r"^\s*(?:\((\d+)\)|(\d+)\.?\s+)(.+?)(?:\s*\(\d+-\d+\))?\s*$")
+    with con:
+        sync_thread_summary(con)
+        sync_comment_search(con)
+    # Refresh planner statistics for new indexes (cheap when nothing changed)
+    cur.execute("PRAGMA optimize")
 
 # ----------------------------
-# Result parsing patterns
+# Thread summary
 # ----------------------------
-# Win/loss indicators (including RealApp emoji)
-WIN_INDICATOR_RE = re.compile(r"(✅+|:check_mark_button|🏆)")
-LOSS_INDICATOR_RE = re.compile(r"(❌|:cross_mark)")
-
-# Score patterns - matches numbers with commas and optional decimals
-# Examples: 34,565 or 47,547.5 or 51458
-SCORE_EXTRACT_RE = re.compile(r"([\d,]+(?:\.\d+)?)")
-
-# Result line patterns - several variations seen in the data
-# Pattern 1: "(seed) TeamName (W-L) - 34,565 ✅" or "seed. TeamName (W-L): 51,458 ✅✅✅"
-RESULT_FULL_RE = re.compile(
-    r"^\s*(?:\((\d+)\)\s*|(\d+)\.\s*)?(.+?)\s*\((\d+)-(\d+)(?:-\d+)?\)\s*[-–:]\s*([\d,]+(?:\.\d+)?)\s*(.*)$",
-    re.UNICODE
-)
-
-# Pattern 2: Simple "TeamName - Score" without record (for adjustments)
-ADJUSTMENT_LINE_RE = re.compile(
-    r"^\s*([A-Za-z][A-Za-z0-9\s]+?)\s+([+-]?\d[\d,]*(?:\.\d+)?)\s*$"
-)
-
-# Adjustment header patterns
-ADJUSTMENT_HEADER_RE = re.compile(
-    r"(advent\s+deduction|deduction|adjustment|penalty|bonus)",
-    re.IGNORECASE
-)
+# The "(likely)" queue heuristics, evaluated once per comment instead of on
+# every thread list query
+THREAD_HINT_SQL = {
+    "likely_lineup": "c.plain_text LIKE '%Lineups%' OR lower(c.plain_text) LIKE '% vs %'",
+    "likely_result": "c.plain_text LIKE '%✅%' OR c.plain_text LIKE '%❌%'",
+    "likely_leaderboard": "c.plain_text LIKE '%Top Team Scores%' OR c.plain_text LIKE '%Median%'",
+}
 
-# Separator lines (dashes)
-SEPARATOR_RE = re.compile(r"^[-–—]{3,}$")
+# Shortest keyword the trigram index can answer
+FTS_MIN_KEYWORD = 3
 
-def parse_score(score_str: str) -> float | None:
-    """Parse a score string like '34,565' or '47,547.5' to a float."""
-    if not score_str:
-        return None
-    try:
-        # Remove commas and parse
-        return float(score_str.replace(",", ""))
-    except ValueError:
-        return None
+# Shorter keywords containing one of these can only be in threads with the
+# hint set, so they scan those threads instead of every comment
+SHORT_KEYWORD_HINTS = {"✅": "likely_result", "❌": "likely_result"}
 
-def detect_winner(line: str) -> str | None:
-    """Detect if a line indicates a win or loss."""
-    if WIN_INDICATOR_RE.search(line):
-        return "win"
-    if LOSS_INDICATOR_RE.search(line):
-        return "loss"
-    return None
+def _has_table(con: sqlite3.Connection, name: str) -> bool:
+    return con.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
 
-def parse_result_line(line: str) -> dict | None:
+def keyword_filter(kw: str, id_column: str, text_column: str, fts: bool) -> tuple[str, list]:
     """
-    Parse a single result line.
-    Returns: {team, record_w, record_l, score, seed, winner} or None
+    (SQL condition, parameters) for "text contains kw": a literal substring,
+    case-insensitive for ASCII letters only (SQLite's LIKE). The LIKE always
+    decides; rkl_comments_fts or a thread_summary hint only narrows the rows
+    it runs on. (The trigram index folds non-ASCII case too, so it alone
+    would match more.)
     """
-    line = line.strip()
-    if not line:
-        return None
-
-    m = RESULT_FULL_RE.match(line)
-    if m:
-        seed = m.group(1) or m.group(2)  # (seed) or seed.
-        team = m.group(3).strip()
-        record_w = int(m.group(4))
-        record_l = int(m.group(5))
-        score_str = m.group(6)
-        trailing = m.group(7) or ""
-
-        # Clean team name (remove leading seed if duplicated)
-        team = re.sub(r"^\d+\.\s*", "", team).strip()
-
-        score = parse_score(score_str)
-        winner = detect_winner(trailing)
-
-        return {
-            "team": team,
-            "record_w": record_w,
-            "record_l": record_l,
-            "score": score,
-            "seed": seed,
-            "winner": winner,
-        }
-    return None
-
-def parse_adjustment_line(line: str) -> dict | None:
+    like = "%" + kw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    condition = f"{text_column} LIKE ? ESCAPE '\\'"
+    if fts and len(kw) >= FTS_MIN_KEYWORD:
+        # One quoted phrase, so kw is matched literally as a substring
+        phrase = '"' + kw.replace('"', '""') + '"'
+        return (f"{id_column} IN (SELECT rowid FROM rkl_comments_fts WHERE rkl_comments_fts MATCH ?)"
+                f" AND {condition}", [phrase, like])
+    hint = next((SHORT_KEYWORD_HINTS[ch] for ch in kw if ch in SHORT_KEYWORD_HINTS), None)
+    if hint:
+        return f"{id_column} IN (SELECT thread_id FROM thread_summary WHERE {hint} = 1) AND {condition}", [like]
+    return condition, [like]
+
+def sync_eastern_dates(con: sqlite3.Connection) -> int:
     """
-    Parse an adjustment line like "Diabetics -1950".
-    Returns: {team, adjustment} or None
+    Store each comment's posted date in US Eastern time (the date auto-extract
+    gives its games) in rkl_comments.eastern_date, converting only comments
+    that don't have one yet. Returns the number converted. Does not commit.
     """
-    m = ADJUSTMENT_LINE_RE.match(line.strip())
-    if m:
-        team = m.group(1).strip()
-        adj_str = m.group(2).replace(",", "")
-        try:
-            adjustment = float(adj_str)
-            return {"team": team, "adjustment": adjustment}
-        except ValueError:
-            return None
-    return None
-
-def extract_game_result(text: str) -> dict | None:
+    if "eastern_date" not in {row[1] for row in con.execute("PRAGMA table_info(rkl_comments)")}:
+        con.execute("ALTER TABLE rkl_comments ADD COLUMN eastern_date TEXT")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_rkl_comments_eastern_date ON rkl_comments(eastern_date)")
+    con.create_function("to_eastern_date", 1, infer_game_date, deterministic=True)
+    return con.execute("""
+      UPDATE rkl_comments SET eastern_date = to_eastern_date(created_at_ts)
+      WHERE eastern_date IS NULL AND created_at_ts IS NOT NULL
+    """).rowcount
+
+def sync_thread_summary(con: sqlite3.Connection) -> int:
+    """Add thread_summary rows for new comments, drop removed ones and
+    refresh reply counts and missing game dates. Returns the number of rows
+    added. Does not commit."""
+    if not _has_table(con, "rkl_comments"):
+        return 0
+    sync_eastern_dates(con)
+    hints = ", ".join(f"COALESCE({expr}, 0)" for expr in THREAD_HINT_SQL.values())
+    new_rows = con.execute(f"""
+      SELECT c.comment_id, c.source, c.created_at_ts, COALESCE(c.reply_count, 0), {hints}, c.eastern_date
+      FROM rkl_comments c
+      WHERE NOT EXISTS (SELECT 1 FROM thread_summary ts WHERE ts.thread_id = c.comment_id)
+    """).fetchall()
+    con.executemany(f"""
+      INSERT INTO thread_summary(thread_id, source, created_at_ts, reply_count,
+                                 {", ".join(THREAD_HINT_SQL)}, game_date, status, extract_count)
+      VALUES (?, ?, ?, ?, ?, ?, ?, ?,
+              COALESCE((SELECT status FROM thread_state WHERE thread_id = ?), 'todo'),
+              (SELECT COUNT(*) FROM manual_extract WHERE thread_id = ?))
+    """, [(*row, row[0], row[0]) for row in new_rows])
+    con.execute("""
+      DELETE FROM thread_summary
+      WHERE NOT EXISTS (SELECT 1 FROM rkl_comments c WHERE c.comment_id = thread_summary.thread_id)
+    """)
+    con.execute("""
+      UPDATE thread_summary
+      SET reply_count = (SELECT COALESCE(c.reply_count, 0) FROM rkl_comments c
+                         WHERE c.comment_id = thread_summary.thread_id)
+      WHERE reply_count != (SELECT COALESCE(c.reply_count, 0) FROM rkl_comments c
+                            WHERE c.comment_id = thread_summary.thread_id)
+    """)
+    # Rows the rkl_comments triggers added while eastern_date was still NULL
+    con.execute("""
+      UPDATE thread_summary
+      SET game_date = (SELECT c.eastern_date FROM rkl_comments c WHERE c.comment_id = thread_summary.thread_id)
+      WHERE game_date IS NULL
+    """)
+    return len(new_rows)
+
+COMMENT_FTS_TRIGGERS = [
+    """CREATE TRIGGER trg_comment_fts_insert AFTER INSERT ON rkl_comments BEGIN
+        INSERT OR REPLACE INTO rkl_comments_fts(rowid, plain_text) VALUES (NEW.comment_id, NEW.plain_text);
+    END""",
+    """CREATE TRIGGER trg_comment_fts_update AFTER UPDATE OF comment_id, plain_text ON rkl_comments BEGIN
+        DELETE FROM rkl_comments_fts WHERE rowid = OLD.comment_id;
+        INSERT OR REPLACE INTO rkl_comments_fts(rowid, plain_text) VALUES (NEW.comment_id, NEW.plain_text);
+    END""",
+    """CREATE TRIGGER trg_comment_fts_delete AFTER DELETE ON rkl_comments BEGIN
+        DELETE FROM rkl_comments_fts WHERE rowid = OLD.comment_id;
+    END""",
+]
+
+def sync_comment_search(con: sqlite3.Connection):
     """
-    Extract game result data from a results post.
-    Returns: {
-        team_a, team_b, score_a, score_b,
-        record_a_w, record_a_l, record_b_w, record_b_l,
-        seed_a, seed_b, winner,
-        adjustment_a, adjustment_b,
-        round_name
-    } or None
+    Keep thread_summary and the rkl_comments_fts keyword index current when
+    rkl_comments rows are added, replaced, edited or deleted, by anyone,
+    including while the app runs. Triggers on rkl_comments do it; if they
+    are missing (a new database, or rkl_comments was dropped and reloaded,
+    which drops them too) the summary's comment columns and the index are
+    rebuilt before the triggers are created. Does not commit.
     """
-    if not text:
-        return None
-
-    lines = text.splitlines()
-    result_lines = []
-    adjustments = []
-    in_adjustment_section = False
-    round_name = None
-
-    for ln in lines:
-        ln_stripped = ln.strip()
-
-        # Check for round name in first few lines
-        if len(result_lines) == 0 and not round_name:
-            m = ROUND_NAME_RE.search(ln_stripped)
-            if m:
-                # Take the whole line as round name (e.g., "👑 RKL FINALS GAME 5 👑")
-                round_name = ln_stripped
-                continue
-
-        # Skip separator lines
-        if SEPARATOR_RE.match(ln_stripped):
-            continue
-
-        # Check for adjustment section header
-        if ADJUSTMENT_HEADER_RE.search(ln_stripped):
-            in_adjustment_section = True
-            continue
-
-        # Parse result lines
-        parsed = parse_result_line(ln_stripped)
-        if parsed:
-            result_lines.append(parsed)
-            continue
-
-        # Parse adjustment lines (if in adjustment section or looks like one)
-        if in_adjustment_section or (len(result_lines) >= 2):
-            adj = parse_adjustment_line(ln_stripped)
-            if adj:
-                adjustments.append(adj)
+    if not _has_table(con, "rkl_comments"):
+        return
+    # thread_summary columns copied or derived from the comment
+    columns = ("source", "created_at_ts", "reply_count", *THREAD_HINT_SQL, "game_date")
+    values = ", ".join(["c.source", "c.created_at_ts", "COALESCE(c.reply_count, 0)",
+                        *(f"COALESCE({expr}, 0)" for expr in THREAD_HINT_SQL.values()), "c.eastern_date"])
+    upsert_summary = f"""
+        INSERT INTO thread_summary(thread_id, {", ".join(columns)}, status, extract_count)
+        SELECT c.comment_id, {values},
+               COALESCE((SELECT status FROM thread_state WHERE thread_id = c.comment_id), 'todo'),
+               (SELECT COUNT(*) FROM manual_extract WHERE thread_id = c.comment_id)
+        FROM rkl_comments c WHERE c.comment_id = NEW.comment_id
+        ON CONFLICT(thread_id) DO UPDATE SET {", ".join(f"{col} = excluded.{col}" for col in columns)};"""
+    if not _has_table(con, "trg_comment_summary_insert"):
+        # Earlier versions only kept the hints current
+        con.execute("DROP TRIGGER IF EXISTS trg_comment_hints_insert")
+        con.execute("DROP TRIGGER IF EXISTS trg_comment_hints_update")
+        con.execute(f"""
+          UPDATE thread_summary SET ({", ".join(columns)}) =
+              (SELECT {values} FROM rkl_comments c WHERE c.comment_id = thread_summary.thread_id)
+        """)
+        con.execute(f"CREATE TRIGGER trg_comment_summary_insert AFTER INSERT ON rkl_comments "
+                    f"BEGIN {upsert_summary} END")
+        con.execute(f"""CREATE TRIGGER trg_comment_summary_update AFTER UPDATE ON rkl_comments BEGIN
+            DELETE FROM thread_summary WHERE thread_id = OLD.comment_id AND OLD.comment_id IS NOT NEW.comment_id;
+            {upsert_summary}
+        END""")
+        con.execute("""CREATE TRIGGER trg_comment_summary_delete AFTER DELETE ON rkl_comments BEGIN
+            DELETE FROM thread_summary WHERE thread_id = OLD.comment_id;
+        END""")
+
+    if _has_table(con, "trg_comment_fts_insert"):
+        return
+    # The index keeps its own copy of the text, so its triggers can delete by
+    # rowid: an external-content index would need the old text, which an
+    # INSERT OR REPLACE removes without firing delete triggers. The trigram
+    # tokenizer indexes every character, emoji included, and matches
+    # substrings like the LIKE it narrows.
+    con.execute("DROP TABLE IF EXISTS rkl_comments_fts")
+    try:
+        con.execute("CREATE VIRTUAL TABLE rkl_comments_fts USING fts5(plain_text, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return  # SQLite built without FTS5 (or older than 3.34); keyword search uses LIKE
+    con.execute("INSERT INTO rkl_comments_fts(rowid, plain_text) SELECT comment_id, plain_text FROM rkl_comments")
+    # One statement at a time: executescript would commit first
+    for trigger in COMMENT_FTS_TRIGGERS:
+        con.execute(trigger)
 
-    # Need at least 2 result lines for a game
-    if len(result_lines) < 2:
+# ----------------------------
+# Team aliases
+# ----------------------------
+# record_team_aliases, forget_team_aliases and rebuild_team_aliases live in rkl_extract.schema
+def canonical_team(name: str) -> str | None:
+    """The most often seen spelling of the team name (by team_key), if it has been seen."""
+    key = team_key(name)
+    if not key:
         return None
+    rows = q("SELECT spelling FROM team_alias WHERE team_key = ? ORDER BY seen DESC, alias LIMIT 1", (key,))
+    return rows[0]["spelling"] if rows else None
 
-    # Take the first two as the teams
-    team_a_data = result_lines[0]
-    team_b_data = result_lines[1]
-
-    # Determine winner
-    winner = None
-    if team_a_data.get("winner") == "win":
-        winner = "A"
-    elif team_b_data.get("winner") == "win":
-        winner = "B"
-    elif team_a_data.get("winner") == "loss":
-        winner = "B"
-    elif team_b_data.get("winner") == "loss":
-        winner = "A"
-    # Fallback: higher score wins
-    elif team_a_data.get("score") and team_b_data.get("score"):
-        if team_a_data["score"] > team_b_data["score"]:
-            winner = "A"
-        elif team_b_data["score"] > team_a_data["score"]:
-            winner = "B"
-
-    # Match adjustments to teams
-    adjustment_a = None
-    adjustment_b = None
-    team_a_lower = team_a_data["team"].lower()
-    team_b_lower = team_b_data["team"].lower()
-
-    for adj in adjustments:
-        adj_team_lower = adj["team"].lower()
-        # Fuzzy match team names
-        if adj_team_lower in team_a_lower or team_a_lower in adj_team_lower:
-            adjustment_a = adj["adjustment"]
-        elif adj_team_lower in team_b_lower or team_b_lower in adj_team_lower:
-            adjustment_b = adj["adjustment"]
-
-    return {
-        "team_a": team_a_data["team"],
-        "team_b": team_b_data["team"],
-        "score_a": team_a_data.get("score"),
-        "score_b": team_b_data.get("score"),
-        "record_a_w": team_a_data.get("record_w"),
-        "record_a_l": team_a_data.get("record_l"),
-        "record_b_w": team_b_data.get("record_w"),
-        "record_b_l": team_b_data.get("record_l"),
-        "seed_a": team_a_data.get("seed"),
-        "seed_b": team_b_data.get("seed"),
-        "winner": winner,
-        "adjustment_a": adjustment_a,
-        "adjustment_b": adjustment_b,
-        "round_name": round_name,
-    }
-
-def find_matching_lineup(team_a: str, team_b: str, result_date: str = None) -> dict | None:
+# ----------------------------
+# Result / lineup matching
+# ----------------------------
+def find_matching_lineup(team_a: str, team_b: str, result_date: str = None,
+                         lineups: "LineupIndex | None" = None) -> dict | None:
     """
     Find the best matching lineup extract for a result based on team names.
     Returns the highest-scoring match from find_all_matching_lineups.
     """
-    matches = find_all_matching_lineups(team_a, team_b, result_date)
+    matches = find_all_matching_lineups(team_a, team_b, result_date, lineups)
     if matches:
         return matches[0]
     return None
@@ -383,11 +590,108 @@ def _teams_match(lineup_a: str, lineup_b: str, result_a: str, result_b: str) ->
     return (False, False, 0)
 
 
-def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None) -> list[dict]:
+LINEUP_COLUMNS = "id, game_date, team_a, team_b, thread_id, comment_id"
+# Candidate limits for find_all_matching_lineups
+EXACT_LINEUP_LIMIT = 10
+RECENT_LINEUP_LIMIT = 50
+
+# SQLite's lower() only folds ASCII letters
+_SQLITE_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Date arithmetic only; lets LineupIndex apply SQLite's own date() semantics
+_DATE_CON = sqlite3.connect(":memory:", check_same_thread=False)
+
+@functools.lru_cache(maxsize=4096)
+def _week_before(result_date: str) -> str | None:
+    """SQLite's date(result_date, '-7 days'), including its NULL for unparseable input."""
+    return _DATE_CON.execute("SELECT date(?, '-7 days')", (result_date,)).fetchone()[0]
+
+class LineupIndex:
+    """
+    In-memory copy of the lineup rows in manual_extract, bucketed by game_date.
+
+    Answers find_all_matching_lineups' two candidate queries (exact team
+    pairs, and the most recent lineups in the date window) without SQLite,
+    in the same order (game_date DESC, then id). Bulk runs and extract jobs
+    build one per run and add() each lineup they insert. scored holds the
+    ids of lineups that already carry a result's score.
+    """
+
+    def __init__(self, rows=()):
+        self.scored: set[int] = set()
+        self.by_date: dict[str, list[dict]] = {}
+        self.dates: list[str] = []  # sorted distinct non-NULL game dates
+        self.undated: list[dict] = []
+        self.by_pair: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def load(cls, con: sqlite3.Connection) -> "LineupIndex":
+        index = cls()
+        for r in con.execute(f"""SELECT {LINEUP_COLUMNS}, score_a IS NOT NULL AS scored
+                                 FROM manual_extract WHERE kind = 'lineup' ORDER BY id"""):
+            row = dict(r)
+            if row.pop("scored"):
+                index.scored.add(row["id"])
+            index.add(row)
+        return index
+
+    def add(self, row: dict):
+        """Add a lineup row; ids must arrive in increasing order."""
+        game_date = row["game_date"]
+        if game_date is None:
+            self.undated.append(row)
+        else:
+            if game_date not in self.by_date:
+                self.by_date[game_date] = []
+                self.dates.insert(bisect_left(self.dates, game_date), game_date)
+            self.by_date[game_date].append(row)
+        if row["team_a"] is not None and row["team_b"] is not None:
+            key = (row["team_a"].translate(_SQLITE_LOWER), row["team_b"].translate(_SQLITE_LOWER))
+            self.by_pair[key].append(row)
+
+    def _window(self, result_date: str | None) -> list[str] | None:
+        """Dates in [result_date - 7 days, result_date], newest first; None means no filter."""
+        if not result_date:
+            return None
+        low = _week_before(result_date)
+        if low is None:
+            return []
+        return self.dates[bisect_left(self.dates, low):bisect_right(self.dates, result_date)][::-1]
+
+    def candidates(self, team_a_lower: str, team_b_lower: str,
+                   result_date: str | None) -> tuple[list[dict], list[dict]]:
+        """(exact pair matches, most recent lineups) for the result's date window."""
+        window = self._window(result_date)
+        in_window = set(window) if window is not None else None
+
+        exact = self.by_pair.get((team_a_lower, team_b_lower), [])
+        if team_b_lower != team_a_lower:
+            exact = exact + self.by_pair.get((team_b_lower, team_a_lower), [])
+        if in_window is not None:
+            exact = [r for r in exact if r["game_date"] in in_window]
+        exact.sort(key=lambda r: r["id"])
+        exact.sort(key=lambda r: (r["game_date"] is not None, r["game_date"] or ""), reverse=True)
+
+        recent = []
+        for game_date in (window if window is not None else self.dates[::-1]):
+            recent.extend(self.by_date[game_date][:RECENT_LINEUP_LIMIT - len(recent)])
+            if len(recent) >= RECENT_LINEUP_LIMIT:
+                break
+        if window is None:
+            recent.extend(self.undated[:RECENT_LINEUP_LIMIT - len(recent)])
+
+        return exact[:EXACT_LINEUP_LIMIT], recent
+
+def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None,
+                              lineups: LineupIndex | None = None) -> list[dict]:
     """
     Find all potential matching lineups for a result.
     Requires BOTH teams to match (in either order).
     Returns list of matches sorted by quality.
+
+    With a LineupIndex the candidates come from memory instead of SQLite.
     """
     if not team_a or not team_b:
         return []
@@ -395,6 +699,17 @@ def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None)
     team_a_lower = team_a.lower().strip()
     team_b_lower = team_b.lower().strip()
 
+    if lineups is not None:
+        exact_matches, recent_lineups = lineups.candidates(team_a_lower, team_b_lower, result_date)
+    else:
+        exact_matches, recent_lineups = _query_lineup_candidates(team_a_lower, team_b_lower, result_date)
+
+    return _rank_lineups(exact_matches, recent_lineups, team_a, team_b)
+
+def _query_lineup_candidates(team_a_lower: str, team_b_lower: str,
+                             result_date: str | None) -> tuple[list, list]:
+    """(exact pair matches, most recent lineups) for the result's date window, from SQLite."""
+
     # Build date range query - look for lineups within 7 days before result
     date_clause = ""
     params = []
@@ -404,7 +719,7 @@ def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None)
 
     # First try exact matches - BOTH teams must match (in either order)
     sql_exact = f"""
-        SELECT id, game_date, team_a, team_b, thread_id, comment_id
+        SELECT {LINEUP_COLUMNS}
         FROM manual_extract
         WHERE kind = 'lineup'
           AND (
@@ -412,22 +727,25 @@ def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None)
               OR (lower(team_a) = ? AND lower(team_b) = ?)
           )
           {date_clause}
-        ORDER BY game_date DESC
-        LIMIT 10
+        ORDER BY game_date DESC, id
+        LIMIT {EXACT_LINEUP_LIMIT}
     """
     exact_matches = q(sql_exact, (team_a_lower, team_b_lower, team_b_lower, team_a_lower) + tuple(params))
 
     # Also get recent lineups for fuzzy matching
     sql_recent = f"""
-        SELECT id, game_date, team_a, team_b, thread_id, comment_id
+        SELECT {LINEUP_COLUMNS}
         FROM manual_extract
         WHERE kind = 'lineup'
-          {date_clause.replace('AND', 'AND' if date_clause else '')}
-        ORDER BY game_date DESC
-        LIMIT 50
+          {date_clause}
+        ORDER BY game_date DESC, id
+        LIMIT {RECENT_LINEUP_LIMIT}
     """
-    recent_lineups = q(sql_recent, tuple(params)) if params else q(sql_recent.replace(date_clause, ''), ())
+    recent_lineups = q(sql_recent, tuple(params))
+    return exact_matches, recent_lineups
 
+def _rank_lineups(exact_matches: list, recent_lineups: list, team_a: str, team_b: str) -> list[dict]:
+    """Score candidate lineups with _teams_match; best score first, then most recent."""
     # Combine and dedupe
     seen_ids = set()
     all_lineups = []
@@ -479,511 +797,39 @@ def find_all_matching_lineups(team_a: str, team_b: str, result_date: str = None)
 
     return results
 
-def detect_postseason_info(text: str):
-    """
-    Detect postseason round name and team seeds.
-    Returns: (round_name, seed_a, seed_b)
-    """
-    if not text:
-        return (None, None, None)
-    
-    lines = text.splitlines()
-    round_name = None
-    seed_a = None
-    seed_b = None
-    
-    # Look for round name in first few lines
-    for ln in lines[:5]:
-        ln_stripped = ln.strip()
-        m = ROUND_NAME_RE.match(ln_stripped)
-        if m:
-            round_name = ln_stripped
-            break
-    
-    # Find vs line to split into team sections
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-    
-    if vs_line_idx is not None:
-        # Look for seeded team line before vs
-        for i in range(vs_line_idx - 1, max(0, vs_line_idx - 10) - 1, -1):
-            ln = lines[i].strip()
-            if ln.startswith("@"):
-                continue
-            m = SEED_TEAM_RE.match(ln)
-            if m:
-                seed_a = m.group(1) or m.group(2)
-                break
-        
-        # Look for seeded team line after vs
-        for i in range(vs_line_idx + 1, min(len(lines), vs_line_idx + 10)):
-            ln = lines[i].strip()
-            if ln.startswith("@"):
-                continue
-            m = SEED_TEAM_RE.match(ln)
-            if m:
-                seed_b = m.group(1) or m.group(2)
-                break
-    
-    return (round_name, seed_a, seed_b)
-
-def extract_mentions_by_team(text: str):
-    """
-    Split mentions into Team A and Team B based on vs divider.
-    Returns: (mentions_a, mentions_b, all_mentions)
-    """
-    if not text:
-        return ([], [], [])
-    
-    lines = text.splitlines()
-    all_mentions = MENTION_RE.findall(text)
-    
-    # Find vs line
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-    
-    if vs_line_idx is None:
-        # No vs divider - try inline "vs" split
-        for i, ln in enumerate(lines):
-            if VS_ANY_RE.search(ln):
-                parts = INLINE_VS_SPLIT_RE.split(ln, maxsplit=1)
-                if len(parts) == 2:
-                    mentions_a = MENTION_RE.findall(parts[0])
-                    mentions_b = MENTION_RE.findall(parts[1])
-                    return (mentions_a, mentions_b, all_mentions)
-        # No split found
-        return ([], [], all_mentions)
-    
-    # Split by vs line
-    text_before = "\n".join(lines[:vs_line_idx])
-    text_after = "\n".join(lines[vs_line_idx + 1:])
-    
-    mentions_a = MENTION_RE.findall(text_before)
-    mentions_b = MENTION_RE.findall(text_after)
-    
-    return (mentions_a, mentions_b, all_mentions)
-
-def guess_kind(text: str) -> str:
-    t = text or ""
-    if TOP_SCORES_RE.search(t) or MEDIAN_RE.search(t):
-        return "leaderboard"
-
-    # Result detection - multiple signals
-    # 1. Has win/loss markers AND scores
-    has_winloss = WINLOSS_MARK_RE.search(t)
-    has_scores = SCORE_NUM_RE.search(t)
-    # 2. Has team record patterns like "(10-4)"
-    has_records = RECORD_PATTERN_RE.search(t)
-    # 3. Has separator line (common in result posts)
-    has_separator = bool(re.search(r"^[-–—]{3,}$", t, re.MULTILINE))
-    # 4. Count how many record patterns (results usually have 2+)
-    record_count = len(RECORD_PATTERN_RE.findall(t))
-
-    # Strong result signals
-    if has_winloss and has_scores:
-        return "result"
-    # Two+ team records with scores = likely result
-    if record_count >= 2 and has_scores:
-        return "result"
-    # Records + separator + scores = likely result
-    if has_records and has_separator and has_scores:
-        return "result"
-
-    # Lineup detection
-    if (LINEUPS_WORD_RE.search(t) or VS_ANY_RE.search(t)) and MENTION_RE.search(t):
-        return "lineup"
-    # GOTD posts
-    if re.search(r"\bGOTD\b", t, re.IGNORECASE) and MENTION_RE.search(t):
-        return "lineup"
-    # Postseason posts (round names)
-    if ROUND_NAME_RE.search(t) and MENTION_RE.search(t) and VS_ANY_RE.search(t):
-        return "lineup"
-    return "other"
-
-def clean_team_name(name: str) -> str:
-    """Clean up a team name by removing trailing records, punctuation, seeds, etc."""
-    if not name:
-        return ""
-    name = name.strip()
-    # Remove leading seed numbers: "1 Team", "(1) Team", "1. Team"
-    name = re.sub(r"^\s*(?:\(\d+\)\s*|\d+\.\s*|\d+\s+)", "", name)
-    # Remove trailing (W-L) record if present
-    name = re.sub(r"\s*\(\d+-\d+(?:-\d+)?\)\s*$", "", name)
-    # Remove trailing score/checkmarks
-    name = re.sub(r"\s*[-–]\s*[\d,]+\s*[✅❌]?\s*$", "", name)
-    # Remove leading rank numbers like "1. " (redundant but safe)
-    name = re.sub(r"^\d+\.\s*", "", name)
-    # Remove leading/trailing punctuation and whitespace
-    name = name.strip(" \t\n-–:•")
-    return name[:80] if name else ""
-
-def guess_teams(text: str):
-    """
-    Improved team detection with multiple strategies:
-    1. Results format: two lines with "Team (W-L) - score ✅/❌"
-    2. Leaderboard format: "1. Team (W-L) - score"
-    3. Inline "Team A (W-L) vs Team B (W-L)"
-    4. Multi-line with standalone "vs" separator
-    """
-    if not text:
-        return (None, None)
-    
-    lines = text.splitlines()
-    
-    # Strategy 1: Look for results format (two consecutive result lines)
-    result_teams = []
-    for ln in lines:
-        m = RESULT_LINE_RE.match(ln.strip())
-        if m:
-            team = clean_team_name(m.group(1))
-            if team:
-                result_teams.append(team)
-        if len(result_teams) >= 2:
-            break
-    if len(result_teams) >= 2:
-        return (result_teams[0], result_teams[1])
-    
-    # Strategy 2: Leaderboard format (get first two ranked teams)
-    leaderboard_teams = []
-    for ln in lines:
-        m = LEADERBOARD_LINE_RE.match(ln.strip())
-        if m:
-            team = clean_team_name(m.group(1))
-            if team:
-                leaderboard_teams.append(team)
-        if len(leaderboard_teams) >= 2:
-            break
-    if len(leaderboard_teams) >= 2:
-        return (leaderboard_teams[0], leaderboard_teams[1])
-    
-    # Strategy 3: Inline "Team A vs Team B" (with or without records)
-    for ln in lines[:12]:  # Check first 12 lines
-        if VS_ANY_RE.search(ln):
-            parts = INLINE_VS_SPLIT_RE.split(ln, maxsplit=1)
-            if len(parts) == 2:
-                team_a = clean_team_name(parts[0])
-                team_b = clean_team_name(parts[1])
-                if team_a or team_b:
-                    return (team_a or None, team_b or None)
-    
-    # Strategy 4: Multi-line with standalone "vs" divider
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-    
-    if vs_line_idx is not None:
-        # Look for team-like content before and after vs line
-        team_a = None
-        team_b = None
-        
-        # Search backward from vs for team A
-        # Skip over mention lines (lines starting with @) without limit
-        # But stop after checking 15 lines total to avoid runaway
-        for i in range(vs_line_idx - 1, max(0, vs_line_idx - 15) - 1, -1):
-            ln = lines[i].strip()
-            if not ln:
-                continue
-            # Skip lines that start with @ (mention lines)
-            if ln.startswith("@"):
-                continue
-            # Found a non-mention line - check if it's a team
-            m = TEAM_RECORD_RE.match(ln)
-            if m:
-                team_a = clean_team_name(m.group(1))
-                break
-            # Or just use the line if it looks team-ish (short, no @)
-            elif len(ln) < 50:
-                team_a = clean_team_name(ln)
-                break
-        
-        # Search forward from vs for team B
-        # Same logic: skip mention lines
-        for i in range(vs_line_idx + 1, min(len(lines), vs_line_idx + 15)):
-            ln = lines[i].strip()
-            if not ln:
-                continue
-            if ln.startswith("@"):
-                continue
-            m = TEAM_RECORD_RE.match(ln)
-            if m:
-                team_b = clean_team_name(m.group(1))
-                break
-            elif len(ln) < 50:
-                team_b = clean_team_name(ln)
-                break
-        
-        if team_a or team_b:
-            return (team_a, team_b)
-    
-    return (None, None)
-
-def extract_mentions(text: str):
-    if not text:
-        return []
-    return MENTION_RE.findall(text)
-
-def is_captain_marker(text_after_mention: str) -> bool:
-    """
-    Check if the text following a @mention indicates captain status.
-    Returns True if:
-    - Text starts with "(c)" or "(C)"
-    - Text starts with just "c" or "C" followed by whitespace/end
-    - Text contains ONLY non-alphanumeric chars (emojis/symbols like 💤🔥)
-    - Text contains only RealApp emoji codes like :doughnut: :crown:
-    """
-    if not text_after_mention:
-        return False
-    
-    text_after = text_after_mention.strip()
-    
-    # Check for explicit (c) marker
-    if re.match(r"^\s*\([cC]\)", text_after):
-        return True
-    
-    # Check for plain c marker (just "c" or "C" followed by space/end)
-    if re.match(r"^\s*[cC](?:\s|$)", text_after):
-        return True
-    
-    # Check if remaining text until next @ or end has no alphanumeric chars
-    # Get text until next mention or end of line
-    until_next = re.split(r"[@\n]", text_after)[0]
-    if until_next.strip():
-        # Remove RealApp emoji codes like :doughnut: :crown: :flag_usa:
-        cleaned = REALAPP_EMOJI_RE.sub("", until_next)
-        # Remove whitespace
-        cleaned = cleaned.strip()
-        # If there's nothing left, or only non-alphanumeric remains, it's a captain
-        if not cleaned:
-            return True
-        has_alpha = any(c.isalnum() for c in cleaned)
-        if not has_alpha:
-            return True
-    
-    return False
-
-def detect_captains(text: str):
-    """
-    Detect captain candidates from text.
-    Returns: (captain_a_guess, captain_b_guess, all_candidates)
-    
-    Strategy:
-    1. If there's a standalone "vs" line, split into team A/B blocks
-    2. Find explicit (c) markers
-    3. Find plain 'c' markers
-    4. Find implicit markers (mention followed by only emoji/symbols)
-    5. Return best guesses per team block
-    """
-    if not text:
-        return (None, None, [])
-    
-    lines = text.splitlines()
-    all_mentions = extract_mentions(text)
-    
-    # Find explicit captains: @user (c)
-    explicit_captains = CAPTAIN_EXPLICIT_RE.findall(text)
-    
-    # Find plain c captains: @user c
-    plain_c_captains = CAPTAIN_PLAIN_C_RE.findall(text)
-    
-    # Find implicit captains (mention followed by only non-alphanumeric/emoji)
-    implicit_captains = []
-    for m in MENTION_WITH_TRAIL_RE.finditer(text):
-        username = m.group(1)
-        trailing = m.group(2)
-        if username not in explicit_captains and username not in plain_c_captains and is_captain_marker(trailing):
-            implicit_captains.append(username)
-    
-    all_captain_candidates = list(dict.fromkeys(explicit_captains + plain_c_captains + implicit_captains))
-    
-    # Try to split by "vs" line to assign captains to teams
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-    
-    captain_a = None
-    captain_b = None
-    
-    if vs_line_idx is not None:
-        # Split text into before-vs and after-vs blocks
-        text_before_vs = "\n".join(lines[:vs_line_idx])
-        text_after_vs = "\n".join(lines[vs_line_idx + 1:])
-        
-        # Find captains in each block
-        captains_before = []
-        captains_after = []
-        
-        for cap in all_captain_candidates:
-            # Check which block contains this captain mention with marker
-            pattern = rf"@{re.escape(cap)}"
-            if re.search(pattern, text_before_vs):
-                captains_before.append(cap)
-            if re.search(pattern, text_after_vs):
-                captains_after.append(cap)
-        
-        captain_a = captains_before[0] if captains_before else None
-        captain_b = captains_after[0] if captains_after else None
-    else:
-        # No clear split, just return first two captain candidates
-        if len(all_captain_candidates) >= 1:
-            captain_a = all_captain_candidates[0]
-        if len(all_captain_candidates) >= 2:
-            captain_b = all_captain_candidates[1]
-    
-    return (captain_a, captain_b, all_captain_candidates)
-
 DATE_MMDD_RE = re.compile(r"\b(\d{1,2})[/-](\d{1,2})\b")
 
-def parse_timestamp_to_eastern(ts_str: str | None) -> date | None:
-    """Parse timestamp string and convert to US Eastern date."""
-    if not ts_str:
-        return None
-    try:
-        # Parse ISO format timestamp
-        dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00").replace(" ", "T"))
-        # Convert to Eastern time
-        dt_eastern = dt.astimezone(EASTERN)
-        return dt_eastern.date()
-    except Exception:
-        return None
-
-def infer_game_date(thread_created_ts: str | None) -> str | None:
+def link_result_to_lineup(item: dict, lineups: LineupIndex | None = None) -> dict:
     """
-    Use the thread's posted date (in US Eastern time) as the game date.
-    """
-    eastern_date = parse_timestamp_to_eastern(thread_created_ts)
-    if eastern_date:
-        return eastern_date.isoformat()
-    return None
+    Point an extracted result at its lineup, if one matches.
 
-def auto_extract_comment(thread_id: int, comment_id: int, source: str,
-                          text: str, thread_text: str, thread_created_ts: str) -> dict | None:
+    The lineup's game date replaces the thread date (which is only an upper
+    bound for when the game was played).
     """
-    Automatically extract data from a comment.
-    Returns dict with extracted data, or None if not extractable (no teams/mentions found).
-    """
-    if not text:
-        return None
-
-    combined_text = (thread_text or "") + "\n\n" + text
-
-    # Detect type
-    kind = guess_kind(text)
-
-    # Get game date from thread
-    game_date = infer_game_date(thread_created_ts)
-
-    # Handle results
-    if kind == "result":
-        result = extract_game_result(text)
-        if result and result.get("team_a") and result.get("team_b"):
-            # Try to find a matching lineup to get the correct game date
-            linked_lineup = find_matching_lineup(
-                result["team_a"],
-                result["team_b"],
-                game_date  # Use thread date as upper bound
-            )
-
-            # Use lineup's game_date if found, otherwise fall back to thread date
-            actual_game_date = game_date
-            linked_extract_id = None
-            if linked_lineup:
-                actual_game_date = linked_lineup["game_date"]
-                linked_extract_id = linked_lineup["id"]
-
-            return {
-                "thread_id": thread_id,
-                "comment_id": comment_id,
-                "source": source,
-                "kind": kind,
-                "game_date": actual_game_date,
-                "team_a": result["team_a"],
-                "team_b": result["team_b"],
-                "captain_a": None,
-                "captain_b": None,
-                "mentions_a": None,
-                "mentions_b": None,
-                "seed_a": result.get("seed_a"),
-                "seed_b": result.get("seed_b"),
-                "round_name": result.get("round_name"),
-                "score_a": result.get("score_a"),
-                "score_b": result.get("score_b"),
-                "winner": result.get("winner"),
-                "adjustment_a": result.get("adjustment_a"),
-                "adjustment_b": result.get("adjustment_b"),
-                "linked_extract_id": linked_extract_id,
-                "raw_text": text,
-            }
-        return None
-
-    # Handle lineups (original logic)
-    if kind != "lineup":
-        return None
-
-    # Get teams
-    team_a, team_b = guess_teams(combined_text)
-
-    # Need at least one team to be a valid extraction
-    if not team_a and not team_b:
-        return None
-
-    # Get mentions by team
-    mentions_a, mentions_b, all_mentions = extract_mentions_by_team(text)
-
-    # Need some mentions to be useful
-    if not mentions_a and not mentions_b:
-        return None
-
-    # Get captains
-    captain_a, captain_b, _ = detect_captains(text)
-
-    # Get postseason info
-    round_name, seed_a, seed_b = detect_postseason_info(text)
-
-    return {
-        "thread_id": thread_id,
-        "comment_id": comment_id,
-        "source": source,
-        "kind": kind,
-        "game_date": game_date,
-        "team_a": team_a,
-        "team_b": team_b,
-        "captain_a": captain_a,
-        "captain_b": captain_b,
-        "mentions_a": ", ".join(mentions_a) if mentions_a else None,
-        "mentions_b": ", ".join(mentions_b) if mentions_b else None,
-        "seed_a": seed_a,
-        "seed_b": seed_b,
-        "round_name": round_name,
-        "score_a": None,
-        "score_b": None,
-        "winner": None,
-        "adjustment_a": None,
-        "adjustment_b": None,
-        "linked_extract_id": None,
-        "raw_text": text,
-    }
-
-def _save_auto_extract(result: dict) -> bool:
+    if item["kind"] != "result":
+        return item
+    linked_lineup = find_matching_lineup(item["team_a"], item["team_b"], item["game_date"], lineups)
+    if linked_lineup:
+        item["game_date"] = linked_lineup["game_date"]
+        item["linked_extract_id"] = linked_lineup["id"]
+    return item
+
+def _save_auto_extract(con: sqlite3.Connection, result: dict, existing_ids: set,
+                       scored_ids: set, lineups: LineupIndex | None = None) -> bool:
     """
     Save an auto-extracted result. If it's a result with a linked lineup,
     update that lineup's row instead of creating a new one.
+
+    Does not commit: the caller owns the transaction. existing_ids (comment
+    ids with an extract), scored_ids (extract ids that already have a
+    score) and lineups are kept in step with what was written.
     Returns True if saved, False if skipped.
     """
     linked_id = result.get("linked_extract_id")
 
     if linked_id and result["kind"] == "result":
         # Update the linked lineup row with result data
-        x("""
+        con.execute("""
           UPDATE manual_extract SET
             score_a = ?, score_b = ?, winner = ?,
             adjustment_a = ?, adjustment_b = ?
@@ -993,10 +839,14 @@ def _save_auto_extract(result: dict) -> bool:
             result.get("adjustment_a"), result.get("adjustment_b"),
             linked_id
         ))
+        if result.get("score_a") is not None:
+            scored_ids.add(linked_id)
+        else:
+            scored_ids.discard(linked_id)
         return True
     else:
         # Create new row
-        x("""
+        cur = con.execute("""
           INSERT INTO manual_extract(
             created_at, thread_id, comment_id, source, kind, game_date, team_a, team_b,
             mentions, notes, raw_text, captain_a, captain_b, mentions_a, mentions_b,
@@ -1014,6 +864,11 @@ def _save_auto_extract(result: dict) -> bool:
             result.get("adjustment_a"), result.get("adjustment_b"),
             None
         ))
+        existing_ids.add(result["comment_id"])
+        record_team_aliases(con, (result["team_a"], result["team_b"]))
+        if lineups is not None and result["kind"] == "lineup":
+            lineups.add({"id": cur.lastrowid, **{k: result[k] for k in
+                         ("game_date", "team_a", "team_b", "thread_id", "comment_id")}})
         return True
 
 
@@ -1030,15 +885,16 @@ def run_auto_extract_for_thread(thread_id: int, skip_existing: bool = True,
 
     Returns (extracted_count, skipped_count).
     """
-    # Get thread info
-    thread = q("SELECT plain_text, created_at_ts, source FROM rkl_comments WHERE comment_id = ?", (thread_id,))
-    if not thread:
-        return (0, 0)
-
-    thread_text = thread[0]["plain_text"]
-    thread_created_ts = thread[0]["created_at_ts"]
-    thread_source = thread[0]["source"]
+    extracted, skipped, _ = run_auto_extract_bulk([thread_id], skip_existing, extract_mode)
+    return (extracted, skipped)
 
+def _auto_extract_thread(con: sqlite3.Connection, thread_id: int, thread_item: dict | None,
+                         reply_items: list, skip_existing: bool, extract_mode: str,
+                         existing_ids: set, scored_ids: set, lineups: LineupIndex) -> tuple[int, int]:
+    """
+    Link and save one thread's extracted items (from extract_thread).
+    Returns (extracted_count, skipped_count).
+    """
     extracted = 0
     skipped = 0
 
@@ -1050,76 +906,29 @@ def run_auto_extract_for_thread(thread_id: int, skip_existing: bool = True,
 
     def check_skip_for_results(result: dict) -> bool:
         """
-        For results with linked lineups, we don't skip - we update the lineup.
+        For results with linked lineups, we don't skip - we update the lineup,
+        unless it already has scores.
         For results without links, check if comment already extracted.
         """
         if result["kind"] == "result" and result.get("linked_extract_id"):
-            # Check if this lineup already has scores
-            existing = q("SELECT score_a FROM manual_extract WHERE id = ?", (result["linked_extract_id"],))
-            if existing and existing[0]["score_a"] is not None:
-                return True  # Already has result data
-            return False  # Can update
+            return result["linked_extract_id"] in scored_ids
         return False  # Don't skip
 
     # First, try to extract from the thread itself (for GOTD/postseason standalone posts)
     should_check_existing = skip_existing and extract_mode != "result"
 
-    if should_check_existing:
-        existing = q("SELECT id FROM manual_extract WHERE comment_id = ? LIMIT 1", (thread_id,))
-        if existing:
-            skipped += 1
-        else:
-            result = auto_extract_comment(
-                thread_id=thread_id,
-                comment_id=thread_id,
-                source=thread_source or "feed",
-                text=thread_text,
-                thread_text="",
-                thread_created_ts=thread_created_ts
-            )
-            if result and should_process(result["kind"]):
-                if not check_skip_for_results(result):
-                    _save_auto_extract(result)
-                    extracted += 1
-                else:
-                    skipped += 1
+    if should_check_existing and thread_id in existing_ids:
+        skipped += 1
     else:
-        result = auto_extract_comment(
-            thread_id=thread_id,
-            comment_id=thread_id,
-            source=thread_source or "feed",
-            text=thread_text,
-            thread_text="",
-            thread_created_ts=thread_created_ts
-        )
+        result = link_result_to_lineup(thread_item, lineups) if thread_item else None
         if result and should_process(result["kind"]):
             if not check_skip_for_results(result):
-                _save_auto_extract(result)
+                _save_auto_extract(con, result, existing_ids, scored_ids, lineups)
                 extracted += 1
             else:
                 skipped += 1
 
-    # Get all replies
-    replies = q(
-        """SELECT comment_id, plain_text, source FROM rkl_comments
-           WHERE source='replies' AND (thread_root_id = ? OR parent_comment_id = ?)
-           ORDER BY created_at_ts ASC""",
-        (thread_id, thread_id)
-    )
-
-    for reply in replies:
-        comment_id = reply["comment_id"]
-
-        # Try to auto-extract first to know the kind
-        result = auto_extract_comment(
-            thread_id=thread_id,
-            comment_id=comment_id,
-            source="replies",
-            text=reply["plain_text"],
-            thread_text=thread_text,
-            thread_created_ts=thread_created_ts
-        )
-
+    for result in reply_items:
         if not result:
             skipped += 1
             continue
@@ -1128,45 +937,344 @@ def run_auto_extract_for_thread(thread_id: int, skip_existing: bool = True,
         if not should_process(result["kind"]):
             skipped += 1
             continue
+        comment_id = result["comment_id"]
+        link_result_to_lineup(result, lineups)
 
         # For lineups, check if already extracted
-        if result["kind"] == "lineup" and skip_existing:
-            existing = q("SELECT id FROM manual_extract WHERE comment_id = ? LIMIT 1", (comment_id,))
-            if existing:
-                skipped += 1
-                continue
+        if result["kind"] == "lineup" and skip_existing and comment_id in existing_ids:
+            skipped += 1
+            continue
 
         # For results, check if we should skip
         if check_skip_for_results(result):
             skipped += 1
             continue
 
-        _save_auto_extract(result)
+        _save_auto_extract(con, result, existing_ids, scored_ids, lineups)
         extracted += 1
 
     return (extracted, skipped)
 
+# Ids per IN (...) list; SQLite builds may cap bound parameters at 999
+IN_CHUNK_SIZE = 400
+
+def _chunked(ids: list, size: int = IN_CHUNK_SIZE):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+def _prefetch_threads(thread_ids: list[int]) -> tuple[dict, dict]:
+    """
+    Load thread rows and their replies for a whole batch.
+    Returns ({thread_id: row}, {thread_id: [reply rows, oldest first]}).
+    """
+    threads = {}
+    replies = defaultdict(list)
+    for chunk in _chunked(thread_ids):
+        marks = ",".join("?" * len(chunk))
+        for row in q(f"""SELECT comment_id, plain_text, eastern_date, created_at_ts, source FROM rkl_comments
+                         WHERE comment_id IN ({marks})""", chunk):
+            threads[row["comment_id"]] = row
+
+        # A reply belongs to every batch thread it names as root or parent
+        in_chunk = set(chunk)
+        for row in q(f"""SELECT comment_id, plain_text, source, thread_root_id, parent_comment_id
+                         FROM rkl_comments
+                         WHERE source='replies'
+                           AND (thread_root_id IN ({marks}) OR parent_comment_id IN ({marks}))
+                         ORDER BY created_at_ts ASC""", chunk + chunk):
+            for tid in {row["thread_root_id"], row["parent_comment_id"]} & in_chunk:
+                replies[tid].append(row)
+    return threads, replies
+
+def auto_extract_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for the CPU-bound extraction stage of auto-extract.
+    Spawned rather than forked: the Streamlit server process runs threads.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _run_auto_extract_batch(con: sqlite3.Connection, thread_ids: list[int],
+                            skip_existing: bool, extract_mode: str,
+                            executor: Executor | None = None,
+                            lineups: LineupIndex | None = None) -> tuple[int, int]:
+    """
+    Auto-extract a batch of threads on con without committing.
+
+    Text extraction runs on executor when one is given; linking results to
+    lineups and all writes stay on this connection, in thread order, so the
+    output matches a sequential run. lineups is a current LineupIndex to
+    link against and keep up to date (extract jobs pass one for the whole
+    job); without it one is loaded for the batch.
+    Returns (total_extracted, total_skipped).
+    """
+    unique_ids = list(dict.fromkeys(thread_ids))
+    threads, replies = _prefetch_threads(unique_ids)
+
+    comment_ids = list(threads) + list({r["comment_id"] for rows in replies.values() for r in rows})
+    existing_ids = set()
+    for chunk in _chunked(comment_ids):
+        marks = ",".join("?" * len(chunk))
+        existing_ids.update(r["comment_id"] for r in q(
+            f"SELECT DISTINCT comment_id FROM manual_extract WHERE comment_id IN ({marks})", chunk))
+    # Result linking reads lineups from memory; inserts below keep it current
+    if lineups is None:
+        lineups = LineupIndex.load(con)
+    # Only lineups are ever linked to, so their scored ids are all that's needed
+    scored_ids = lineups.scored
+
+    total_extracted = 0
+    total_skipped = 0
+
+    batch = [tid for tid in thread_ids if tid in threads]
+    # Plain dicts, so they can be pickled to worker processes
+    thread_args = [
+        {k: threads[tid][k] for k in ("comment_id", "plain_text", "eastern_date", "created_at_ts", "source")}
+        for tid in batch
+    ]
+    reply_args = [
+        [{"comment_id": r["comment_id"], "plain_text": r["plain_text"]} for r in replies[tid]]
+        for tid in batch
+    ]
+    if executor is not None:
+        chunksize = max(1, len(batch) // (4 * (os.cpu_count() or 1)))
+        extracted_items = executor.map(extract_thread, thread_args, reply_args, chunksize=chunksize)
+    else:
+        extracted_items = map(extract_thread, thread_args, reply_args)
+
+    for tid, (thread_item, reply_items) in zip(batch, extracted_items):
+        ext, skip = _auto_extract_thread(con, tid, thread_item, reply_items, skip_existing,
+                                         extract_mode, existing_ids, scored_ids, lineups)
+        total_extracted += ext
+        total_skipped += skip
+
+    return (total_extracted, total_skipped)
+
 def run_auto_extract_bulk(thread_ids: list[int], skip_existing: bool = True,
-                          extract_mode: str = "both") -> tuple[int, int, int]:
+                          extract_mode: str = "both", workers: int = 1) -> tuple[int, int, int]:
     """
     Auto-extract for multiple threads.
 
+    Threads, replies, already-extracted comment ids and already-scored lineup
+    ids are loaded up front in a few set-based queries, and every insert and
+    update is written in a single transaction.
+
     Args:
         thread_ids: List of thread IDs to process
         skip_existing: Skip comments that already have extracts
         extract_mode: "lineup" (only lineups), "result" (only results), or "both"
+        workers: Processes for text extraction; 1 extracts in this process
 
     Returns (total_extracted, total_skipped, threads_processed).
     """
-    total_extracted = 0
-    total_skipped = 0
+    if workers > 1:
+        with auto_extract_pool(workers) as executor, transaction() as con:
+            total_extracted, total_skipped = _run_auto_extract_batch(
+                con, thread_ids, skip_existing, extract_mode, executor)
+    else:
+        with transaction() as con:
+            total_extracted, total_skipped = _run_auto_extract_batch(con, thread_ids, skip_existing, extract_mode)
+    return (total_extracted, total_skipped, len(thread_ids))
 
-    for tid in thread_ids:
-        ext, skip = run_auto_extract_for_thread(tid, skip_existing, extract_mode)
-        total_extracted += ext
-        total_skipped += skip
+# ----------------------------
+# Background auto-extract jobs
+# ----------------------------
+# Threads per worker transaction; progress and cancellation are per chunk
+JOB_CHUNK_SIZE = 50
+# Seconds the idle worker waits before checking rkl.db for queued jobs
+JOB_POLL_SECONDS = 2.0
+
+def create_extract_job(thread_ids: list[int], skip_existing: bool, extract_mode: str,
+                       workers: int = 1) -> int:
+    """Queue an auto-extract job over thread_ids. Returns the job id."""
+    with transaction() as con:
+        cur = con.execute("""
+          INSERT INTO extract_job(created_at, updated_at, status, extract_mode, skip_existing, workers, total)
+          VALUES (datetime('now'), datetime('now'), 'queued', ?, ?, ?, ?)
+        """, (extract_mode, int(skip_existing), workers, len(thread_ids)))
+        job_id = cur.lastrowid
+        con.executemany(
+            "INSERT INTO extract_job_thread(job_id, position, thread_id) VALUES (?,?,?)",
+            [(job_id, pos, tid) for pos, tid in enumerate(thread_ids)]
+        )
+    return job_id
 
-    return (total_extracted, total_skipped, len(thread_ids))
+def cancel_extract_job(job_id: int):
+    """Stop a job after its current chunk; finished threads stay extracted."""
+    x("""UPDATE extract_job SET status='cancelled', updated_at=datetime('now')
+         WHERE id = ? AND status IN ('queued', 'running')""", (job_id,))
+
+def resume_extract_job(job_id: int):
+    """Re-queue a cancelled or failed job; it continues with its unfinished threads."""
+    x("""UPDATE extract_job SET status='queued', error=NULL, updated_at=datetime('now')
+         WHERE id = ? AND status IN ('cancelled', 'failed')""", (job_id,))
+
+def recent_extract_jobs(limit: int = 5) -> list[sqlite3.Row]:
+    return q("SELECT * FROM extract_job ORDER BY id DESC LIMIT ?", (limit,))
+
+class ExtractJobRunner:
+    """
+    Runs queued extract jobs on a daemon thread with its own connection.
+    Its write transactions take _write_lock like the UI's, one chunk at a time.
+
+    Each chunk's extracts and its progress are committed together, so a job
+    interrupted by a restart resumes from the first unfinished thread. Jobs
+    left 'running' by a previous server process are picked up again.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="extract-jobs", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self):
+        con = connect(self.db_path)
+        _thread_con.con = con
+        while True:
+            job = con.execute(
+                "SELECT * FROM extract_job WHERE status IN ('queued', 'running') ORDER BY id LIMIT 1"
+            ).fetchone()
+            if job is None:
+                self._wake.wait(JOB_POLL_SECONDS)
+                self._wake.clear()
+                continue
+            try:
+                self._run_job(con, job)
+            except Exception as e:
+                con.rollback()
+                with transaction():
+                    con.execute("""UPDATE extract_job SET status='failed', error=?, updated_at=datetime('now')
+                                   WHERE id = ?""", (f"{type(e).__name__}: {e}", job["id"]))
+
+    def _run_job(self, con: sqlite3.Connection, job: sqlite3.Row):
+        workers = job["workers"] or 1
+        if workers <= 1:
+            self._run_chunks(con, job, None, JOB_CHUNK_SIZE)
+            return
+        # One pool for the whole job; bigger chunks keep every worker busy
+        with auto_extract_pool(workers) as executor:
+            self._run_chunks(con, job, executor, JOB_CHUNK_SIZE * workers)
+
+    def _run_chunks(self, con: sqlite3.Connection, job: sqlite3.Row,
+                    executor: Executor | None, chunk_size: int):
+        job_id = job["id"]
+        with transaction():
+            con.execute("""UPDATE extract_job SET status='running', updated_at=datetime('now')
+                           WHERE id = ? AND status = 'queued'""", (job_id,))
+        # One lineup index for the whole job, kept current by the job's own inserts;
+        # reloaded only if someone else wrote manual_extract between chunks
+        lineups = None
+        seen = None
+        while True:
+            status = con.execute("SELECT status FROM extract_job WHERE id = ?", (job_id,)).fetchone()
+            if status is None or status["status"] != "running":
+                return  # cancelled from the UI
+            chunk = con.execute("""
+              SELECT position, thread_id FROM extract_job_thread
+              WHERE job_id = ? AND done = 0 ORDER BY position LIMIT ?
+            """, (job_id, chunk_size)).fetchall()
+            if not chunk:
+                with transaction():
+                    con.execute("""UPDATE extract_job SET status='done', updated_at=datetime('now')
+                                   WHERE id = ? AND status = 'running'""", (job_id,))
+                return
+            with transaction():
+                if lineups is None or seen != (query_cache.generations(("manual_extract",)), query_cache.external):
+                    lineups = LineupIndex.load(con)
+                extracted, skipped = _run_auto_extract_batch(
+                    con, [r["thread_id"] for r in chunk], bool(job["skip_existing"]), job["extract_mode"],
+                    executor, lineups
+                )
+                con.executemany("UPDATE extract_job_thread SET done = 1 WHERE job_id = ? AND position = ?",
+                                [(job_id, r["position"]) for r in chunk])
+                con.execute("""
+                  UPDATE extract_job SET done_count = done_count + ?, extracted = extracted + ?,
+                    skipped = skipped + ?, updated_at = datetime('now')
+                  WHERE id = ?
+                """, (len(chunk), extracted, skipped, job_id))
+            seen = (query_cache.generations(("manual_extract",)), query_cache.external)
+
+@st.cache_resource
+def job_runner() -> ExtractJobRunner:
+    db()  # make sure the schema exists before the worker starts reading it
+    return ExtractJobRunner(DB)
+
+# ----------------------------
+# Export
+# ----------------------------
+EXPORT_COLUMNS = (
+    "id", "created_at", "thread_id", "comment_id", "source", "kind", "game_date",
+    "team_a", "team_b", "captain_a", "captain_b", "mentions_a", "mentions_b",
+    "seed_a", "seed_b", "round_name", "score_a", "score_b", "winner",
+    "adjustment_a", "adjustment_b", "linked_extract_id", "notes",
+)
+# Rows fetched and written per step, so memory stays flat whatever the table size
+EXPORT_CHUNK_ROWS = 5000
+# label -> (file name, mime type); Parquet needs pyarrow
+EXPORT_FORMATS = {
+    "CSV": ("manual_extract.csv", "text/csv"),
+    "CSV (gzip)": ("manual_extract.csv.gz", "application/gzip"),
+}
+if PYARROW_AVAILABLE:
+    EXPORT_FORMATS["Parquet"] = ("manual_extract.parquet", "application/vnd.apache.parquet")
+    EXPORT_ARROW_SCHEMA = pa.schema([
+        (col, pa.int64() if col in ("id", "thread_id", "comment_id", "linked_extract_id")
+         else pa.float64() if col in ("score_a", "score_b", "adjustment_a", "adjustment_b")
+         else pa.string())
+        for col in EXPORT_COLUMNS
+    ])
+
+def _export_chunks(con: sqlite3.Connection):
+    cur = con.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM manual_extract ORDER BY id DESC")
+    while rows := cur.fetchmany(EXPORT_CHUNK_ROWS):
+        yield rows
+
+def _write_export_csv(con: sqlite3.Connection, sink) -> int:
+    text = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+    w = csv.writer(text)
+    w.writerow(EXPORT_COLUMNS)
+    n = 0
+    for rows in _export_chunks(con):
+        w.writerows(rows)
+        n += len(rows)
+    text.flush()
+    text.detach()  # leave sink open for the caller
+    return n
+
+def _write_export_parquet(con: sqlite3.Connection, sink) -> int:
+    n = 0
+    with pq.ParquetWriter(sink, EXPORT_ARROW_SCHEMA) as writer:
+        for rows in _export_chunks(con):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, EXPORT_ARROW_SCHEMA)],
+                schema=EXPORT_ARROW_SCHEMA,
+            ))
+            n += len(rows)
+    return n
+
+def export_manual_extract(fmt: str) -> tuple[bytes, int]:
+    """
+    Every manual_extract row, newest first, in one of EXPORT_FORMATS.
+    Rows stream from a cursor on their own read connection straight into
+    the encoder, chunk by chunk. Returns (file contents, row count).
+    """
+    out = io.BytesIO()
+    con = connect(readonly=True)
+    try:
+        if fmt == "Parquet":
+            n = _write_export_parquet(con, out)
+        elif fmt == "CSV (gzip)":
+            with gzip.GzipFile(fileobj=out, mode="wb") as sink:
+                n = _write_export_csv(con, sink)
+        else:
+            n = _write_export_csv(con, out)
+    finally:
+        con.close()
+    return out.getvalue(), n
 
 def highlight(text: str) -> str:
     """
@@ -1236,6 +1344,11 @@ extract_mode = st.sidebar.radio(
 )
 extract_mode_value = {"Lineups only": "lineup", "Results only": "result", "Both": "both"}[extract_mode]
 
+auto_workers = st.sidebar.number_input(
+    "Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=1,
+    help="Processes extracting text for background jobs; one writer saves everything"
+)
+
 col_ext1, col_ext2 = st.sidebar.columns(2)
 with col_ext1:
     if st.button("📄 This page", help="Extract from threads on this page", use_container_width=True):
@@ -1243,10 +1356,43 @@ with col_ext1:
         st.session_state.auto_extract_mode = extract_mode_value
 
 with col_ext2:
-    if st.button("📚 All matching", help="Extract from ALL matching threads", use_container_width=True):
+    if st.button("📚 All matching", help="Extract from ALL matching threads in the background",
+                 use_container_width=True):
         st.session_state.auto_extract_pending = "all"
         st.session_state.auto_extract_mode = extract_mode_value
 
+# Started once per server process; picks up jobs interrupted by a restart
+job_runner()
+
+def render_extract_jobs():
+    """Progress, cancel and resume for recent background extract jobs."""
+    for job in recent_extract_jobs():
+        total = job["total"] or 0
+        fraction = min(job["done_count"] / total, 1.0) if total else 1.0
+        st.progress(fraction, text=(
+            f"#{job['id']} {job['extract_mode']} · {job['status']} · "
+            f"{job['done_count']}/{total} threads · {job['extracted']} extracted"
+        ))
+        if job["status"] in ("queued", "running"):
+            if st.button("⏹️ Cancel", key=f"cancel_job_{job['id']}", use_container_width=True):
+                cancel_extract_job(job["id"])
+                st.rerun()
+        elif job["status"] in ("cancelled", "failed"):
+            if job["error"]:
+                st.caption(f"⚠️ {job['error']}")
+            if st.button("▶️ Resume", key=f"resume_job_{job['id']}", use_container_width=True):
+                resume_extract_job(job["id"])
+                job_runner().wake()
+                st.rerun()
+
+# Poll while a job is active (st.fragment needs Streamlit 1.37+; older
+# versions refresh the panel on the next interaction instead)
+if hasattr(st, "fragment"):
+    jobs_active = bool(q("SELECT 1 FROM extract_job WHERE status IN ('queued', 'running') LIMIT 1"))
+    render_extract_jobs = st.fragment(run_every=JOB_POLL_SECONDS if jobs_active else None)(render_extract_jobs)
+with st.sidebar:
+    render_extract_jobs()
+
 # Keyset pagination state
 if "cursor" not in st.session_state:
     st.session_state.cursor = None
@@ -1258,55 +1404,51 @@ where = []
 params = []
 
 if only_threads:
-    where.append("c.source = 'feed'")
+    where.append("ts.source = 'feed'")
 if kw:
-    where.append("c.plain_text LIKE ?")
-    params.append(f"%{kw}%")
+    kw_sql, kw_params = keyword_filter(kw, "ts.thread_id", "c.plain_text", _has_table(_reader(), "rkl_comments_fts"))
+    where.append(kw_sql)
+    params.extend(kw_params)
 if date_filter:
-    # Filter by the thread's posted date (converted to Eastern time in Python)
-    # We'll filter by a date range in UTC that covers the Eastern day
-    # Eastern day starts at 05:00 UTC (or 04:00 during DST)
-    # For simplicity, filter by date portion of created_at_ts (close enough)
-    date_str = date_filter.isoformat()
-    where.append("DATE(c.created_at_ts) = ?")
-    params.append(date_str)
+    # The thread's posted date in US Eastern time, as auto-extract dates games
+    where.append("ts.game_date = ?")
+    params.append(date_filter.isoformat())
 if has_replies:
-    where.append("COALESCE(c.reply_count,0) > 0")
+    where.append("ts.reply_count > 0")
 
-# queue heuristics (SQL-friendly)
+# queue heuristics, precomputed in thread_summary (see THREAD_HINT_SQL)
 if mode == "Lineups (likely)":
-    where.append("(c.plain_text LIKE '%Lineups%' OR lower(c.plain_text) LIKE '% vs %')")
-    where.append("COALESCE(c.reply_count,0) > 0")
+    where.append("ts.likely_lineup")
+    where.append("ts.reply_count > 0")
 elif mode == "Results (likely)":
-    where.append("(c.plain_text LIKE '%✅%' OR c.plain_text LIKE '%❌%')")
+    where.append("ts.likely_result")
 elif mode == "Leaderboards (likely)":
-    where.append("(c.plain_text LIKE '%Top Team Scores%' OR c.plain_text LIKE '%Median%')")
+    where.append("ts.likely_leaderboard")
 
-# status filter via LEFT JOIN to thread_state
-join_state = "LEFT JOIN thread_state s ON s.thread_id = c.comment_id"
 if status_filter != "All":
-    where.append("COALESCE(s.status,'todo') = ?")
+    where.append("ts.status = ?")
     params.append(status_filter)
 elif hide_done:
-    where.append("COALESCE(s.status,'todo') != 'done'")
+    where.append("ts.status != 'done'")
 
+# thread_summary drives the scan; rkl_comments is joined for the text
+join_text = "JOIN rkl_comments c ON c.comment_id = ts.thread_id"
 where_sql = ("WHERE " + " AND ".join(where)) if where else ""
 
 # keyset cursor on created_at_ts + comment_id
 cursor = st.session_state.cursor
 if cursor:
-    where_sql += (" AND " if where_sql else "WHERE ") + "(c.created_at_ts, c.comment_id) < (?, ?)"
+    where_sql += (" AND " if where_sql else "WHERE ") + "(ts.created_at_ts, ts.thread_id) < (?, ?)"
     params.extend([cursor[0], cursor[1]])
 
 threads = q(
     f"""
-    SELECT c.comment_id, c.created_at_ts, c.reply_count, c.plain_text,
-           COALESCE(s.status,'todo') AS status,
-           (SELECT COUNT(*) FROM manual_extract e WHERE e.thread_id = c.comment_id) AS extract_count
-    FROM rkl_comments c
-    {join_state}
+    SELECT ts.thread_id AS comment_id, ts.created_at_ts, ts.reply_count, c.plain_text,
+           ts.status, ts.extract_count
+    FROM thread_summary ts
+    {join_text}
     {where_sql}
-    ORDER BY c.created_at_ts DESC, c.comment_id DESC
+    ORDER BY ts.created_at_ts DESC, ts.thread_id DESC
     LIMIT ?
     """,
     tuple(params + [limit])
@@ -1327,11 +1469,11 @@ if st.session_state.get("auto_extract_pending") == "all":
     # Query ALL matching threads (no LIMIT)
     all_threads = q(
         f"""
-        SELECT c.comment_id
-        FROM rkl_comments c
-        {join_state}
-        {where_sql.replace("(c.created_at_ts, c.comment_id) < (?, ?)", "1=1") if cursor else where_sql}
-        ORDER BY c.created_at_ts DESC
+        SELECT ts.thread_id AS comment_id
+        FROM thread_summary ts
+        {join_text}
+        {where_sql.replace("(ts.created_at_ts, ts.thread_id) < (?, ?)", "1=1") if cursor else where_sql}
+        ORDER BY ts.created_at_ts DESC
         """,
         tuple([p for p in params if p not in (cursor[0] if cursor else None, cursor[1] if cursor else None)])
         if cursor else tuple(params)
@@ -1342,9 +1484,9 @@ if st.session_state.get("auto_extract_pending") == "all":
     mode_label = {"lineup": "lineups", "result": "results", "both": "items"}[mode]
 
     if thread_ids:
-        with st.spinner(f"Auto-extracting {mode_label} from {len(thread_ids)} threads (this may take a while)..."):
-            extracted, skipped, processed = run_auto_extract_bulk(thread_ids, auto_skip_existing, mode)
-        st.toast(f"✅ Extracted {extracted} {mode_label}, skipped {skipped} (from {processed} threads)")
+        job_id = create_extract_job(thread_ids, auto_skip_existing, mode, int(auto_workers))
+        job_runner().wake()
+        st.toast(f"🧵 Queued job #{job_id}: {mode_label} from {len(thread_ids)} threads (progress in sidebar)")
     else:
         st.toast("No threads match current filters")
     st.session_state.auto_extract_pending = None
@@ -1400,7 +1542,8 @@ with colR:
     else:
         thread = q("SELECT * FROM rkl_comments WHERE comment_id = ?", (sel,))
         thread_text = thread[0]["plain_text"] if thread else ""
-        thread_created = thread[0]["created_at_ts"] if thread else None
+        # eastern_date is only filled at startup for comments added since
+        thread_date = (thread[0]["eastern_date"] or infer_game_date(thread[0]["created_at_ts"])) if thread else None
         thread_reply_count = thread[0]["reply_count"] if thread else 0
 
         st.subheader(f"Thread #{sel}")
@@ -1560,7 +1703,11 @@ with colR:
                             st.session_state.editing_extract_id = ext_id
                     with col_del:
                         if st.button("🗑️", key=f"del_{ext_id}", help="Delete this extract"):
-                            x("DELETE FROM manual_extract WHERE id = ?", (ext_id,))
+                            with transaction() as con:
+                                old_teams = con.execute("SELECT team_a, team_b FROM manual_extract WHERE id = ?",
+                                                        (ext_id,)).fetchone()
+                                con.execute("DELETE FROM manual_extract WHERE id = ?", (ext_id,))
+                                forget_team_aliases(con, old_teams or ())
                             st.rerun()
 
                     # Inline edit form
@@ -1609,17 +1756,22 @@ with colR:
                                             return float(s.replace(",", ""))
                                         except ValueError:
                                             return None
-                                    x("""UPDATE manual_extract SET
-                                         team_a=?, team_b=?, captain_a=?, captain_b=?,
-                                         mentions_a=?, mentions_b=?, score_a=?, score_b=?,
-                                         winner=?, adjustment_a=?, adjustment_b=?, notes=?
-                                       WHERE id=?""",
-                                      (new_team_a, new_team_b, new_cap_a, new_cap_b,
-                                       new_mentions_a, new_mentions_b,
-                                       parse_edit_float(new_score_a), parse_edit_float(new_score_b),
-                                       new_winner or None, parse_edit_float(new_adj_a), parse_edit_float(new_adj_b),
-                                       "" if is_auto else ext["notes"],  # Clear auto-extracted note on edit
-                                       ext_id))
+                                    with transaction() as con:
+                                        old_teams = con.execute("SELECT team_a, team_b FROM manual_extract WHERE id = ?",
+                                                                (ext_id,)).fetchone()
+                                        con.execute("""UPDATE manual_extract SET
+                                             team_a=?, team_b=?, captain_a=?, captain_b=?,
+                                             mentions_a=?, mentions_b=?, score_a=?, score_b=?,
+                                             winner=?, adjustment_a=?, adjustment_b=?, notes=?
+                                           WHERE id=?""",
+                                          (new_team_a, new_team_b, new_cap_a, new_cap_b,
+                                           new_mentions_a, new_mentions_b,
+                                           parse_edit_float(new_score_a), parse_edit_float(new_score_b),
+                                           new_winner or None, parse_edit_float(new_adj_a), parse_edit_float(new_adj_b),
+                                           "" if is_auto else ext["notes"],  # Clear auto-extracted note on edit
+                                           ext_id))
+                                        forget_team_aliases(con, old_teams or ())
+                                        record_team_aliases(con, (new_team_a, new_team_b))
                                     st.session_state.editing_extract_id = None
                                     st.rerun()
                             with e8:
@@ -1745,13 +1897,14 @@ with colR:
             round_name_guess, seed_a_guess, seed_b_guess = detect_postseason_info(extract_text)
 
         # Team-specific mentions
-        mentions_a_guess, mentions_b_guess, all_mentions_guess = extract_mentions_by_team(extract_text)
+        mentions_a_guess, mentions_b_guess = extract_mentions_by_team(extract_text)
+        all_mentions_guess = extract_mentions(extract_text)
 
         # Captain detection
         captain_a_guess, captain_b_guess, captain_candidates = detect_captains(extract_text)
 
         # date guess uses thread's posted date in Eastern time
-        thread_date_guess = infer_game_date(thread_created)
+        thread_date_guess = thread_date
         game_date_guess = thread_date_guess
 
         # For results, try to find matching lineup to get correct game date
@@ -1782,6 +1935,10 @@ with colR:
             team_a = st.text_input("Team A", value=team_a_guess or "")
         with row1d:
             team_b = st.text_input("Team B", value=team_b_guess or "")
+        for label, name in (("Team A", team_a), ("Team B", team_b)):
+            usual = canonical_team(name)
+            if usual and usual != name.strip():
+                st.caption(f"{label} is usually spelled “{usual}”")
 
         # Captains and seeds row
         row2a, row2b, row2c, row2d, row2e = st.columns([1, 1, 0.5, 0.5, 2])
@@ -1906,18 +2063,20 @@ with colR:
                 ))
             else:
                 # Create new row (for lineups or unlinked results)
-                x("""
-                  INSERT INTO manual_extract(
-                    created_at, thread_id, comment_id, source, kind, game_date, team_a, team_b,
-                    mentions, notes, raw_text, captain_a, captain_b, mentions_a, mentions_b,
-                    seed_a, seed_b, round_name, score_a, score_b, winner, adjustment_a, adjustment_b,
-                    linked_extract_id
-                  ) VALUES (datetime('now'),?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """, (sel, extract_id, extract_source, kind, game_date, team_a, team_b,
-                      "", notes, extract_text, captain_a or None, captain_b or None,
-                      mentions_a or None, mentions_b or None, seed_a or None, seed_b or None,
-                      round_name or None, score_a, score_b, winner or None, adjustment_a, adjustment_b,
-                      None))
+                with transaction() as con:
+                    con.execute("""
+                      INSERT INTO manual_extract(
+                        created_at, thread_id, comment_id, source, kind, game_date, team_a, team_b,
+                        mentions, notes, raw_text, captain_a, captain_b, mentions_a, mentions_b,
+                        seed_a, seed_b, round_name, score_a, score_b, winner, adjustment_a, adjustment_b,
+                        linked_extract_id
+                      ) VALUES (datetime('now'),?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    """, (sel, extract_id, extract_source, kind, game_date, team_a, team_b,
+                          "", notes, extract_text, captain_a or None, captain_b or None,
+                          mentions_a or None, mentions_b or None, seed_a or None, seed_b or None,
+                          round_name or None, score_a, score_b, winner or None, adjustment_a, adjustment_b,
+                          None))
+                    record_team_aliases(con, (team_a, team_b))
         
         with save1:
             if st.button("💾 Save", use_container_width=True):
@@ -1950,40 +2109,24 @@ with colR:
                     st.session_state.extract_source = "replies"
                 st.rerun()
 
-        # Export extracts
+        # Export extracts: built only when asked for, not on every rerun
         st.markdown("### Export")
-        extracts = q("SELECT * FROM manual_extract ORDER BY id DESC LIMIT 50000")
-        buf = io.StringIO()
-        w = csv.writer(buf)
-        w.writerow(["id","created_at","thread_id","comment_id","source","kind","game_date",
-                    "team_a","team_b","captain_a","captain_b","mentions_a","mentions_b",
-                    "seed_a","seed_b","round_name","score_a","score_b","winner",
-                    "adjustment_a","adjustment_b","linked_extract_id","notes"])
-
-        def safe_get(row, col):
-            try:
-                return row[col] if col in row.keys() else ""
-            except:
-                return ""
-
-        for r in extracts:
-            w.writerow([
-                r["id"], r["created_at"], r["thread_id"], r["comment_id"], r["source"],
-                r["kind"], r["game_date"], r["team_a"], r["team_b"],
-                safe_get(r, "captain_a"), safe_get(r, "captain_b"),
-                safe_get(r, "mentions_a"), safe_get(r, "mentions_b"),
-                safe_get(r, "seed_a"), safe_get(r, "seed_b"), safe_get(r, "round_name"),
-                safe_get(r, "score_a"), safe_get(r, "score_b"), safe_get(r, "winner"),
-                safe_get(r, "adjustment_a"), safe_get(r, "adjustment_b"),
-                safe_get(r, "linked_extract_id"),
-                r["notes"]
-            ])
-
-        st.download_button(
-            "Download manual_extract.csv",
-            data=buf.getvalue().encode("utf-8"),
-            file_name="manual_extract.csv",
-            mime="text/csv",
-        )
+        ex1, ex2 = st.columns([2, 1])
+        with ex1:
+            export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+        with ex2:
+            if st.button("📦 Prepare export", use_container_width=True):
+                with st.spinner("Exporting manual_extract..."):
+                    st.session_state.export_file = (export_format, *export_manual_extract(export_format))
+        prepared = st.session_state.get("export_file")
+        if prepared and prepared[0] == export_format:
+            _, export_data, export_rows = prepared
+            file_name, mime = EXPORT_FORMATS[export_format]
+            st.download_button(
+                f"Download {file_name} ({export_rows:,} rows)",
+                data=export_data,
+                file_name=file_name,
+                mime=mime,
+            )
 
 st.caption("Tip: Queue modes + status tracking + Extract button should eliminate most copy/paste. 🎖️ = captain, 🏆 = postseason")
\ No newline at end of file
@@ -7,7 +7,7 @@ Original file is located at
     https://colab.research.google.com/drive/1M2aN6XbGXYxJCLOyEAZk4FklU6ozT4s8
 """
 
-!pip install supabase requests hashids
+!pip install supabase requests httpx hashids
 
 from getpass import getpass
 SUPABASE_URL = getpass("Enter your Supabase URL: ")
@@ -16,7 +16,12 @@ SUPABASE_KEY = getpass("Enter your Supabase API Key: ")
 import os
 import time
 import uuid
+import json
+import sqlite3
+import asyncio
+import importlib.util
 import requests
+import httpx
 import random
 from datetime import datetime, timedelta
 from typing import Optional
@@ -67,6 +72,19 @@ MAX_CONSECUTIVE_ERRORS = 3   # Stop after this many consecutive errors
 MAX_CONSECUTIVE_EMPTY = 2    # Stop after this many consecutive empty responses
 TIMEOUT_SECONDS = 30         # Request timeout
 
+# Concurrent scraper settings (run_scraper_async)
+DAY_CONCURRENCY = 4          # Days scraped at the same time
+REQUESTS_PER_SECOND = 3.0    # Global request budget shared by all days
+REQUEST_BURST = 3            # Requests allowed back to back after an idle spell
+MAX_CONNECTIONS = 8          # Keep-alive connection pool size
+
+# Resume state: every fetched page, and which days are finished (see ScrapeCheckpoint)
+CHECKPOINT_PATH = "khscrape_checkpoint.db"
+# Local copy of karma_rankings read by the matching scripts, written with the
+# KarmaStore class of scripts/karma_store.py (copy it here along with this file)
+KARMA_STORE_PATH = "karma_rankings.db"
+KARMA_STORE_MODULE = "scripts/karma_store.py"
+
 
 @dataclass
 class CircuitBreaker:
@@ -102,6 +120,72 @@ class CircuitBreaker:
         return False
 
 
+class ScrapeCheckpoint:
+    """
+    Local SQLite record of scrape progress, so an interrupted run (circuit
+    breaker, dead Colab session) picks up where it stopped.
+
+    Each page is committed as soon as it is fetched. A day is 'fetched' once
+    its pagination ended normally (short page, empty page or the entry cap)
+    and 'saved' once its entries are in Supabase. Saved days are skipped,
+    fetched days are saved from the stored pages, and any other day resumes
+    at the page after its last stored one, all without refetching.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH):
+        self.con = sqlite3.connect(path)
+        self.con.executescript("""
+        CREATE TABLE IF NOT EXISTS scrape_page (
+            scrape_date TEXT,
+            page_offset INTEGER,
+            entries TEXT,          -- JSON list of entries
+            fetched_at TEXT,
+            PRIMARY KEY (scrape_date, page_offset)
+        );
+        CREATE TABLE IF NOT EXISTS scrape_day (
+            scrape_date TEXT PRIMARY KEY,
+            status TEXT,           -- fetched | saved
+            entry_count INTEGER,
+            updated_at TEXT
+        );
+        """)
+
+    def day_status(self, date_str: str) -> Optional[str]:
+        row = self.con.execute("SELECT status FROM scrape_day WHERE scrape_date = ?", (date_str,)).fetchone()
+        return row[0] if row else None
+
+    def pages(self, date_str: str) -> list:
+        """Stored pages for the day as (offset, entries), in order."""
+        return [
+            (offset, json.loads(entries))
+            for offset, entries in self.con.execute(
+                "SELECT page_offset, entries FROM scrape_page WHERE scrape_date = ? ORDER BY page_offset",
+                (date_str,))
+        ]
+
+    def entries(self, date_str: str) -> list:
+        return [entry for _, entries in self.pages(date_str) for entry in entries]
+
+    def save_page(self, date_str: str, offset: int, entries: list):
+        with self.con:
+            self.con.execute(
+                "INSERT OR REPLACE INTO scrape_page VALUES (?, ?, ?, datetime('now'))",
+                (date_str, offset, json.dumps(entries)))
+
+    def set_day(self, date_str: str, status: str, entry_count: int):
+        with self.con:
+            self.con.execute(
+                "INSERT OR REPLACE INTO scrape_day VALUES (?, ?, ?, datetime('now'))",
+                (date_str, status, entry_count))
+
+    def resume_point(self, date_str: str) -> tuple:
+        """(entries already fetched, offset of the next page to fetch) for the day."""
+        pages = self.pages(date_str)
+        if not pages:
+            return [], 0
+        return [entry for _, entries in pages for entry in entries], pages[-1][0] + ENTRIES_PER_PAGE
+
+
 def fetch_leaderboard_page(date_str: str, before: Optional[int], circuit: CircuitBreaker) -> list:
     """
     Fetch a single page of leaderboard data.
@@ -163,13 +247,15 @@ def fetch_leaderboard_page(date_str: str, before: Optional[int], circuit: Circui
         return []
 
 
-def scrape_day(date_str: str, circuit: CircuitBreaker) -> list:
+def scrape_day(date_str: str, circuit: CircuitBreaker, checkpoint: ScrapeCheckpoint = None) -> list:
     """
     Scrape all leaderboard entries for a single day.
 
     Args:
         date_str: Date in YYYY-MM-DD format
         circuit: CircuitBreaker instance
+        checkpoint: Optional ScrapeCheckpoint; resumes after its last stored page
+            and records every new page, and the day once it is fully fetched
 
     Returns:
         List of all entries for the day
@@ -177,35 +263,46 @@ def scrape_day(date_str: str, circuit: CircuitBreaker) -> list:
     if circuit.is_open:
         return []
 
-    all_entries = []
-    offset = 0
+    all_entries, offset = checkpoint.resume_point(date_str) if checkpoint else ([], 0)
 
     print(f"\n📅 Scraping {date_str}...")
+    if offset:
+        print(f"  ↪️  Resuming at entry {offset + 1} ({len(all_entries)} entries from checkpoint)")
 
+    complete = offset >= MAX_ENTRIES_PER_DAY
     while offset < MAX_ENTRIES_PER_DAY and not circuit.is_open:
         # Determine the 'before' parameter
         before = offset if offset > 0 else None
 
         # Fetch page
+        errors_before = circuit.total_errors
         entries = fetch_leaderboard_page(date_str, before, circuit)
 
         if not entries:
-            # No more data or circuit opened
+            # No more data, or a failed request (which must be retried on resume)
+            complete = circuit.total_errors == errors_before
             break
 
         all_entries.extend(entries)
+        if checkpoint:
+            checkpoint.save_page(date_str, offset, entries)
         print(f"  ✓ Fetched entries {offset + 1}-{offset + len(entries)} (ranks {entries[0]['rank']}-{entries[-1]['rank']})")
 
         # Check if we got fewer than expected (end of data)
         if len(entries) < ENTRIES_PER_PAGE:
             print(f"  ℹ️  Received {len(entries)} entries (less than {ENTRIES_PER_PAGE}), likely end of data")
+            complete = True
             break
 
         offset += ENTRIES_PER_PAGE
+        complete = offset >= MAX_ENTRIES_PER_DAY
 
         # Polite delay
         time.sleep(REQUEST_DELAY_SECONDS)
 
+    if checkpoint and complete:
+        checkpoint.set_day(date_str, "fetched", len(all_entries))
+
     print(f"  📊 Total entries for {date_str}: {len(all_entries)}")
     return all_entries
 
@@ -280,30 +377,63 @@ def generate_date_range(start_date: str, end_date: str) -> list:
     return dates
 
 
-def run_scraper(start_date: str, end_date: str = None):
+def connect_supabase():
     """
-    Main function to run the scraper.
+    Create the Supabase client from SUPABASE_URL / SUPABASE_KEY.
 
-    Args:
-        start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format (defaults to start_date if not provided)
+    Returns:
+        The client, or None if it could not be created (reason printed)
     """
-    # Initialize Supabase client
     try:
         from supabase import create_client, Client
 
         if SUPABASE_URL == "YOUR_SUPABASE_URL" or SUPABASE_KEY == "YOUR_SUPABASE_ANON_KEY":
             print("❌ Please set your SUPABASE_URL and SUPABASE_KEY before running!")
             print("   Edit the configuration section at the top of this script.")
-            return
+            return None
 
         supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
         print("✅ Connected to Supabase")
+        return supabase
     except ImportError:
         print("❌ Supabase library not installed. Run: !pip install supabase")
-        return
+        return None
     except Exception as e:
         print(f"❌ Failed to connect to Supabase: {str(e)}")
+        return None
+
+
+def open_karma_store(path: str = KARMA_STORE_PATH, module_path: str = KARMA_STORE_MODULE):
+    """
+    Open the local karma store with scripts/karma_store.py's KarmaStore,
+    loaded from module_path so the store's schema is defined only there.
+    Returns None (and the store is not written) if that file is missing.
+    """
+    if not os.path.exists(module_path):
+        print(f"⚠️  {module_path} not found; not writing the local karma store")
+        return None
+    spec = importlib.util.spec_from_file_location("karma_store", module_path)
+    karma_store = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(karma_store)
+    return karma_store.KarmaStore(path)
+
+
+def run_scraper(start_date: str, end_date: str = None, checkpoint_path: Optional[str] = CHECKPOINT_PATH,
+                karma_store_path: Optional[str] = KARMA_STORE_PATH):
+    """
+    Main function to run the scraper.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format (defaults to start_date if not provided)
+        checkpoint_path: ScrapeCheckpoint file to resume from and record to (None disables)
+        karma_store_path: Local karma store each fully fetched day is also written to
+            once saved (None disables). Needs the checkpoint, which records which
+            days were fully fetched rather than cut short by the circuit breaker.
+    """
+    # Initialize Supabase client
+    supabase = connect_supabase()
+    if supabase is None:
         return
 
     # Handle date range
@@ -315,6 +445,8 @@ def run_scraper(start_date: str, end_date: str = None):
 
     # Initialize circuit breaker
     circuit = CircuitBreaker()
+    checkpoint = ScrapeCheckpoint(checkpoint_path) if checkpoint_path else None
+    karma_store = open_karma_store(karma_store_path) if karma_store_path and checkpoint else None
 
     # Track statistics
     total_entries = 0
@@ -322,27 +454,47 @@ def run_scraper(start_date: str, end_date: str = None):
 
     # Scrape each day
     for date_str in dates:
+        status = checkpoint.day_status(date_str) if checkpoint else None
+        if status == "saved":
+            print(f"\n⏭️  {date_str} already saved (checkpoint)")
+            successful_days += 1
+            continue
+
         if circuit.is_open:
             print(f"\n🛑 Circuit breaker is open. Skipping remaining dates.")
             break
 
-        # Scrape the day
-        entries = scrape_day(date_str, circuit)
+        if status == "fetched":
+            # Fully fetched before the last run stopped; only the save is missing
+            entries = checkpoint.entries(date_str)
+            print(f"\n📅 {date_str}: {len(entries)} entries from checkpoint")
+        else:
+            # Scrape the day
+            entries = scrape_day(date_str, circuit, checkpoint)
 
         if entries:
             # Save to database
             if save_to_supabase(entries, date_str, supabase):
                 total_entries += len(entries)
                 successful_days += 1
+                if checkpoint and checkpoint.day_status(date_str) == "fetched":
+                    if karma_store:
+                        karma_store.save_day(date_str, entries, complete=True)
+                    checkpoint.set_day(date_str, "saved", len(entries))
+        elif checkpoint and checkpoint.day_status(date_str) == "fetched":
+            checkpoint.set_day(date_str, "saved", 0)  # nothing to save for this day
 
         # Reset empty counter between days (empty at end of day is expected)
         circuit.consecutive_empty = 0
 
         # Extra delay between days
-        if date_str != dates[-1]:
+        if status != "fetched" and date_str != dates[-1]:
             print(f"  ⏳ Waiting before next day...")
             time.sleep(REQUEST_DELAY_SECONDS * 2)
 
+    if karma_store:
+        karma_store.close()
+
     # Summary
     print("\n" + "=" * 50)
     print("📈 SCRAPING COMPLETE")
@@ -353,4 +505,225 @@ def run_scraper(start_date: str, end_date: str = None):
     if circuit.is_open:
         print("  ⚠️  Scraping was interrupted by circuit breaker")
 
-run_scraper("2025-03-07","2025-05-14")
+
+# ============================================================================
+# CONCURRENT SCRAPER
+# ============================================================================
+
+class TokenBucket:
+    """
+    Global request budget: refills at `rate` tokens per second up to `capacity`.
+    Every request from every concurrent day takes one token first.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        async with self.lock:  # one waiter at a time, so tokens go out in order
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def fetch_leaderboard_page_async(client: httpx.AsyncClient, bucket: TokenBucket, date_str: str,
+                                       before: Optional[int], circuit: CircuitBreaker,
+                                       base_url: str = BASE_URL) -> list:
+    """
+    Fetch a single page of leaderboard data (async version of fetch_leaderboard_page).
+
+    Args:
+        client: Shared httpx.AsyncClient (keep-alive connection pool)
+        bucket: Global TokenBucket rate limit
+        date_str: Date in YYYY-MM-DD format
+        before: Offset for pagination (None for first page, 20, 40, 60, etc.)
+        circuit: CircuitBreaker shared by all days
+        base_url: Leaderboard endpoint (a local stand-in server when testing)
+
+    Returns:
+        List of user entries or empty list on failure or end of data
+    """
+    if circuit.is_open:
+        return []
+
+    url = f"{base_url}?day={date_str}"
+    if before is not None and before > 0:
+        url += f"&before={before}"
+
+    await bucket.acquire()
+    if circuit.is_open:  # another day may have tripped it while we waited
+        return []
+
+    try:
+        response = await client.get(url, headers=build_real_headers())
+
+        if response.status_code != 200:
+            circuit.record_error(f"HTTP {response.status_code} for {url}")
+            return []
+
+        users = response.json().get("users", [])
+        if users:
+            circuit.record_success()
+
+        return [
+            {
+                "user_id": user.get("userId"),
+                "username": user.get("userName"),
+                "amount": user.get("amount"),
+                "rank": user.get("rank"),
+            }
+            for user in users
+        ]
+
+    except httpx.TimeoutException:
+        circuit.record_error(f"Timeout for {url}")
+        return []
+    except httpx.HTTPError as e:
+        circuit.record_error(f"Request failed: {str(e)}")
+        return []
+    except ValueError as e:
+        circuit.record_error(f"JSON decode error: {str(e)}")
+        return []
+
+
+async def scrape_day_async(client: httpx.AsyncClient, bucket: TokenBucket, date_str: str,
+                           circuit: CircuitBreaker, base_url: str = BASE_URL,
+                           checkpoint: ScrapeCheckpoint = None) -> list:
+    """
+    Scrape all leaderboard entries for a single day. Pages within a day are
+    fetched in order (each one decides whether there is a next); days run
+    concurrently with each other. checkpoint works as in scrape_day.
+
+    Returns:
+        List of all entries for the day
+    """
+    all_entries, offset = checkpoint.resume_point(date_str) if checkpoint else ([], 0)
+
+    complete = offset >= MAX_ENTRIES_PER_DAY
+    while offset < MAX_ENTRIES_PER_DAY and not circuit.is_open:
+        before = offset if offset > 0 else None
+        errors_before = circuit.total_errors
+        entries = await fetch_leaderboard_page_async(client, bucket, date_str, before, circuit, base_url)
+
+        if not entries:
+            # No more data, or a failed request (which must be retried on resume)
+            complete = circuit.total_errors == errors_before
+            break
+
+        all_entries.extend(entries)
+        if checkpoint:
+            checkpoint.save_page(date_str, offset, entries)
+
+        if len(entries) < ENTRIES_PER_PAGE:
+            complete = True
+            break
+
+        offset += ENTRIES_PER_PAGE
+        complete = offset >= MAX_ENTRIES_PER_DAY
+
+    if checkpoint and complete:
+        checkpoint.set_day(date_str, "fetched", len(all_entries))
+
+    print(f"  📊 {date_str}: {len(all_entries)} entries")
+    return all_entries
+
+
+async def run_scraper_async(start_date: str, end_date: str = None, supabase_client=None,
+                            concurrency: int = DAY_CONCURRENCY,
+                            requests_per_second: float = REQUESTS_PER_SECOND,
+                            base_url: str = BASE_URL,
+                            checkpoint_path: Optional[str] = CHECKPOINT_PATH,
+                            karma_store_path: Optional[str] = KARMA_STORE_PATH) -> dict:
+    """
+    Scrape a date range with several days in flight at once.
+
+    All days share one keep-alive connection pool, one TokenBucket (so the
+    total request rate stays at requests_per_second however many days run)
+    and one CircuitBreaker (so consecutive errors anywhere stop everything).
+    Each finished day is saved to Supabase in a worker thread while the
+    other days keep fetching.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format (defaults to start_date if not provided)
+        supabase_client: Client to save with (connects from SUPABASE_URL/KEY if None)
+        concurrency: Days scraped at the same time
+        requests_per_second: Global request budget
+        base_url: Leaderboard endpoint (a local stand-in server when testing)
+        checkpoint_path: ScrapeCheckpoint file to resume from and record to (None disables)
+        karma_store_path: Local karma store each fully fetched day is also written to
+            once saved (None disables; needs the checkpoint, as in run_scraper)
+
+    Returns:
+        Dict mapping each date to its number of saved entries (this run only)
+    """
+    supabase = supabase_client or connect_supabase()
+    if supabase is None:
+        return {}
+
+    if end_date is None:
+        end_date = start_date
+
+    dates = generate_date_range(start_date, end_date)
+    print(f"\n🗓️  Will scrape {len(dates)} day(s): {dates[0]} to {dates[-1]} "
+          f"({concurrency} at a time, {requests_per_second:g} req/s)")
+
+    circuit = CircuitBreaker()
+    bucket = TokenBucket(requests_per_second, REQUEST_BURST)
+    day_slots = asyncio.Semaphore(concurrency)
+    checkpoint = ScrapeCheckpoint(checkpoint_path) if checkpoint_path else None
+    karma_store = open_karma_store(karma_store_path) if karma_store_path and checkpoint else None
+    saved = {}
+    already_saved = [d for d in dates if checkpoint and checkpoint.day_status(d) == "saved"]
+    if already_saved:
+        print(f"  ⏭️  {len(already_saved)} day(s) already saved (checkpoint)")
+
+    async def run_day(client: httpx.AsyncClient, date_str: str):
+        status = checkpoint.day_status(date_str) if checkpoint else None
+        if status == "saved":
+            return
+        if status == "fetched":
+            # Fully fetched before the last run stopped; only the save is missing
+            entries = checkpoint.entries(date_str)
+        else:
+            async with day_slots:
+                if circuit.is_open:
+                    return
+                entries = await scrape_day_async(client, bucket, date_str, circuit, base_url, checkpoint)
+        if entries and await asyncio.to_thread(save_to_supabase, entries, date_str, supabase):
+            saved[date_str] = len(entries)
+        if checkpoint and checkpoint.day_status(date_str) == "fetched" and (saved.get(date_str) or not entries):
+            if karma_store and entries:
+                karma_store.save_day(date_str, entries, complete=True)
+            checkpoint.set_day(date_str, "saved", len(entries))
+
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(limits=limits, timeout=TIMEOUT_SECONDS) as client:
+        await asyncio.gather(*(run_day(client, date_str) for date_str in dates))
+    if karma_store:
+        karma_store.close()
+
+    # Summary
+    print("\n" + "=" * 50)
+    print("📈 SCRAPING COMPLETE")
+    print("=" * 50)
+    print(f"  Days processed: {len(saved) + len(already_saved)}/{len(dates)}")
+    print(f"  Total entries saved: {sum(saved.values())}")
+    print(f"  Total errors encountered: {circuit.total_errors}")
+    if circuit.is_open:
+        print("  ⚠️  Scraping was interrupted by circuit breaker")
+    return saved
+
+# Colab cells can await directly; from a plain script use
+# asyncio.run(run_scraper_async(...)). run_scraper() is the one-day-at-a-time version.
+await run_scraper_async("2025-03-07", "2025-05-14")
@@ -8,14 +8,25 @@ Original file is located at
 """
 
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from google.colab import files
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import csv
+import sqlite3
+import threading
 import time
 import io
 import os
 import uuid
 
+try:
+    from google.colab import files
+    COLAB_AVAILABLE = True
+except ImportError:
+    COLAB_AVAILABLE = False
+
 try:
     from hashids import Hashids
     HASHIDS_AVAILABLE = True
@@ -27,6 +38,15 @@ REAL_API_BASE = "https://web.realsports.io"
 REAL_VERSION = "27"
 RANKED_DAYS_API = f"{REAL_API_BASE}/rankeddays"
 
+# Concurrency settings: users are fetched in parallel, each user's pages in order
+MAX_WORKERS = 8              # Users fetched at once (also the connection pool size)
+REQUESTS_PER_SECOND = 4.0    # Shared across all workers
+REQUEST_BURST = 4
+TIMEOUT_SECONDS = 15
+
+CSV_COLUMNS = ['username', 'userId', 'day', 'karma', 'rank']
+RANKED_STORE_PATH = "ranked_days.db"  # Local store for --sync (see RankedDaysStore)
+
 REAL_AUTH_TOKEN = os.environ.get("REAL_AUTH_TOKEN")
 if not REAL_AUTH_TOKEN:
     try:
@@ -64,22 +84,113 @@ def build_real_headers(device_name: str = "Chrome on Windows") -> dict:
         "real-version": REAL_VERSION,
     }
 
-def scrape_ranked_days(username, user_id):
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` requests per second, in bursts of `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RankedDaysStore:
     """
-    Scrape all ranked days data for a given user ID.
+    Local SQLite copy of every user's ranked days, plus a per-user high-water
+    mark (the newest day of the last complete sync) so a sync only fetches
+    pages until it reaches a day it already has.
 
-    Args:
-        username (str): The username for identification
-        user_id (str): The alphanumeric user ID
+    The mark only moves once a user's paging finished without errors, so an
+    interrupted sync is simply refetched next time. Safe to share between
+    worker threads.
+    """
 
-    Returns:
-        list: List of dictionaries containing username, userId, day, karma, and rank data
+    def __init__(self, path: str = RANKED_STORE_PATH):
+        self.con = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.con.executescript("""
+        CREATE TABLE IF NOT EXISTS ranked_days (
+            user_id TEXT,
+            day TEXT,
+            username TEXT,
+            karma,
+            rank INTEGER,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS ranked_sync (
+            user_id TEXT PRIMARY KEY,
+            latest_day TEXT,
+            synced_at TEXT
+        );
+        """)
+
+    def latest_day(self, user_id) -> str:
+        """The user's high-water mark, or None if never fully synced."""
+        with self.lock:
+            row = self.con.execute("SELECT latest_day FROM ranked_sync WHERE user_id = ?", (str(user_id),)).fetchone()
+        return row[0] if row else None
+
+    def save_page(self, rows: list):
+        with self.lock, self.con:
+            self.con.executemany(
+                "INSERT OR REPLACE INTO ranked_days VALUES (?, ?, ?, ?, ?)",
+                [(str(r['userId']), r['day'], r['username'], r['karma'], r['rank']) for r in rows])
+
+    def mark_synced(self, user_id, latest_day: str):
+        with self.lock, self.con:
+            self.con.execute(
+                "INSERT INTO ranked_sync VALUES (?, ?, datetime('now')) "
+                "ON CONFLICT(user_id) DO UPDATE SET latest_day = max(latest_day, excluded.latest_day), "
+                "synced_at = excluded.synced_at",
+                (str(user_id), latest_day))
+
+    def close(self):
+        self.con.close()
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """A requests session whose keep-alive pool fits pool_size concurrent workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def iter_ranked_day_pages(username, user_id, session=None, limiter=None, base_url=RANKED_DAYS_API,
+                          since=None):
     """
-    base_url = RANKED_DAYS_API
-    all_data = []
-    oldest_date = None
+    Yield a user's ranked days one page at a time, newest first.
 
-    print(f"Scraping data for user: {username} (ID: {user_id})")
+    Each page is a list of dictionaries with username, userId, day, karma and
+    rank. Pages are inherently sequential (each one's oldest day is the next
+    one's cursor), so parallelism comes from running many users at once on a
+    shared session and limiter (see scrape_users).
+
+    With since (a stored high-water mark), only days on or after it are
+    yielded (the mark day itself is refreshed, it may have been stored while
+    still in progress) and paging stops at the first page that reaches it,
+    which for a user with no new days is a single request.
+
+    Entries without a day are skipped. Returns (as the generator's
+    StopIteration value) True if paging ended normally and False if it
+    stopped on an error.
+    """
+    session = session or requests
+    oldest_date = None
 
     while True:
         # Construct URL
@@ -88,11 +199,15 @@ def scrape_ranked_days(username, user_id):
         else:
             url = f"{base_url}/{user_id}?before={oldest_date}&sort=latest"
 
-        print(f"  Fetching: {url}")
+        if limiter:
+            limiter.acquire()
+        else:
+            # Small delay to be respectful to the API
+            time.sleep(0.5)
 
         try:
             # Make request
-            response = requests.get(url, headers=build_real_headers())
+            response = session.get(url, headers=build_real_headers(), timeout=TIMEOUT_SECONDS)
             response.raise_for_status()  # Raise exception for bad status codes
 
             # Parse JSON
@@ -100,99 +215,199 @@ def scrape_ranked_days(username, user_id):
 
             # Check if days array is empty
             if not data.get('days') or len(data['days']) == 0:
-                print(f"  No more data found. Stopping.")
                 break
 
+            days = [entry for entry in data['days'] if entry.get('day')]
+            if not days:
+                print(f"  {username}: page without any days, stopping")
+                return False
+
             # Extract day, karma, and rank for each entry
-            for entry in data['days']:
-                all_data.append({
-                    'username': username,
-                    'userId': user_id,
-                    'day': entry.get('day'),
-                    'karma': entry.get('karma'),
-                    'rank': entry.get('rank')
-                })
+            page = [{
+                'username': username,
+                'userId': user_id,
+                'day': entry['day'],
+                'karma': entry.get('karma'),
+                'rank': entry.get('rank')
+            } for entry in days if since is None or entry['day'] >= since]
+            if page:
+                yield page
 
             # Update oldest_date for next iteration
-            oldest_date = data['days'][-1]['day']
-            print(f"  Collected {len(data['days'])} entries. Oldest date: {oldest_date}")
-
-            # Small delay to be respectful to the API
-            time.sleep(0.5)
+            oldest_date = days[-1]['day']
+            if since is not None and oldest_date <= since:
+                break  # Reached days we already have
 
         except requests.exceptions.RequestException as e:
-            print(f"  Error fetching data: {e}")
-            break
+            print(f"  {username}: error fetching data: {e}")
+            return False
         except (KeyError, ValueError) as e:
-            print(f"  Error parsing response: {e}")
-            break
+            print(f"  {username}: error parsing response: {e}")
+            return False
+
+    return True
+
 
+def scrape_ranked_days(username, user_id):
+    """
+    Scrape all ranked days data for a given user ID.
+
+    Args:
+        username (str): The username for identification
+        user_id (str): The alphanumeric user ID
+
+    Returns:
+        list: List of dictionaries containing username, userId, day, karma, and rank data
+    """
+    print(f"Scraping data for user: {username} (ID: {user_id})")
+    all_data = [row for page in iter_ranked_day_pages(username, user_id) for row in page]
     print(f"Total entries collected for {username}: {len(all_data)}\n")
     return all_data
 
-def main():
-    """
-    Main function to scrape data for multiple users and save to CSV.
+
+def scrape_users(users, out_file, workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+                 base_url=RANKED_DAYS_API, store=None):
     """
-    # Upload CSV file
-    print("Please upload your CSV file with columns: username,userId")
-    uploaded = files.upload()
+    Fetch ranked days for many users concurrently, writing rows to out_file as CSV
+    as each page arrives (nothing is accumulated in memory).
 
-    if not uploaded:
-        print("No file uploaded!")
-        return
+    Args:
+        users: Iterable of (username, userId) pairs
+        out_file: Text file open for writing
+        workers: Users fetched at once; also the connection pool size
+        requests_per_second: Rate limit shared by all workers
+        store: Optional RankedDaysStore to sync incrementally: each user is
+            fetched only back to their high-water mark, rows are also saved
+            to the store, and the CSV holds just the fetched rows
+
+    A user whose fetch fails (a request error, or any exception such as a
+    missing auth token) is reported as incomplete and keeps its high-water
+    mark, so the next sync fetches it again; the other users carry on.
 
-    # Get the first (and should be only) uploaded file
-    filename = list(uploaded.keys())[0]
+    Returns:
+        (Counter, list): rows written per username, and the usernames whose
+        fetch did not complete
+    """
+    writer = csv.DictWriter(out_file, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    write_lock = threading.Lock()
+    limiter = RateLimiter(requests_per_second, REQUEST_BURST)
+    counts = Counter()
+    incomplete = []
+
+    def fetch_user(username, user_id):
+        newest = None
+        try:
+            since = store.latest_day(user_id) if store else None
+            pages = iter_ranked_day_pages(username, user_id, session, limiter, base_url, since)
+            while True:
+                page = next(pages)
+                newest = newest or page[0]['day']
+                if store:
+                    store.save_page(page)
+                with write_lock:
+                    writer.writerows(page)
+                    counts[username] += len(page)
+        except StopIteration as stop:
+            complete = stop.value
+        except Exception as e:
+            print(f"  {username}: {type(e).__name__}: {e}")
+            complete = False
+        if store and complete and newest:
+            store.mark_synced(user_id, newest)
+        return username, complete
+
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_user, username, user_id) for username, user_id in users]
+        for done, future in enumerate(as_completed(futures), 1):
+            username, complete = future.result()
+            if not complete:
+                incomplete.append(username)
+            print(f"  [{done}/{len(futures)}] {username}: {counts[username]} entries"
+                  f"{'' if complete else ' (incomplete)'}")
+
+    return counts, incomplete
+
+
+def read_users(data):
+    """(username, userId) pairs from CSV text with username and userId columns."""
+    reader = csv.DictReader(io.StringIO(data))
+    if 'username' not in (reader.fieldnames or []) or 'userId' not in (reader.fieldnames or []):
+        raise ValueError("CSV must contain 'username' and 'userId' columns!")
+    return [(row['username'], row['userId']) for row in reader]
 
-    # Read the CSV
-    try:
-        users_df = pd.read_csv(io.BytesIO(uploaded[filename]))
 
-        # Verify required columns exist
-        if 'username' not in users_df.columns or 'userId' not in users_df.columns:
-            print("Error: CSV must contain 'username' and 'userId' columns!")
+def main():
+    """
+    Main function to scrape data for multiple users and save to CSV.
+
+    From the command line: python ranked.py --users users.csv [--output out.csv].
+    In Colab without --users, the users CSV is uploaded and the result downloaded.
+    With --sync, only days newer than each user's stored ones are fetched.
+    """
+    parser = argparse.ArgumentParser(description="Scrape ranked days for a list of users")
+    parser.add_argument("--users", help="CSV file with columns: username,userId")
+    parser.add_argument("--output", help="Output CSV (default: ranked_days_<timestamp>.csv)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Users fetched at once (default: {MAX_WORKERS})")
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND,
+                        help=f"Requests per second across all workers (default: {REQUESTS_PER_SECOND})")
+    parser.add_argument("--sync", nargs="?", const=RANKED_STORE_PATH, metavar="DB",
+                        help=f"Sync incrementally into a local store (default: {RANKED_STORE_PATH})")
+    args, _ = parser.parse_known_args()  # Colab passes its own kernel arguments
+
+    if args.users:
+        filename = args.users
+        with open(filename, encoding='utf-8-sig') as f:
+            data = f.read()
+    elif COLAB_AVAILABLE:
+        # Upload CSV file
+        print("Please upload your CSV file with columns: username,userId")
+        uploaded = files.upload()
+
+        if not uploaded:
+            print("No file uploaded!")
             return
 
-        print(f"\nLoaded {len(users_df)} user(s) from {filename}")
-        print(users_df.head())
-        print(f"\nProcessing {len(users_df)} user(s)...\n")
+        # Get the first (and should be only) uploaded file
+        filename = list(uploaded.keys())[0]
+        data = uploaded[filename].decode('utf-8-sig')
+    else:
+        parser.error("--users is required outside Colab")
 
+    # Read the CSV
+    try:
+        users = read_users(data)
+        print(f"\nLoaded {len(users)} user(s) from {filename}")
+        print(f"\nProcessing {len(users)} user(s) with {args.workers} workers...\n")
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         return
 
-    # Collect all data
-    all_data = []
-    for _, row in users_df.iterrows():
-        username = row['username']
-        user_id = row['userId']
-        user_data = scrape_ranked_days(username, user_id)
-        all_data.extend(user_data)
-
-    # Convert to DataFrame
-    if all_data:
-        df = pd.DataFrame(all_data)
-
-        # Ensure column order: username, userId, day, karma, rank
-        df = df[['username', 'userId', 'day', 'karma', 'rank']]
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = args.output or f"ranked_days_{timestamp}.csv"
 
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"ranked_days_{timestamp}.csv"
+    store = RankedDaysStore(args.sync) if args.sync else None
+    with open(output_filename, 'w', newline='', encoding='utf-8') as out:
+        counts, incomplete = scrape_users(users, out, args.workers, args.rps, store=store)
+    if store:
+        print(f"\nSynced into {args.sync}")
+        store.close()
+    if incomplete:
+        print(f"\n⚠️  Incomplete, run again to fetch the rest: {', '.join(sorted(incomplete))}")
 
-        # Save to CSV
-        df.to_csv(output_filename, index=False)
+    if sum(counts.values()):
         print(f"\nData saved to {output_filename}")
-        print(f"Total records: {len(df)}")
+        print(f"Total records: {sum(counts.values())}")
         print(f"Records per user:")
-        print(df.groupby('username').size())
-        print("\nFirst few rows:")
-        print(df.head(10))
+        for username, count in sorted(counts.items()):
+            print(f"  {username}: {count}")
 
         # Auto-download the file
-        files.download(output_filename)
-        print(f"\n{output_filename} has been downloaded!")
+        if COLAB_AVAILABLE and not args.users:
+            files.download(output_filename)
+            print(f"\n{output_filename} has been downloaded!")
     else:
         print("\nNo data collected!")
 
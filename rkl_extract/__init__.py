@@ -0,0 +1,56 @@
+"""
+Shared, dependency-free text extraction for RKL comments.
+
+Used by both the Streamlit review app (app.py) and the batch parser
+(scripts/parse_rkl_games.py) so the two classify and extract comments
+identically.
+
+    classify  - lineup / result / leaderboard / other
+    extract   - teams, mentions, captains, seeds and result lines
+    patterns  - the precompiled regex tables both of the above use
+    schema    - the rkl.db review tables (manual_extract, team_alias)
+
+Submodules are imported on first attribute access, and every pattern is
+compiled once per process no matter how many callers share it.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ContentFeatures": "classify",
+    "content_features": "classify",
+    "detect_content_type": "classify",
+    "guess_kind": "classify",
+    "clean_team_name": "extract",
+    "detect_captains": "extract",
+    "detect_postseason_info": "extract",
+    "detect_winner": "extract",
+    "extract_game_result": "extract",
+    "extract_mentions": "extract",
+    "extract_mentions_by_team": "extract",
+    "forget_team_aliases": "schema",
+    "guess_teams": "extract",
+    "init_review_schema": "schema",
+    "is_captain_marker": "extract",
+    "parse_adjustment_line": "extract",
+    "parse_result_line": "extract",
+    "parse_score": "extract",
+    "rebuild_team_aliases": "schema",
+    "record_team_aliases": "schema",
+    "team_key": "extract",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
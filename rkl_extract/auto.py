@@ -0,0 +1,147 @@
+"""
+Database-free half of the review app's auto-extract.
+
+extract_comment() turns one comment into the row app.py would save to
+manual_extract, minus anything that needs rkl.db (linking a result to an
+earlier lineup). It is importable by worker processes, so app.py can fan
+extraction out over a process pool while a single writer does the linking
+and saving.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from .classify import guess_kind
+from .extract import (
+    detect_captains, detect_postseason_info, extract_game_result,
+    extract_mentions_by_team, guess_teams,
+)
+
+EASTERN = ZoneInfo("America/New_York")
+
+
+def parse_timestamp_to_eastern(ts_str: Optional[str]) -> Optional[date]:
+    """Parse timestamp string and convert to US Eastern date."""
+    if not ts_str:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00").replace(" ", "T"))
+        return dt.astimezone(EASTERN).date()
+    except Exception:
+        return None
+
+
+def infer_game_date(thread_created_ts: Optional[str]) -> Optional[str]:
+    """Use the thread's posted date (in US Eastern time) as the game date."""
+    eastern_date = parse_timestamp_to_eastern(thread_created_ts)
+    if eastern_date:
+        return eastern_date.isoformat()
+    return None
+
+
+def extract_comment(thread_id: int, comment_id: int, source: str,
+                    text: str, thread_text: str, game_date: Optional[str]) -> Optional[dict]:
+    """
+    Extract a lineup or result from a comment.
+
+    game_date is the thread's posted date in US Eastern time (see
+    infer_game_date). Returns the manual_extract fields, or None if not
+    extractable (no teams or mentions found). Results come back unlinked:
+    game_date is the thread's date and linked_extract_id is None.
+    """
+    if not text:
+        return None
+
+    kind = guess_kind(text)
+
+    if kind == "result":
+        result = extract_game_result(text)
+        if not (result and result.get("team_a") and result.get("team_b")):
+            return None
+        return {
+            "thread_id": thread_id,
+            "comment_id": comment_id,
+            "source": source,
+            "kind": kind,
+            "game_date": game_date,
+            "team_a": result["team_a"],
+            "team_b": result["team_b"],
+            "captain_a": None,
+            "captain_b": None,
+            "mentions_a": None,
+            "mentions_b": None,
+            "seed_a": result.get("seed_a"),
+            "seed_b": result.get("seed_b"),
+            "round_name": result.get("round_name"),
+            "score_a": result.get("score_a"),
+            "score_b": result.get("score_b"),
+            "winner": result.get("winner"),
+            "adjustment_a": result.get("adjustment_a"),
+            "adjustment_b": result.get("adjustment_b"),
+            "linked_extract_id": None,
+            "raw_text": text,
+        }
+
+    if kind != "lineup":
+        return None
+
+    combined_text = (thread_text or "") + "\n\n" + text
+    team_a, team_b = guess_teams(combined_text)
+    # Need at least one team to be a valid extraction
+    if not team_a and not team_b:
+        return None
+
+    mentions_a, mentions_b = extract_mentions_by_team(text)
+    # Need some mentions to be useful
+    if not mentions_a and not mentions_b:
+        return None
+
+    captain_a, captain_b, _ = detect_captains(text)
+    round_name, seed_a, seed_b = detect_postseason_info(text)
+
+    return {
+        "thread_id": thread_id,
+        "comment_id": comment_id,
+        "source": source,
+        "kind": kind,
+        "game_date": game_date,
+        "team_a": team_a,
+        "team_b": team_b,
+        "captain_a": captain_a,
+        "captain_b": captain_b,
+        "mentions_a": ", ".join(mentions_a) if mentions_a else None,
+        "mentions_b": ", ".join(mentions_b) if mentions_b else None,
+        "seed_a": seed_a,
+        "seed_b": seed_b,
+        "round_name": round_name,
+        "score_a": None,
+        "score_b": None,
+        "winner": None,
+        "adjustment_a": None,
+        "adjustment_b": None,
+        "linked_extract_id": None,
+        "raw_text": text,
+    }
+
+
+def extract_thread(thread: dict, replies: list[dict]) -> tuple[Optional[dict], list[Optional[dict]]]:
+    """
+    Extract a thread post and its replies.
+
+    thread needs comment_id, plain_text, eastern_date (rkl_comments'
+    precomputed infer_game_date of its timestamp; NULL for comments added
+    since the app started, which fall back to created_at_ts) and source;
+    replies need comment_id and plain_text. Returns (thread_item, reply_items) with one
+    entry per reply, in order. Module-level so process pools can pickle it.
+    """
+    thread_id = thread["comment_id"]
+    thread_text = thread["plain_text"]
+    game_date = thread.get("eastern_date") or infer_game_date(thread.get("created_at_ts"))
+    thread_item = extract_comment(thread_id, thread_id, thread["source"] or "feed",
+                                  thread_text, "", game_date)
+    reply_items = [
+        extract_comment(thread_id, r["comment_id"], "replies", r["plain_text"], thread_text, game_date)
+        for r in replies
+    ]
+    return thread_item, reply_items
@@ -0,0 +1,200 @@
+"""
+Content classification: lineup / result / leaderboard / other.
+
+content_features() computes every signal either classifier looks at in one
+pass over the comment and returns them as a ContentFeatures vector. The
+text is lowercased once for all case-insensitive patterns, and most regexes
+sit behind a substring check, so a typical comment only pays for the
+handful of patterns that can actually match. guess_kind (review app
+rules) and detect_content_type (batch parser rules) are then pure
+functions of that vector.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .patterns import MENTION_RE, RECORD_PATTERN_RE, WINLOSS_MARK_RE
+
+# ============================================================================
+# PATTERNS
+# ============================================================================
+
+# Several patterns below check their leading word boundary in a lookbehind
+# after the first character instead of with a leading \b. They match the
+# same text, but a pattern that starts with a literal or digit lets the
+# regex engine skip ahead instead of testing the boundary at every position.
+
+# Same as \b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b|\b\d{4,6}(?:\.\d+)?\b
+SCORE_NUM_RE = re.compile(r"\d(?<=\b\d)(?:\d{0,2}(?:,\d{3})*(?:\.\d+)?\b|\d{3,5}(?:\.\d+)?\b)")
+# Team scores are typically 30000+; same as \b\d{2},\d{3}\b|\b[3-9]\d{4}\b
+LARGE_SCORE_RE = re.compile(r"\d(?:\d,\d{3}(?<=\b\d\d,\d\d\d)|\d{4}(?<=\b[3-9]\d\d\d\d))\b")
+SEPARATOR_LINE_RE = re.compile(r"^[-–—~]{3,}$", re.MULTILINE)
+DASH_SEPARATOR_LINE_RE = re.compile(r"^[-–—]{3,}$", re.MULTILINE)
+
+# Case-insensitive patterns, written in lowercase and matched against the
+# folded text: much faster than re.IGNORECASE, which defeats the literal
+# prefix search
+TOP_SCORES_RE = re.compile(r"top\s+team\s+scores")
+MEDIAN_RE = re.compile(r"\bmedian\b")
+VS_ANY_RE = re.compile(r"vs(?<=\bvs)\.?\b")
+GOTD_RE = re.compile(r"\bgotd\b")
+LINEUP_WORD_RE = re.compile(r"\blineups?\b")
+LINEUPS_WORD_RE = re.compile(r"\blineups\b")
+ROUND_NAME_RE = re.compile(
+    r"(rkl\s+finals?|finals?|semi\s*-?\s*finals?|quarter\s*-?\s*finals?|"
+    r"round\s+\d+|playoffs?\s+round\s+\d+|wild\s*card|game\s+\d+)"
+)
+# The review app's original round pattern only accepts plural "finals"
+ROUND_NAME_PLURAL_RE = re.compile(
+    r"(rkl\s+finals|finals|semi\s*-?\s*finals?|quarter\s*-?\s*finals?|"
+    r"round\s+\d+|playoffs?\s+round\s+\d+|wild\s*card|game\s+\d+)"
+)
+
+# Non-ASCII letters that re.IGNORECASE treats as ASCII ones
+_GATE_FOLD_CHARS = "\u0130\u0131\u017f\u212a"  # İ ı ſ and the Kelvin sign
+_GATE_FOLD = str.maketrans(dict(zip(_GATE_FOLD_CHARS, "iisk")))
+# Cheap substring checks that must pass before the matching regex can
+_ROUND_GATES = ("final", "semi", "quarter", "round", "wild", "game")
+_WINLOSS_GATES = ("✅", "❌", "🏆", ":c")
+
+# ============================================================================
+# FEATURES
+# ============================================================================
+
+@dataclass(frozen=True)
+class ContentFeatures:
+    """Classification signals for one comment."""
+    leaderboard_header: bool = False  # "top team scores" or "median"
+    winloss: bool = False             # ✅ ❌ 🏆 markers
+    has_score: bool = False
+    large_score: bool = False
+    record_count: int = 0             # "(W-L)" records
+    separator: bool = False           # a line of 3+ dashes/tildes
+    dash_separator: bool = False      # a line of 3+ dashes (no tildes)
+    mention_count: int = 0
+    vs: bool = False
+    gotd: bool = False
+    lineup_word: bool = False         # "lineup" or "lineups"
+    lineups_word: bool = False        # "lineups" only
+    round_name: bool = False
+    round_name_plural: bool = False   # round name with "Finals" (not "Final")
+
+
+@lru_cache(maxsize=4096)
+def content_features(text: str) -> ContentFeatures:
+    """Compute all classification signals for text in one pass.
+
+    Cached because the parser classifies each comment several times while
+    trying lineup, result and leaderboard extraction in turn.
+    """
+    if not text:
+        return ContentFeatures()
+
+    # Lowercase copy for the case-insensitive patterns. A few non-ASCII
+    # letters case-fold onto ASCII ones under re.IGNORECASE; map them first
+    # so results match the original case-insensitive patterns exactly.
+    if not text.isascii() and any(ch in text for ch in _GATE_FOLD_CHARS):
+        folded = text.translate(_GATE_FOLD).lower()
+    else:
+        folded = text.lower()
+
+    separator = bool(SEPARATOR_LINE_RE.search(text))
+    has_score = bool(SCORE_NUM_RE.search(text))
+    lineup_word = "lineup" in folded and bool(LINEUP_WORD_RE.search(folded))
+    round_name = any(g in folded for g in _ROUND_GATES) and bool(ROUND_NAME_RE.search(folded))
+
+    return ContentFeatures(
+        leaderboard_header=(("top" in folded and bool(TOP_SCORES_RE.search(folded))) or
+                            ("median" in folded and bool(MEDIAN_RE.search(folded)))),
+        winloss=(any(m in text for m in _WINLOSS_GATES) and bool(WINLOSS_MARK_RE.search(text))),
+        has_score=has_score,
+        large_score=has_score and bool(LARGE_SCORE_RE.search(text)),
+        record_count=len(RECORD_PATTERN_RE.findall(text)) if "(" in text else 0,
+        separator=separator,
+        dash_separator=separator and bool(DASH_SEPARATOR_LINE_RE.search(text)),
+        mention_count=len(MENTION_RE.findall(text)) if "@" in text else 0,
+        vs="vs" in folded and bool(VS_ANY_RE.search(folded)),
+        gotd="gotd" in folded and bool(GOTD_RE.search(folded)),
+        lineup_word=lineup_word,
+        lineups_word=lineup_word and "lineups" in folded and bool(LINEUPS_WORD_RE.search(folded)),
+        round_name=round_name,
+        round_name_plural=round_name and bool(ROUND_NAME_PLURAL_RE.search(folded)),
+    )
+
+# ============================================================================
+# CLASSIFIERS
+# ============================================================================
+
+def guess_kind(text: str) -> str:
+    """Review-app classification (assistive, errs towards lineup/result)."""
+    f = content_features(text or "")
+    if f.leaderboard_header:
+        return "leaderboard"
+
+    # Result detection - multiple signals
+    if f.winloss and f.has_score:
+        return "result"
+    # Two+ team records with scores = likely result
+    if f.record_count >= 2 and f.has_score:
+        return "result"
+    # Records + separator + scores = likely result
+    if f.record_count and f.dash_separator and f.has_score:
+        return "result"
+
+    # Lineup detection
+    if (f.lineups_word or f.vs) and f.mention_count:
+        return "lineup"
+    # GOTD posts
+    if f.gotd and f.mention_count:
+        return "lineup"
+    # Postseason posts (round names)
+    if f.round_name_plural and f.mention_count and f.vs:
+        return "lineup"
+    return "other"
+
+
+def detect_content_type(text: str) -> str:
+    """Batch-parser classification: lineup, result, leaderboard, or other."""
+    if not text:
+        return "other"
+    f = content_features(text)
+
+    # Check for leaderboard first
+    if f.leaderboard_header:
+        return "leaderboard"
+
+    # Result detection - need win/loss markers OR team records with scores
+    if f.winloss and f.has_score:
+        return "result"
+    # Two team records with large scores (not lineup mentions) = result
+    if f.record_count >= 2 and f.large_score:
+        return "result"
+    if f.record_count and f.separator and f.has_score:
+        return "result"
+
+    # Lineup detection - GOTD posts are lineups even without explicit "vs" word
+    if f.gotd and f.mention_count >= 4:
+        return "lineup"
+
+    # Standard lineup detection
+    if f.vs and f.mention_count >= 2:
+        return "lineup"
+
+    # Posts with "Lineups" in header and mentions
+    if f.lineup_word and f.mention_count >= 2:
+        return "lineup"
+
+    # Posts with team records and multiple mentions (likely lineup)
+    if f.record_count and f.mention_count >= 4 and f.separator:
+        return "lineup"
+
+    # Postseason lineups
+    if f.round_name and f.mention_count >= 2 and (f.vs or f.separator):
+        return "lineup"
+
+    # If we have many mentions with separators, likely a lineup
+    if f.mention_count >= 6 and f.separator:
+        return "lineup"
+
+    return "other"
@@ -0,0 +1,510 @@
+"""
+Lineup and result extraction from comment text.
+
+Pure functions over a comment's plain text: no database, no Streamlit, no
+dataclasses. The review app uses them to pre-fill its forms and the batch
+parser wraps their output in GameLineup / GameResult records.
+"""
+
+import re
+from typing import Optional
+
+from .patterns import (
+    ADJUSTMENT_HEADER_RE, ADJUSTMENT_LINE_RE, CAPTAIN_EXPLICIT_RE, CAPTAIN_MARK_RE,
+    CAPTAIN_PLAIN_C_RE, CAPTAIN_PLAIN_MARK_RE, LEADERBOARD_LINE_RE, LEADING_RANK_RE,
+    LEADING_SEED_RE, LOSS_INDICATOR_RE, MENTION_BREAK_RE, MENTION_RE, MENTION_WITH_TRAIL_RE,
+    REALAPP_EMOJI_RE, RESULT_FULL_RE, RESULT_LINE_RE, ROUND_NAME_RE, SEED_TEAM_RE,
+    SEPARATED_VS_RE, SEPARATOR_RE, STANDALONE_VS_RE, TEAM_KEY_DROP_RE, TEAM_RECORD_RE,
+    TRAILING_RECORD_RE, TRAILING_SCORE_RE, VS_ANY_RE, WIN_INDICATOR_RE,
+)
+
+# ============================================================================
+# TEXT UTILITIES
+# ============================================================================
+
+def parse_score(score_str: str) -> Optional[float]:
+    """Parse a score string like '34,565' or '47,547.5' to a float."""
+    if not score_str:
+        return None
+    try:
+        return float(score_str.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def clean_team_name(name: str) -> str:
+    """Clean up a team name by removing trailing records, punctuation, seeds, etc."""
+    if not name:
+        return ""
+    name = name.strip()
+    name = LEADING_SEED_RE.sub("", name)
+    name = TRAILING_RECORD_RE.sub("", name)
+    name = TRAILING_SCORE_RE.sub("", name)
+    name = LEADING_RANK_RE.sub("", name)
+    name = name.strip(" \t\n-–:•~")
+    return name[:80] if name else ""
+
+
+def team_key(name: str) -> str:
+    """Lowercase letters and digits of a team name; spellings sharing a key are one team."""
+    return TEAM_KEY_DROP_RE.sub("", name.lower()) if name else ""
+
+
+def extract_mentions(text: str) -> list[str]:
+    """All @mentions in text, in order of appearance."""
+    if not text:
+        return []
+    return MENTION_RE.findall(text)
+
+
+def is_captain_marker(text_after: str) -> bool:
+    """
+    Check if text following a mention indicates captain status.
+
+    Captain if followed by "(c)", a bare "c", or only emoji/punctuation up to
+    the next mention or line break.
+    """
+    if not text_after:
+        return False
+    text = text_after.strip()
+    if CAPTAIN_MARK_RE.match(text):
+        return True
+    if CAPTAIN_PLAIN_MARK_RE.match(text):
+        return True
+    until_next = MENTION_BREAK_RE.split(text)[0]
+    if until_next.strip():
+        cleaned = REALAPP_EMOJI_RE.sub("", until_next).strip()
+        if not cleaned or not any(c.isalnum() for c in cleaned):
+            return True
+    return False
+
+
+def _find_vs_line(lines: list[str], allow_separators: bool = False) -> Optional[int]:
+    """Index of the first standalone "vs" line (optionally "--- vs ---"), if any."""
+    for i, ln in enumerate(lines):
+        ln_stripped = ln.strip()
+        if STANDALONE_VS_RE.match(ln_stripped):
+            return i
+        if allow_separators and SEPARATED_VS_RE.match(ln_stripped):
+            return i
+    return None
+
+# ============================================================================
+# LINEUP EXTRACTION
+# ============================================================================
+
+def extract_mentions_by_team(text: str) -> tuple[list[str], list[str]]:
+    """
+    Split mentions into Team A and Team B.
+
+    Tries, in order: a standalone vs line, the middle of several separator
+    lines, "TeamName (W-L)" headers, and an inline "A vs B" split.
+    Returns (mentions_a, mentions_b); both empty if no split was found.
+    """
+    if not text:
+        return ([], [])
+
+    lines = text.splitlines()
+
+    # Strategy 1: Find standalone vs line (common in GOTD posts)
+    vs_line_idx = _find_vs_line(lines, allow_separators=True)
+    if vs_line_idx is not None:
+        text_before = "\n".join(lines[:vs_line_idx])
+        text_after = "\n".join(lines[vs_line_idx + 1:])
+        mentions_a = MENTION_RE.findall(text_before)
+        mentions_b = MENTION_RE.findall(text_after)
+        if mentions_a or mentions_b:
+            return (mentions_a, mentions_b)
+
+    # Strategy 2: Look for separator lines (------) as team dividers
+    separator_indices = [i for i, ln in enumerate(lines) if SEPARATOR_RE.match(ln.strip())]
+    if len(separator_indices) >= 2:
+        # Take the middle separator as divider
+        mid_idx = separator_indices[len(separator_indices) // 2]
+        text_before = "\n".join(lines[:mid_idx])
+        text_after = "\n".join(lines[mid_idx + 1:])
+        mentions_a = MENTION_RE.findall(text_before)
+        mentions_b = MENTION_RE.findall(text_after)
+        if mentions_a and mentions_b:
+            return (mentions_a, mentions_b)
+
+    # Strategy 3: "TeamName (W-L)" on its own line as team dividers
+    team_header_indices = []
+    for i, ln in enumerate(lines):
+        ln_stripped = ln.strip()
+        if ln_stripped.startswith("@"):
+            continue
+        if TEAM_RECORD_RE.match(ln_stripped):
+            team_header_indices.append(i)
+
+    if len(team_header_indices) >= 2:
+        # Split between first and second team header
+        first_team_idx = team_header_indices[0]
+        second_team_idx = team_header_indices[1]
+        text_before = "\n".join(lines[first_team_idx:second_team_idx])
+        text_after = "\n".join(lines[second_team_idx:])
+        mentions_a = MENTION_RE.findall(text_before)
+        mentions_b = MENTION_RE.findall(text_after)
+        if mentions_a or mentions_b:
+            return (mentions_a, mentions_b)
+
+    # Strategy 4: Inline vs split
+    for ln in lines:
+        if VS_ANY_RE.search(ln):
+            parts = VS_ANY_RE.split(ln, maxsplit=1)
+            if len(parts) == 2:
+                mentions_a = MENTION_RE.findall(parts[0])
+                mentions_b = MENTION_RE.findall(parts[1])
+                if mentions_a or mentions_b:
+                    return (mentions_a, mentions_b)
+
+    return ([], [])
+
+
+def detect_captains(text: str) -> tuple[Optional[str], Optional[str], list[str]]:
+    """
+    Detect captain candidates from text.
+
+    Returns (captain_a, captain_b, all_candidates). Candidates are assigned to
+    a side by a standalone vs line when there is one, otherwise the first two
+    candidates are taken in order.
+    """
+    if not text:
+        return (None, None, [])
+
+    lines = text.splitlines()
+
+    explicit = CAPTAIN_EXPLICIT_RE.findall(text)
+    plain_c = CAPTAIN_PLAIN_C_RE.findall(text)
+
+    implicit = []
+    for m in MENTION_WITH_TRAIL_RE.finditer(text):
+        username = m.group(1)
+        trailing = m.group(2)
+        if username not in explicit and username not in plain_c and is_captain_marker(trailing):
+            implicit.append(username)
+
+    all_candidates = list(dict.fromkeys(explicit + plain_c + implicit))
+
+    # Try to assign to teams by vs split
+    vs_line_idx = None
+    for i, ln in enumerate(lines):
+        if STANDALONE_VS_RE.match(ln):
+            vs_line_idx = i
+            break
+
+    captain_a, captain_b = None, None
+
+    if vs_line_idx is not None:
+        text_before = "\n".join(lines[:vs_line_idx])
+        text_after = "\n".join(lines[vs_line_idx + 1:])
+
+        for cap in all_candidates:
+            pattern = rf"@{re.escape(cap)}"
+            if re.search(pattern, text_before) and captain_a is None:
+                captain_a = cap
+            elif re.search(pattern, text_after) and captain_b is None:
+                captain_b = cap
+    else:
+        if len(all_candidates) >= 1:
+            captain_a = all_candidates[0]
+        if len(all_candidates) >= 2:
+            captain_b = all_candidates[1]
+
+    return (captain_a, captain_b, all_candidates)
+
+
+def _first_two_teams(lines: list[str], pattern: re.Pattern) -> Optional[tuple[str, str]]:
+    """First two cleaned team names captured by pattern on consecutive scan of lines."""
+    teams = []
+    for ln in lines:
+        m = pattern.match(ln.strip())
+        if m:
+            team = clean_team_name(m.group(1))
+            if team:
+                teams.append(team)
+        if len(teams) >= 2:
+            return (teams[0], teams[1])
+    return None
+
+
+def _team_near_divider(lines: list[str], indices: range) -> Optional[str]:
+    """First team-looking line among lines[indices], skipping mentions and separators."""
+    for i in indices:
+        ln = lines[i].strip()
+        if not ln or ln.startswith("@"):
+            continue
+        if SEPARATOR_RE.match(ln):
+            continue
+        m = TEAM_RECORD_RE.match(ln)
+        if m:
+            return clean_team_name(m.group(1))
+        if len(ln) < 50:
+            return clean_team_name(ln)
+    return None
+
+
+def guess_teams(text: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Extract team names from text.
+
+    Handles result lines ("Team (W-L) - score ✅"), "Team (W-L)" headers,
+    leaderboard lines, and multi-line posts split by vs or separator lines.
+    """
+    if not text:
+        return (None, None)
+
+    lines = text.splitlines()
+
+    # Strategy 1: Result format - "Team (W-L) - score ✅"
+    teams = _first_two_teams(lines, RESULT_LINE_RE)
+    if teams:
+        return teams
+
+    # Strategy 2: Team record format - "Team (W-L)" on its own line
+    # Common in GOTD posts
+    team_record_teams = []
+    for ln in lines:
+        ln_stripped = ln.strip()
+        # Skip lines that start with @, are separators, or are too long
+        if ln_stripped.startswith("@") or SEPARATOR_RE.match(ln_stripped) or len(ln_stripped) > 50:
+            continue
+        m = TEAM_RECORD_RE.match(ln_stripped)
+        if m:
+            team = clean_team_name(m.group(1))
+            if team and len(team) > 1:
+                team_record_teams.append(team)
+        if len(team_record_teams) >= 2:
+            break
+    if len(team_record_teams) >= 2:
+        return (team_record_teams[0], team_record_teams[1])
+
+    # Strategy 3: Leaderboard format
+    teams = _first_two_teams(lines, LEADERBOARD_LINE_RE)
+    if teams:
+        return teams
+
+    # Strategy 4: Multi-line with vs or separator divider
+    divider_idx = _find_vs_line(lines, allow_separators=True)
+
+    # If no vs found, use the middle of several separator lines
+    if divider_idx is None:
+        separator_indices = [i for i, ln in enumerate(lines) if SEPARATOR_RE.match(ln.strip())]
+        if len(separator_indices) >= 2:
+            divider_idx = separator_indices[len(separator_indices) // 2]
+
+    if divider_idx is not None:
+        # Search backward for team A, forward for team B
+        team_a = _team_near_divider(lines, range(divider_idx - 1, max(0, divider_idx - 15) - 1, -1))
+        team_b = _team_near_divider(lines, range(divider_idx + 1, min(len(lines), divider_idx + 15)))
+        if team_a or team_b:
+            return (team_a, team_b)
+
+    return (None, None)
+
+
+def detect_postseason_info(text: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Detect postseason round name and seeds.
+
+    Returns (round_name, seed_a, seed_b). The round name is the whole header
+    line it appears on, e.g. "👑 RKL FINALS GAME 5 👑".
+    """
+    if not text:
+        return (None, None, None)
+
+    lines = text.splitlines()
+    round_name = None
+    seed_a, seed_b = None, None
+
+    for ln in lines[:5]:
+        m = ROUND_NAME_RE.search(ln.strip())
+        if m:
+            round_name = ln.strip()
+            break
+
+    vs_line_idx = None
+    for i, ln in enumerate(lines):
+        if STANDALONE_VS_RE.match(ln):
+            vs_line_idx = i
+            break
+
+    if vs_line_idx is not None:
+        for i in range(vs_line_idx - 1, max(0, vs_line_idx - 10) - 1, -1):
+            ln = lines[i].strip()
+            if ln.startswith("@"):
+                continue
+            m = SEED_TEAM_RE.match(ln)
+            if m:
+                seed_a = m.group(1) or m.group(2)
+                break
+
+        for i in range(vs_line_idx + 1, min(len(lines), vs_line_idx + 10)):
+            ln = lines[i].strip()
+            if ln.startswith("@"):
+                continue
+            m = SEED_TEAM_RE.match(ln)
+            if m:
+                seed_b = m.group(1) or m.group(2)
+                break
+
+    return (round_name, seed_a, seed_b)
+
+# ============================================================================
+# RESULT EXTRACTION
+# ============================================================================
+
+def detect_winner(line: str) -> Optional[str]:
+    """Detect if a line indicates a win or loss."""
+    if WIN_INDICATOR_RE.search(line):
+        return "win"
+    if LOSS_INDICATOR_RE.search(line):
+        return "loss"
+    return None
+
+
+def parse_result_line(line: str) -> Optional[dict]:
+    """
+    Parse a single result line.
+    Returns: {team, record_w, record_l, score, seed, winner} or None
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    m = RESULT_FULL_RE.match(line)
+    if m:
+        seed = m.group(1) or m.group(2)  # (seed) or seed.
+        team = LEADING_RANK_RE.sub("", m.group(3).strip()).strip()
+        trailing = m.group(7) or ""
+
+        return {
+            "team": team,
+            "record_w": int(m.group(4)),
+            "record_l": int(m.group(5)),
+            "score": parse_score(m.group(6)),
+            "seed": seed,
+            "winner": detect_winner(trailing),
+        }
+    return None
+
+
+def parse_adjustment_line(line: str) -> Optional[dict]:
+    """
+    Parse an adjustment line like "Diabetics -1950".
+    Returns: {team, adjustment} or None
+    """
+    m = ADJUSTMENT_LINE_RE.match(line.strip())
+    if m:
+        team = m.group(1).strip()
+        adj_str = m.group(2).replace(",", "")
+        try:
+            return {"team": team, "adjustment": float(adj_str)}
+        except ValueError:
+            return None
+    return None
+
+
+def extract_game_result(text: str) -> Optional[dict]:
+    """
+    Extract game result data from a results post.
+    Returns: {
+        team_a, team_b, score_a, score_b,
+        record_a_w, record_a_l, record_b_w, record_b_l,
+        seed_a, seed_b, winner,
+        adjustment_a, adjustment_b,
+        round_name
+    } or None
+    """
+    if not text:
+        return None
+
+    lines = text.splitlines()
+    result_lines = []
+    adjustments = []
+    in_adjustment_section = False
+    round_name = None
+
+    for ln in lines:
+        ln_stripped = ln.strip()
+
+        # Check for round name before the first result line
+        if len(result_lines) == 0 and not round_name:
+            m = ROUND_NAME_RE.search(ln_stripped)
+            if m:
+                # Take the whole line as round name (e.g., "👑 RKL FINALS GAME 5 👑")
+                round_name = ln_stripped
+                continue
+
+        if SEPARATOR_RE.match(ln_stripped):
+            continue
+
+        if ADJUSTMENT_HEADER_RE.search(ln_stripped):
+            in_adjustment_section = True
+            continue
+
+        parsed = parse_result_line(ln_stripped)
+        if parsed:
+            result_lines.append(parsed)
+            continue
+
+        # Parse adjustment lines (if in adjustment section or after both teams)
+        if in_adjustment_section or len(result_lines) >= 2:
+            adj = parse_adjustment_line(ln_stripped)
+            if adj:
+                adjustments.append(adj)
+
+    # Need at least 2 result lines for a game
+    if len(result_lines) < 2:
+        return None
+
+    # Take the first two as the teams
+    team_a_data = result_lines[0]
+    team_b_data = result_lines[1]
+
+    # Determine winner
+    winner = None
+    if team_a_data.get("winner") == "win":
+        winner = "A"
+    elif team_b_data.get("winner") == "win":
+        winner = "B"
+    elif team_a_data.get("winner") == "loss":
+        winner = "B"
+    elif team_b_data.get("winner") == "loss":
+        winner = "A"
+    # Fallback: higher score wins
+    elif team_a_data.get("score") and team_b_data.get("score"):
+        if team_a_data["score"] > team_b_data["score"]:
+            winner = "A"
+        elif team_b_data["score"] > team_a_data["score"]:
+            winner = "B"
+
+    # Match adjustments to teams
+    adjustment_a = None
+    adjustment_b = None
+    team_a_lower = team_a_data["team"].lower()
+    team_b_lower = team_b_data["team"].lower()
+
+    for adj in adjustments:
+        adj_team_lower = adj["team"].lower()
+        if adj_team_lower in team_a_lower or team_a_lower in adj_team_lower:
+            adjustment_a = adj["adjustment"]
+        elif adj_team_lower in team_b_lower or team_b_lower in adj_team_lower:
+            adjustment_b = adj["adjustment"]
+
+    return {
+        "team_a": team_a_data["team"],
+        "team_b": team_b_data["team"],
+        "score_a": team_a_data.get("score"),
+        "score_b": team_b_data.get("score"),
+        "record_a_w": team_a_data.get("record_w"),
+        "record_a_l": team_a_data.get("record_l"),
+        "record_b_w": team_b_data.get("record_w"),
+        "record_b_l": team_b_data.get("record_l"),
+        "seed_a": team_a_data.get("seed"),
+        "seed_b": team_b_data.get("seed"),
+        "winner": winner,
+        "adjustment_a": adjustment_a,
+        "adjustment_b": adjustment_b,
+        "round_name": round_name,
+    }
@@ -0,0 +1,94 @@
+"""
+Precompiled regex tables shared by the review app and the batch parser.
+
+Where app.py and parse_rkl_games.py had drifted, these are the parser's
+(more permissive) versions: optional dash between record and score,
+tilde separators, singular "Final", and (W)/(L) text markers.
+"""
+
+import re
+
+# ============================================================================
+# CORE PATTERNS
+# ============================================================================
+
+MENTION_RE = re.compile(r"@([A-Za-z0-9._]+)")
+VS_ANY_RE = re.compile(r"\bvs\.?\b", re.IGNORECASE)
+# Standalone vs line (just "vs" or "vs." on its own line)
+STANDALONE_VS_RE = re.compile(r"^\s*vs\.?\s*$", re.IGNORECASE)
+# "vs" wrapped in separator characters, e.g. "----- vs -----"
+SEPARATED_VS_RE = re.compile(r"^[-–—~]*\s*vs\.?\s*[-–—~]*$", re.IGNORECASE)
+# Separator lines (dashes or tildes)
+SEPARATOR_RE = re.compile(r"^[-–—~]{3,}$")
+# Result indicator: team record pattern like "(10-4)" or "(1-4)"
+RECORD_PATTERN_RE = re.compile(r"\(\d+-\d+(?:-\d+)?\)")
+
+# ============================================================================
+# TEAM PATTERNS
+# ============================================================================
+
+# Matches: "TeamName (W-L)" or "TeamName (W-L-T)" with optional trailing stuff
+TEAM_RECORD_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)")
+# Result lines: "TeamName (W-L) - 47,502 ✅" (the dash is optional)
+RESULT_LINE_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]?\s*[\d,]+\s*[✅❌]", re.UNICODE)
+# Leaderboard rank lines: "1. TeamName (W-L) - 51,513 ✅"
+LEADERBOARD_LINE_RE = re.compile(r"^\d+\.\s*(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]\s*[\d,]+", re.UNICODE)
+
+# Team name cleanup
+LEADING_SEED_RE = re.compile(r"^\s*(?:\(\d+\)\s*|\d+\.\s*|\d+\s+)")
+TRAILING_RECORD_RE = re.compile(r"\s*\(\d+-\d+(?:-\d+)?\)\s*$")
+TRAILING_SCORE_RE = re.compile(r"\s*[-–]\s*[\d,]+\s*[✅❌]?\s*$")
+LEADING_RANK_RE = re.compile(r"^\d+\.\s*")
+# Everything but ASCII letters and digits, dropped from lowercased names by team_key
+TEAM_KEY_DROP_RE = re.compile(r"[^a-z0-9]")
+
+# ============================================================================
+# CAPTAIN PATTERNS
+# ============================================================================
+
+# Explicit (c) or (C) after mention: @user (c)
+CAPTAIN_EXPLICIT_RE = re.compile(r"@([A-Za-z0-9._]+)\s*\([cC]\)")
+# Plain c or C after mention followed by whitespace/end: @user c
+CAPTAIN_PLAIN_C_RE = re.compile(r"@([A-Za-z0-9._]+)\s+[cC](?:\s|$)")
+# Mention followed by the text up to the next mention
+MENTION_WITH_TRAIL_RE = re.compile(r"@([A-Za-z0-9._]+)(.*?)(?=@[A-Za-z0-9._]+|$)", re.DOTALL)
+# RealApp emoji codes like :doughnut: :crown: :flag_usa:
+REALAPP_EMOJI_RE = re.compile(r":[a-z_0-9]+")
+CAPTAIN_MARK_RE = re.compile(r"^\s*\([cC]\)")
+CAPTAIN_PLAIN_MARK_RE = re.compile(r"^\s*[cC](?:\s|$)")
+MENTION_BREAK_RE = re.compile(r"[@\n]")
+
+# ============================================================================
+# POSTSEASON PATTERNS
+# ============================================================================
+
+# Round names like "RKL Finals", "Round 1", "Semifinals", "Quarter Finals", etc.
+ROUND_NAME_RE = re.compile(
+    r"(RKL\s+Finals?|Finals?|Semi\s*-?\s*Finals?|Quarter\s*-?\s*Finals?|"
+    r"Round\s+\d+|Playoffs?\s+Round\s+\d+|Wild\s*Card|Game\s+\d+)",
+    re.IGNORECASE
+)
+# Seed pattern: "1 TeamName" or "(1) TeamName" or "1. TeamName" at start of line
+SEED_TEAM_RE = re.compile(r"^\s*(?:\((\d+)\)|(\d+)\.?\s+)(.+?)(?:\s*\(\d+-\d+\))?\s*$")
+
+# ============================================================================
+# RESULT PATTERNS
+# ============================================================================
+
+# Win/loss indicators (RealApp emoji plus (W)/(L) text markers)
+WIN_INDICATOR_RE = re.compile(r"(✅+|:check_mark_button|🏆|\(W\))")
+LOSS_INDICATOR_RE = re.compile(r"(❌|:cross_mark|\(L\))")
+WINLOSS_MARK_RE = re.compile(r"[✅❌🏆]|:check_mark_button|:cross_mark")
+
+# Numbers with commas and optional decimals: 34,565 or 47,547.5 or 51458
+SCORE_EXTRACT_RE = re.compile(r"([\d,]+(?:\.\d+)?)")
+
+# "(seed) TeamName (W-L) - 34,565 ✅" or "seed. TeamName (W-L): 51,458 ✅✅✅"
+RESULT_FULL_RE = re.compile(
+    r"^\s*(?:\((\d+)\)\s*|(\d+)\.\s*)?(.+?)\s*\((\d+)-(\d+)(?:-\d+)?\)\s*[-–:]?\s*([\d,]+(?:\.\d+)?)\s*(.*)$",
+    re.UNICODE
+)
+
+# Simple "TeamName -1950" adjustment lines
+ADJUSTMENT_LINE_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9\s]+?)\s+([+-]?\d[\d,]*(?:\.\d+)?)\s*$")
+ADJUSTMENT_HEADER_RE = re.compile(r"(advent\s+deduction|deduction|adjustment|penalty|bonus)", re.IGNORECASE)
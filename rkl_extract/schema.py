@@ -0,0 +1,133 @@
+"""
+The review tables in rkl.db, shared by the review app (app.py's _init_db)
+and the batch parser's --db sink (parse_rkl_games.write_to_rkl_db), so both
+create, migrate and index manual_extract and team_alias identically.
+
+App-only tables (extract jobs, thread_summary, the FTS index) stay in app.py.
+"""
+
+import sqlite3
+from collections import defaultdict
+
+from .extract import team_key
+
+REVIEW_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS thread_state (
+    thread_id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'todo',   -- todo | done | review | skipped
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_thread_state_status ON thread_state(status);
+
+CREATE TABLE IF NOT EXISTS manual_extract (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT,
+    thread_id INTEGER,
+    comment_id INTEGER,
+    source TEXT,          -- feed/replies
+    kind TEXT,            -- lineup/result/leaderboard/other
+    game_date TEXT,       -- YYYY-MM-DD
+    team_a TEXT,
+    team_b TEXT,
+    mentions TEXT,        -- comma-separated (legacy)
+    notes TEXT,
+    raw_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_manual_extract_thread ON manual_extract(thread_id);
+"""
+
+# Columns added to manual_extract after its first release
+MANUAL_EXTRACT_MIGRATIONS = [
+    ("captain_a", "TEXT"),
+    ("captain_b", "TEXT"),
+    ("mentions_a", "TEXT"),  # Team A players
+    ("mentions_b", "TEXT"),  # Team B players
+    ("seed_a", "TEXT"),      # Postseason seed
+    ("seed_b", "TEXT"),
+    ("round_name", "TEXT"),  # e.g., "RKL Finals", "Round 1"
+    # Result-specific fields
+    ("score_a", "REAL"),     # Team A score
+    ("score_b", "REAL"),     # Team B score
+    ("winner", "TEXT"),      # "A", "B", or null
+    ("adjustment_a", "REAL"),  # Score adjustment for team A
+    ("adjustment_b", "REAL"),  # Score adjustment for team B
+    # Linking results to lineups
+    ("linked_extract_id", "INTEGER"),  # FK to another manual_extract (lineup)
+]
+
+# Lookup indexes; after the migrations, which add some of the indexed columns
+LOOKUP_SQL = """
+CREATE INDEX IF NOT EXISTS idx_manual_extract_comment ON manual_extract(comment_id);
+-- In find_all_matching_lineups' ORDER BY, so its date-window queries need no
+-- sort; the exact team-pair query filters that week's lineups through it too
+CREATE INDEX IF NOT EXISTS idx_manual_extract_kind_date ON manual_extract(kind, game_date DESC, id);
+-- Was meant for the pair query, but the planner prefers the date range above
+DROP INDEX IF EXISTS idx_manual_extract_lineup_teams;
+CREATE INDEX IF NOT EXISTS idx_manual_extract_scored ON manual_extract(id) WHERE score_a IS NOT NULL;
+
+-- Every spelling of a team name seen in manual_extract; spellings sharing
+-- a team_key are the same team, and the most-seen one is canonical
+CREATE TABLE IF NOT EXISTS team_alias (
+    alias TEXT PRIMARY KEY,      -- lower(trim(name))
+    spelling TEXT NOT NULL,      -- first spelling seen for this alias
+    team_key TEXT NOT NULL,      -- rkl_extract.team_key(name)
+    seen INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_team_alias_key ON team_alias(team_key, seen DESC);
+"""
+
+
+def init_review_schema(con: sqlite3.Connection):
+    """Create and migrate thread_state, manual_extract and team_alias, with their indexes."""
+    cur = con.cursor()
+    cur.executescript(REVIEW_TABLES_SQL)
+    con.commit()
+
+    existing = {row[1] for row in cur.execute("PRAGMA table_info(manual_extract)")}
+    for col_name, col_type in MANUAL_EXTRACT_MIGRATIONS:
+        if col_name not in existing:
+            cur.execute(f"ALTER TABLE manual_extract ADD COLUMN {col_name} {col_type}")
+    con.commit()
+
+    cur.executescript(LOOKUP_SQL)
+    con.commit()
+
+
+def _count_aliases(names) -> tuple[dict, dict]:
+    """({alias: times seen}, {alias: first spelling}) for non-blank names."""
+    counts = defaultdict(int)
+    spellings = {}
+    for name in names:
+        name = (name or "").strip()
+        if name:
+            alias = name.lower()
+            counts[alias] += 1
+            spellings.setdefault(alias, name)
+    return counts, spellings
+
+
+def record_team_aliases(con: sqlite3.Connection, names):
+    """Count observed team name spellings into team_alias. Does not commit."""
+    counts, spellings = _count_aliases(names)
+    con.executemany("""
+      INSERT INTO team_alias(alias, spelling, team_key, seen) VALUES (?, ?, ?, ?)
+      ON CONFLICT(alias) DO UPDATE SET seen = seen + excluded.seen
+    """, [(alias, spellings[alias], team_key(alias), n) for alias, n in counts.items()])
+
+
+def forget_team_aliases(con: sqlite3.Connection, names):
+    """
+    Undo record_team_aliases for names an edited or deleted manual_extract
+    row no longer has, dropping aliases nothing uses any more. Does not commit.
+    """
+    counts, _ = _count_aliases(names)
+    con.executemany("UPDATE team_alias SET seen = MAX(seen - ?, 0) WHERE alias = ?",
+                    [(n, alias) for alias, n in counts.items()])
+    con.executemany("DELETE FROM team_alias WHERE alias = ? AND seen = 0", [(alias,) for alias in counts])
+
+
+def rebuild_team_aliases(con: sqlite3.Connection):
+    """Recount team_alias from every team name in manual_extract. Does not commit."""
+    con.execute("DELETE FROM team_alias")
+    record_team_aliases(con, (r[0] for r in con.execute(
+        "SELECT team_a FROM manual_extract UNION ALL SELECT team_b FROM manual_extract").fetchall()))
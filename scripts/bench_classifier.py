@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared content classifier (rkl_extract.classify) on the full corpus.
+
+Reports per-comment cost of computing the feature vector, of the review app's
+guess_kind and of the parser's detect_content_type (which the parser calls up
+to three times per comment, served from the feature cache after the first),
+plus how each classifier labels the corpus.
+
+Usage:
+    python bench_classifier.py [--sql-path ../rkl_comments.sql] [--repeat 5]
+    python bench_classifier.py --db ../rkl.db
+"""
+
+import argparse
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+from parse_rkl_games import iter_sql_dump
+from rkl_extract.classify import content_features, detect_content_type, guess_kind
+
+
+def load_texts(sql_path: Path = None, db_path: Path = None) -> list[str]:
+    """Comment texts from the review app's rkl.db or from the SQL dump."""
+    if db_path:
+        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return [row[0] or "" for row in con.execute("SELECT plain_text FROM rkl_comments")]
+        finally:
+            con.close()
+    return [c.plain_text for c in iter_sql_dump(sql_path)]
+
+
+def time_per_comment(fn, texts: list[str], repeat: int) -> float:
+    """Best-of-repeat wall time per comment, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        content_features.cache_clear()
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / max(len(texts), 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark comment classification")
+    parser.add_argument("--sql-path", type=str, default="../rkl_comments.sql",
+                        help="Path to the SQL dump file")
+    parser.add_argument("--db", type=str, default=None,
+                        help="Read comments from this rkl.db instead of the SQL dump")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per measurement; the fastest is reported (default: 5)")
+    args = parser.parse_args()
+
+    sql_path = Path(args.sql_path)
+    db_path = Path(args.db) if args.db else None
+    if not db_path and not sql_path.exists():
+        print(f"Error: SQL file not found at {sql_path}")
+        return 1
+
+    texts = load_texts(sql_path, db_path)
+    if not texts:
+        print("No comments to benchmark")
+        return 1
+    avg_len = sum(len(t) for t in texts) / len(texts)
+    print(f"\n{len(texts):,} comments, {avg_len:.0f} characters on average\n")
+
+    def parser_pattern(text):
+        # extract_lineup, extract_result and the leaderboard check each classify
+        detect_content_type(text)
+        detect_content_type(text)
+        detect_content_type(text)
+
+    timings = [
+        ("content_features (uncached)", content_features.__wrapped__),
+        ("guess_kind", guess_kind),
+        ("detect_content_type", detect_content_type),
+        ("detect_content_type x3 (parser)", parser_pattern),
+    ]
+    for label, fn in timings:
+        print(f"  {label:<34} {time_per_comment(fn, texts, args.repeat):8.2f} us/comment")
+
+    print("\nLabels:")
+    app_kinds = Counter(guess_kind(t) for t in texts)
+    parser_kinds = Counter(detect_content_type(t) for t in texts)
+    for kind in ("lineup", "result", "leaderboard", "other"):
+        print(f"  {kind:<12} guess_kind {app_kinds[kind]:>8,}   detect_content_type {parser_kinds[kind]:>8,}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
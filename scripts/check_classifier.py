@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Check the shared content classifier (rkl_extract.classify) against the
+classifiers it replaced.
+
+The review app's guess_kind and the parser's detect_content_type used to
+run their own regexes over the raw text. Copies of both, as they were
+before the shared ContentFeatures vector, are kept below together with the
+patterns they used. Every comment in the table of edge cases and in a
+sample of the corpus is labelled by the old and new functions, and each
+content_features signal is compared with the old pattern it stands for.
+Exits 1 on any difference.
+
+Usage:
+    python check_classifier.py [--sql-path ../rkl_comments.sql] [--sample 2000]
+    python check_classifier.py --db ../rkl.db --sample 0    # every comment
+"""
+
+import argparse
+import random
+import re
+from pathlib import Path
+
+from bench_classifier import load_texts
+from rkl_extract.classify import content_features, detect_content_type, guess_kind
+
+# ============================================================================
+# PREVIOUS CLASSIFIERS
+# ============================================================================
+
+MENTION_RE = re.compile(r"@([A-Za-z0-9._]+)")
+VS_ANY_RE = re.compile(r"\bvs\.?\b", re.IGNORECASE)
+SCORE_NUM_RE = re.compile(r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b|\b\d{4,6}(?:\.\d+)?\b")
+LARGE_SCORE_RE = re.compile(r"\b\d{2},\d{3}\b|\b[3-9]\d{4}\b")
+TOP_SCORES_RE = re.compile(r"top\s+team\s+scores", re.IGNORECASE)
+MEDIAN_RE = re.compile(r"\bmedian\b", re.IGNORECASE)
+WINLOSS_MARK_RE = re.compile(r"[✅❌🏆]|:check_mark_button|:cross_mark")
+RECORD_PATTERN_RE = re.compile(r"\(\d+-\d+(?:-\d+)?\)")
+GOTD_RE = re.compile(r"\bGOTD\b", re.IGNORECASE)
+SEPARATOR_LINE_RE = re.compile(r"^[-–—~]{3,}$", re.MULTILINE)      # parser
+DASH_SEPARATOR_LINE_RE = re.compile(r"^[-–—]{3,}$", re.MULTILINE)  # app
+LINEUP_WORD_RE = re.compile(r"\blineups?\b", re.IGNORECASE)         # parser
+LINEUPS_WORD_RE = re.compile(r"\blineups\b", re.IGNORECASE)         # app
+# The parser's round names; the app's only accepted plural "Finals"
+ROUND_NAME_RE = re.compile(
+    r"(RKL\s+Finals?|Finals?|Semi\s*-?\s*Finals?|Quarter\s*-?\s*Finals?|"
+    r"Round\s+\d+|Playoffs?\s+Round\s+\d+|Wild\s*Card|Game\s+\d+)",
+    re.IGNORECASE
+)
+ROUND_NAME_PLURAL_RE = re.compile(
+    r"(RKL\s+Finals|Finals|Semi\s*-?\s*Finals?|Quarter\s*-?\s*Finals?|"
+    r"Round\s+\d+|Playoffs?\s+Round\s+\d+|Wild\s*Card|Game\s+\d+)",
+    re.IGNORECASE
+)
+
+
+def old_guess_kind(text: str) -> str:
+    """The review app's guess_kind before rkl_extract.classify."""
+    t = text or ""
+    if TOP_SCORES_RE.search(t) or MEDIAN_RE.search(t):
+        return "leaderboard"
+    has_winloss = WINLOSS_MARK_RE.search(t)
+    has_scores = SCORE_NUM_RE.search(t)
+    has_records = RECORD_PATTERN_RE.search(t)
+    has_separator = bool(DASH_SEPARATOR_LINE_RE.search(t))
+    record_count = len(RECORD_PATTERN_RE.findall(t))
+    if has_winloss and has_scores:
+        return "result"
+    if record_count >= 2 and has_scores:
+        return "result"
+    if has_records and has_separator and has_scores:
+        return "result"
+    if (LINEUPS_WORD_RE.search(t) or VS_ANY_RE.search(t)) and MENTION_RE.search(t):
+        return "lineup"
+    if GOTD_RE.search(t) and MENTION_RE.search(t):
+        return "lineup"
+    if ROUND_NAME_PLURAL_RE.search(t) and MENTION_RE.search(t) and VS_ANY_RE.search(t):
+        return "lineup"
+    return "other"
+
+
+def old_detect_content_type(text: str) -> str:
+    """The parser's detect_content_type before rkl_extract.classify."""
+    if not text:
+        return "other"
+    if TOP_SCORES_RE.search(text) or MEDIAN_RE.search(text):
+        return "leaderboard"
+    has_winloss = WINLOSS_MARK_RE.search(text)
+    has_scores = SCORE_NUM_RE.search(text)
+    has_records = RECORD_PATTERN_RE.search(text)
+    has_separator = bool(SEPARATOR_LINE_RE.search(text))
+    record_count = len(RECORD_PATTERN_RE.findall(text))
+    mention_count = len(MENTION_RE.findall(text))
+    has_vs = VS_ANY_RE.search(text)
+    if has_winloss and has_scores:
+        return "result"
+    if record_count >= 2 and has_scores and LARGE_SCORE_RE.findall(text):
+        return "result"
+    if has_records and has_separator and has_scores:
+        return "result"
+    if GOTD_RE.search(text) and mention_count >= 4:
+        return "lineup"
+    if has_vs and mention_count >= 2:
+        return "lineup"
+    if LINEUP_WORD_RE.search(text) and mention_count >= 2:
+        return "lineup"
+    if has_records and mention_count >= 4 and has_separator:
+        return "lineup"
+    if ROUND_NAME_RE.search(text) and mention_count >= 2 and (has_vs or has_separator):
+        return "lineup"
+    if mention_count >= 6 and has_separator:
+        return "lineup"
+    return "other"
+
+
+# ContentFeatures field -> the old test it replaces
+OLD_FEATURES = {
+    "leaderboard_header": lambda t: bool(TOP_SCORES_RE.search(t) or MEDIAN_RE.search(t)),
+    "winloss": lambda t: bool(WINLOSS_MARK_RE.search(t)),
+    "has_score": lambda t: bool(SCORE_NUM_RE.search(t)),
+    "large_score": lambda t: bool(SCORE_NUM_RE.search(t) and LARGE_SCORE_RE.search(t)),
+    "record_count": lambda t: len(RECORD_PATTERN_RE.findall(t)),
+    "separator": lambda t: bool(SEPARATOR_LINE_RE.search(t)),
+    "dash_separator": lambda t: bool(DASH_SEPARATOR_LINE_RE.search(t)),
+    "mention_count": lambda t: len(MENTION_RE.findall(t)),
+    "vs": lambda t: bool(VS_ANY_RE.search(t)),
+    "gotd": lambda t: bool(GOTD_RE.search(t)),
+    "lineup_word": lambda t: bool(LINEUP_WORD_RE.search(t)),
+    "lineups_word": lambda t: bool(LINEUPS_WORD_RE.search(t)),
+    "round_name": lambda t: bool(ROUND_NAME_RE.search(t)),
+    "round_name_plural": lambda t: bool(ROUND_NAME_PLURAL_RE.search(t)),
+}
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+LINEUP = "Xrays (3-1)\n@a1 (c)\n@a2\n@a3\nvs\nYankees (2-2)\n@b1 (c)\n@b2\n@b3"
+RESULT = "Xrays (4-1) - 17,162 ✅\nYankees (2-3) - 13,492 ❌"
+
+# (description, comment text); each is labelled by the old and new functions
+CASES = [
+    ("empty", ""),
+    ("lineup", LINEUP),
+    ("result", RESULT),
+    ("result with realapp emoji codes", "Xrays 17,162 :check_mark_button\nYankees 13,492 :cross_mark"),
+    ("records and large scores, no marks", "Xrays (4-1) 51234\nYankees (2-3) 48,001"),
+    ("records and small scores, no marks", "Xrays (4-1) 512\nYankees (2-3) 480"),
+    ("records, dash separator, score", "Xrays (4-1)\n---\n17,162"),
+    ("records, tilde separator, score", "Xrays (4-1)\n~~~\n17,162"),
+    ("leaderboard header", "Top Team Scores\n1. Xrays (4-1) - 17,162"),
+    ("median", "Median: 15,000 ✅"),
+    ("medians is not median", "medians 15,000"),
+    ("vs. with one mention", "Xrays vs. Yankees @a1"),
+    ("vs inside a word", "canvas @a1 @a2"),
+    ("singular lineup word", "Lineup for tonight @a1 @a2"),
+    ("plural lineups word", "LINEUPS @a1"),
+    ("gotd with four mentions", "gotd @a1 @a2 @a3 @a4"),
+    ("gotd with one mention", "GOTD @a1"),
+    ("singular final", "RKL Final Xrays vs Yankees @a1"),
+    ("plural finals", "RKL Finals Xrays vs Yankees @a1"),
+    ("round name and separator", "Round 2\n@a1\n———\n@b1"),
+    ("records, mentions, tilde separator", "Xrays (3-1)\n@a1 @a2\n~~~\nYankees (2-2)\n@b1 @b2"),
+    ("six mentions and a separator", "@a1 @a2 @a3\n---\n@b1 @b2 @b3"),
+    ("dotted i folds to i", "LİNEUPS @a1 @a2"),
+    ("kelvin sign folds to k", "Top Team Scores K"),
+    ("long s folds to s", "Top Team ſcores"),
+    ("dotless i folds to i", "Medıan 20,000"),
+    ("score glued to a word", "abc123 def45,678 @a1 vs @b1"),
+    ("trophy only", "🏆 @a1"),
+    ("plain chat", "gg everyone, see you next week"),
+]
+
+
+def differences(text: str) -> list[str]:
+    """What the new classifier does differently from the old ones on text."""
+    found = []
+    for name, new, old in (("guess_kind", guess_kind, old_guess_kind),
+                           ("detect_content_type", detect_content_type, old_detect_content_type)):
+        if new(text) != old(text):
+            found.append(f"{name} {new(text)!r}, was {old(text)!r}")
+    features = content_features(text)
+    for name, old in OLD_FEATURES.items():
+        if getattr(features, name) != old(text):
+            found.append(f"{name} {getattr(features, name)!r}, was {old(text)!r}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the shared classifier against the previous ones")
+    parser.add_argument("--sql-path", type=str, default="../rkl_comments.sql",
+                        help="Path to the SQL dump file")
+    parser.add_argument("--db", type=str, default=None,
+                        help="Read comments from this rkl.db instead of the SQL dump")
+    parser.add_argument("--sample", type=int, default=2000,
+                        help="Corpus comments to check (default: 2000, 0 for all)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for the sample (default: 0)")
+    args = parser.parse_args()
+
+    failures = 0
+    for description, text in CASES:
+        found = differences(text)
+        status = "same" if not found else "DIFFERS: " + "; ".join(found)
+        print(f"  {description:<38} {guess_kind(text):<12} {detect_content_type(text):<12} {status}")
+        failures += bool(found)
+
+    sql_path = Path(args.sql_path)
+    db_path = Path(args.db) if args.db else None
+    if db_path or sql_path.exists():
+        texts = load_texts(sql_path, db_path)
+        if args.sample and args.sample < len(texts):
+            texts = random.Random(args.seed).sample(texts, args.sample)
+        differing = 0
+        for text in texts:
+            found = differences(text)
+            if found:
+                differing += 1
+                if differing <= 5:
+                    print(f"  DIFFERS on {text[:60]!r}: {'; '.join(found)}")
+        print(f"\nCorpus: {differing} of {len(texts):,} comments differ")
+        failures += differing
+    else:
+        print(f"\nSQL file not found at {sql_path}, checked the table of cases only")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Check that an --incremental parse produces the same output as a full parse.
+
+Writes an older copy of the SQL dump (without the last --days days of
+comments, and without every --drop-every'th comment before that, so threads
+throughout the history change too), builds a checkpoint from it, then parses
+the full dump incrementally from that checkpoint and compares the outputs
+with a full parse of the same dump, file by file. A second incremental run
+with nothing changed must match as well.
+
+The same is done for a small made-up history in which a new result claims a
+lineup and so pushes an older result onto the lineup a third result, more
+than LINK_WINDOW_DAYS from the change, had taken (see
+link_results_incremental). Exits 1 on any difference.
+
+Usage:
+    python check_incremental.py [--sql-path ../rkl_comments.sql] [--link-mode greedy optimal]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from parse_rkl_games import iter_sql_statements, parse_insert_statement, run_parser
+
+COMPARED_OUTPUTS = ("parsed_games.json", "parsed_lineups.json", "parsed_results.json", "parsed_games.csv")
+
+CASCADE_LINEUP = "Xrays (0-0)\n @a1 (c)\n @a2\n @a3\nvs\nYankees (0-0)\n @b1 (c)\n @b2\n @b3"
+CASCADE_RESULT = "Xrays (1-0): 17,162 ✅\nYankees (0-1): 13,492"
+# (comment_id, day of January 2025, text) for the made-up history. Greedily,
+# 200 takes lineup 500 and 300 takes 400; the new result 100 (first in the
+# dump) takes 500 instead, so 200 takes 400 and 300 is left unmatched.
+CASCADE_OLDER = [(200, 17, CASCADE_RESULT), (300, 16, CASCADE_RESULT),
+                 (400, 10, CASCADE_LINEUP), (500, 17, CASCADE_LINEUP)]
+CASCADE_NEW = [(100, 24, CASCADE_RESULT)]
+
+
+def write_older_dump(sql_path: Path, older_path: Path, days: int, drop_every: int) -> tuple[int, int]:
+    """Copy the dump's comment INSERTs minus recent and every drop_every'th
+    older comment. Returns (kept, total)."""
+    with open(sql_path, 'rb') as f:
+        statements = [(s, parse_insert_statement(s)) for s in iter_sql_statements(f)]
+    dates = [r.created_at_ts[:10] for _, r in statements if r]
+    cutoff = (datetime.fromisoformat(max(dates)) - timedelta(days=days)).date().isoformat()
+
+    kept = 0
+    with open(older_path, 'w', encoding='utf-8') as f:
+        for statement, record in statements:
+            if record is None or record.created_at_ts[:10] > cutoff:
+                continue
+            if drop_every and record.comment_id % drop_every == 0:
+                continue
+            f.write(statement.rstrip() + "\n")
+            kept += 1
+    return kept, len(statements)
+
+
+def write_cascade_dumps(older_path: Path, full_path: Path):
+    """Write the made-up history without and with its new result."""
+    def insert(comment_id: int, day: int, text: str) -> str:
+        return ("INSERT INTO rkl_comments (comment_id, group_id, source, created_at_ts, created_at_text, "
+                "pin_priority, reply_count, depth, parent_comment_id, replying_to_comment_id, reply_num, "
+                "user_id, thread_root_id, plain_text, raw_json) "
+                f"VALUES ({comment_id},42,'feed','2025-01-{day:02d} 17:00:00.000000+00:00','x',NULL,0,0,"
+                f"NULL,NULL,NULL,1,{comment_id},'{text.replace(chr(39), chr(39) * 2)}','{{}}');\n")
+
+    older_path.write_text("".join(insert(*row) for row in CASCADE_OLDER), encoding="utf-8")
+    full_path.write_text("".join(insert(*row) for row in CASCADE_NEW + CASCADE_OLDER), encoding="utf-8")
+
+
+def parse(sql_path: Path, output_dir: Path, link_mode: str, checkpoint_path: Path = None):
+    """run_parser with its progress output captured."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_parser(sql_path, output_dir, checkpoint_path=checkpoint_path, link_mode=link_mode)
+
+
+def differing_outputs(dir_a: Path, dir_b: Path) -> list[str]:
+    return [name for name in COMPARED_OUTPUTS
+            if (dir_a / name).read_bytes() != (dir_b / name).read_bytes()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check incremental parsing against a full parse")
+    parser.add_argument("--sql-path", type=str, default="../rkl_comments.sql",
+                        help="Path to the SQL dump file")
+    parser.add_argument("--link-mode", nargs="+", choices=["greedy", "optimal"], default=["greedy", "optimal"],
+                        help="Linkers to check (default: both)")
+    parser.add_argument("--days", type=int, default=7,
+                        help="Recent days left out of the checkpoint's dump (default: 7)")
+    parser.add_argument("--drop-every", type=int, default=13,
+                        help="Also leave out comments whose id is a multiple of this (default: 13, 0 for none)")
+    args = parser.parse_args()
+
+    sql_path = Path(args.sql_path)
+    if not sql_path.exists():
+        print(f"Error: SQL file not found at {sql_path}")
+        return 1
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cases = []
+
+        older_path = tmp / "older.sql"
+        kept, total = write_older_dump(sql_path, older_path, args.days, args.drop_every)
+        print(f"Checkpoint dump keeps {kept:,} of {total:,} comments")
+        cases.append(("dump", older_path, sql_path))
+
+        cascade_older, cascade_full = tmp / "cascade-older.sql", tmp / "cascade.sql"
+        write_cascade_dumps(cascade_older, cascade_full)
+        cases.append(("cascade", cascade_older, cascade_full))
+
+        for case, case_older, case_full in cases:
+            for link_mode in args.link_mode:
+                run_dir = tmp / f"{case}-{link_mode}"
+                checkpoint_path = run_dir / "checkpoint.json"
+                parse(case_full, run_dir / "full", link_mode)
+                parse(case_older, run_dir / "older", link_mode, checkpoint_path)
+
+                for run in ("changed", "unchanged"):
+                    parse(case_full, run_dir / "incremental", link_mode, checkpoint_path)
+                    differing = differing_outputs(run_dir / "full", run_dir / "incremental")
+                    status = "same as full parse" if not differing else "DIFFERS: " + ", ".join(differing)
+                    print(f"  {case:<8} {link_mode:<8} incremental ({run}): {status}")
+                    failures += bool(differing)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
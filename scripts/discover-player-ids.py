@@ -24,6 +24,8 @@ from collections import defaultdict
 from typing import Dict, List, Optional, Set, Tuple
 from difflib import SequenceMatcher
 
+from karma_store import KARMA_STORE_PATH, KarmaStore
+
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -88,8 +90,10 @@ class PlayerDiscovery:
     Discovers player_ids for handles without mappings using multiple strategies.
     """
 
-    def __init__(self, supabase_url: str = None, supabase_key: str = None):
+    def __init__(self, supabase_url: str = None, supabase_key: str = None,
+                 karma_store_path: Optional[str] = KARMA_STORE_PATH):
         self.supabase: Optional[Client] = None
+        self.karma_store = KarmaStore(karma_store_path) if karma_store_path else None
         if supabase_url and supabase_key and SUPABASE_AVAILABLE:
             try:
                 self.supabase = create_client(supabase_url, supabase_key)
@@ -120,14 +124,18 @@ class PlayerDiscovery:
             print(f"✅ Loaded {len(self.existing_mappings)} existing mappings")
 
     def fetch_all_karma_data(self):
-        """Fetch karma data for all game dates."""
-        if not self.supabase:
+        """Fetch karma data for all game dates, from the local karma store where fresh."""
+        dates = set(game["game_date"] for game in self.games)
+        if self.karma_store:
+            self.karma_by_date.update(self.karma_store.load_days(dates))
+            print(f"\n💾 {len(self.karma_by_date)}/{len(dates)} dates from the karma store")
+        missing = sorted(dates - set(self.karma_by_date))
+        if not missing or not self.supabase:
             return
 
-        dates = set(game["game_date"] for game in self.games)
-        print(f"\n📅 Fetching karma data for {len(dates)} dates...")
+        print(f"\n📅 Fetching karma data for {len(missing)} dates...")
 
-        for date_str in sorted(dates):
+        for date_str in missing:
             try:
                 response = self.supabase.table("karma_rankings") \
                     .select("user_id, username, amount, rank") \
@@ -136,6 +144,8 @@ class PlayerDiscovery:
                     .execute()
 
                 self.karma_by_date[date_str] = response.data
+                if self.karma_store and response.data:
+                    self.karma_store.save_day(date_str, response.data)
                 print(f"  {date_str}: {len(response.data)} entries")
 
             except Exception as e:
@@ -507,18 +517,20 @@ def main():
                         help="Supabase URL (or set SUPABASE_URL env var)")
     parser.add_argument("--supabase-key", type=str,
                         help="Supabase API key (or set SUPABASE_KEY env var)")
+    parser.add_argument("--karma-store", type=str, default=KARMA_STORE_PATH,
+                        help="Local karma store read before Supabase (see karma_store.py)")
 
     args = parser.parse_args()
 
     supabase_url = args.supabase_url or os.environ.get("SUPABASE_URL")
     supabase_key = args.supabase_key or os.environ.get("SUPABASE_KEY")
 
-    if not supabase_url or not supabase_key:
-        print("⚠️  Supabase credentials required for discovery.")
+    if (not supabase_url or not supabase_key) and not os.path.exists(args.karma_store):
+        print("⚠️  Supabase credentials or a local karma store required for discovery.")
         print("   Set SUPABASE_URL and SUPABASE_KEY environment variables.")
         return 1
 
-    discoverer = PlayerDiscovery(supabase_url, supabase_key)
+    discoverer = PlayerDiscovery(supabase_url, supabase_key, args.karma_store)
     discoverer.load_data(args.games_file, args.handle_map)
     discoverer.run_all_strategies()
     discoverer.save_results()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Local copy of the Supabase karma_rankings table.
+
+khscrape.py writes every day it saves here, and discover-player-ids.py,
+match-s6-karma.py and s6_reconstruction.py read it before asking Supabase,
+storing whatever they do fetch. Reruns of the matching pipeline then need no
+remote karma fetches at all.
+
+One SQLite file, one row per (scrape_date, user_id), plus a karma_day row
+per stored date recording when it was stored and whether it is complete.
+Only khscrape.py stores complete days: every page fetched, as its
+checkpoint records. Supabase may be read mid-scrape, so what the matching
+scripts fetch is stored as incomplete. A day is fresh if it is complete and
+was stored two or more days after its date (the leaderboard is final by
+then), or if it was stored within the last max_age_hours.
+
+khscrape.py loads this file to write the store, so the schema lives here only.
+
+Usage:
+    python karma_store.py [--path karma_rankings.db]   # list stored days
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+KARMA_STORE_PATH = os.environ.get("KARMA_STORE_PATH") or os.path.join(SCRIPT_DIR, "karma_rankings.db")
+KARMA_MAX_AGE_HOURS = 6  # Unfinished days older than this are fetched again
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS karma_rankings (
+    scrape_date TEXT,
+    user_id,                -- untyped: kept exactly as Supabase returns it
+    username TEXT,
+    amount,
+    rank INTEGER,
+    PRIMARY KEY (scrape_date, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS karma_day (
+    scrape_date TEXT PRIMARY KEY,
+    entry_count INTEGER,
+    stored_at TEXT,         -- UTC, datetime('now')
+    complete INTEGER NOT NULL DEFAULT 0  -- every page of the day was fetched
+);
+"""
+
+FRESH_SQL = ("((complete AND stored_at >= datetime(scrape_date, '+2 days'))"
+             " OR stored_at >= datetime('now', ?))")
+
+
+class KarmaStore:
+    """The local karma_rankings store (see module docstring)."""
+
+    def __init__(self, path: str = KARMA_STORE_PATH, max_age_hours: float = KARMA_MAX_AGE_HOURS):
+        self.path = path
+        self.max_age = f"-{max_age_hours} hours"
+        self.con = sqlite3.connect(path)
+        self.con.row_factory = sqlite3.Row
+        self.con.executescript(SCHEMA)
+        if "complete" not in {row[1] for row in self.con.execute("PRAGMA table_info(karma_day)")}:
+            # Stores from before completeness was recorded: assume nothing is
+            self.con.execute("ALTER TABLE karma_day ADD COLUMN complete INTEGER NOT NULL DEFAULT 0")
+
+    def fresh_dates(self, dates: Iterable[str]) -> List[str]:
+        """The given dates that are stored and fresh."""
+        dates = sorted(set(dates))
+        if not dates:
+            return []
+        marks = ",".join("?" * len(dates))
+        return [row[0] for row in self.con.execute(
+            f"SELECT scrape_date FROM karma_day WHERE scrape_date IN ({marks}) AND {FRESH_SQL}",
+            (*dates, self.max_age))]
+
+    def load_day(self, date_str: str) -> Optional[List[dict]]:
+        """The day's entries ordered by rank, or None if not stored or not fresh."""
+        return self.load_days([date_str]).get(date_str)
+
+    def load_days(self, dates: Iterable[str]) -> Dict[str, List[dict]]:
+        """date -> entries ordered by rank, for the given dates that are fresh."""
+        days = {date_str: [] for date_str in self.fresh_dates(dates)}
+        if not days:
+            return days
+        marks = ",".join("?" * len(days))
+        for row in self.con.execute(
+                f"SELECT scrape_date, user_id, username, amount, rank FROM karma_rankings "
+                f"WHERE scrape_date IN ({marks}) ORDER BY scrape_date, rank", tuple(days)):
+            days[row["scrape_date"]].append({
+                "user_id": row["user_id"],
+                "username": row["username"],
+                "amount": row["amount"],
+                "rank": row["rank"],
+            })
+        return days
+
+    def save_day(self, date_str: str, entries: List[dict], complete: bool = False):
+        """
+        Replace the stored entries for a day (dicts with user_id, username,
+        amount, rank). complete only if they are every entry the day has.
+        """
+        with self.con:
+            self.con.execute("DELETE FROM karma_rankings WHERE scrape_date = ?", (date_str,))
+            self.con.executemany(
+                "INSERT OR REPLACE INTO karma_rankings VALUES (?, ?, ?, ?, ?)",
+                [(date_str, e["user_id"], e.get("username"), e.get("amount"), e.get("rank")) for e in entries])
+            self.con.execute(
+                "INSERT OR REPLACE INTO karma_day VALUES (?, ?, datetime('now'), ?)",
+                (date_str, len(entries), int(complete)))
+
+    def close(self):
+        self.con.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List the days in the local karma store")
+    parser.add_argument("--path", default=KARMA_STORE_PATH, help="Karma store file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ No karma store at {args.path}")
+        return 1
+
+    store = KarmaStore(args.path)
+    rows = store.con.execute(
+        f"SELECT scrape_date, entry_count, stored_at, complete, {FRESH_SQL} AS fresh "
+        f"FROM karma_day ORDER BY scrape_date",
+        (store.max_age,)).fetchall()
+    for row in rows:
+        print(f"  {row['scrape_date']}: {row['entry_count']:>5} entries, stored {row['stored_at']}"
+              f"{'' if row['complete'] else '  (incomplete)'}{'' if row['fresh'] else '  (stale)'}")
+    print(f"\n{len(rows)} day(s) in {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
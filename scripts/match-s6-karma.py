@@ -22,6 +22,8 @@ from datetime import datetime
 from collections import defaultdict
 from typing import Optional, Dict, List, Tuple, Set
 
+from karma_store import KARMA_STORE_PATH, KarmaStore
+
 # Try to import supabase - graceful fallback if not installed
 try:
     from supabase import create_client, Client
@@ -94,10 +96,12 @@ class KarmaMatcher:
     """Main class for matching S6 game data with karma scores."""
 
     def __init__(self, supabase_url: str = None, supabase_key: str = None,
-                 rank_tolerance: int = DEFAULT_RANK_TOLERANCE, dry_run: bool = False):
+                 rank_tolerance: int = DEFAULT_RANK_TOLERANCE, dry_run: bool = False,
+                 karma_store_path: Optional[str] = KARMA_STORE_PATH):
         self.rank_tolerance = rank_tolerance
         self.dry_run = dry_run
         self.supabase: Optional[Client] = None
+        self.karma_store = KarmaStore(karma_store_path) if karma_store_path else None
 
         # Data structures
         self.games: List[dict] = []
@@ -144,25 +148,31 @@ class KarmaMatcher:
 
     def fetch_karma_for_date(self, date_str: str) -> Dict[str, dict]:
         """
-        Fetch all karma rankings for a specific date from Supabase.
+        Fetch all karma rankings for a specific date, from the local karma
+        store if it has the date fresh, otherwise from Supabase.
         Returns dict: user_id -> {amount, rank, username}
         """
         if date_str in self.karma_cache:
             return self.karma_cache[date_str]
 
-        if not self.supabase:
+        entries = self.karma_store.load_day(date_str) if self.karma_store else None
+        if entries is None and not self.supabase:
             print(f"⚠️  No Supabase connection, skipping fetch for {date_str}")
             return {}
 
         try:
-            # Fetch all entries for this date
-            response = self.supabase.table("karma_rankings") \
-                .select("user_id, username, amount, rank") \
-                .eq("scrape_date", date_str) \
-                .execute()
+            if entries is None:
+                # Fetch all entries for this date
+                response = self.supabase.table("karma_rankings") \
+                    .select("user_id, username, amount, rank") \
+                    .eq("scrape_date", date_str) \
+                    .execute()
+                entries = response.data
+                if self.karma_store and entries:
+                    self.karma_store.save_day(date_str, entries)
 
             karma_map = {}
-            for entry in response.data:
+            for entry in entries:
                 karma_map[entry["user_id"]] = {
                     "amount": entry["amount"],
                     "rank": entry["rank"],
@@ -572,6 +582,8 @@ def main():
                         help="Supabase URL (or set SUPABASE_URL env var)")
     parser.add_argument("--supabase-key", type=str,
                         help="Supabase API key (or set SUPABASE_KEY env var)")
+    parser.add_argument("--karma-store", type=str, default=KARMA_STORE_PATH,
+                        help="Local karma store read before Supabase (see karma_store.py)")
 
     args = parser.parse_args()
 
@@ -583,7 +595,7 @@ def main():
         print("⚠️  Supabase credentials not provided.")
         print("   Set SUPABASE_URL and SUPABASE_KEY environment variables,")
         print("   or pass --supabase-url and --supabase-key arguments.")
-        print("\n   Running in offline mode (no karma matching)...")
+        print("\n   Running in offline mode (karma from the local store only)...")
 
     print("=" * 60)
     print("🎮 S6 KARMA MATCHING SCRIPT")
@@ -596,7 +608,8 @@ def main():
         supabase_url=supabase_url,
         supabase_key=supabase_key,
         rank_tolerance=args.rank_tolerance,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        karma_store_path=args.karma_store
     )
 
     # Load data
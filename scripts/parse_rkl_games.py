@@ -14,76 +14,50 @@ Filters OUT:
 - Leaderboard posts, rankings posts
 
 Usage:
-    python parse_rkl_games.py [--sql-path ../rkl_comments.sql] [--output-dir ./output]
+    python parse_rkl_games.py [--sql-path ../rkl_comments.sql] [--output-dir ./output] [--workers 4]
+    python parse_rkl_games.py --incremental   # re-extract only threads changed since last run
+    python parse_rkl_games.py --link-mode optimal   # min-cost result/lineup assignment
+    python parse_rkl_games.py --columnar parquet    # also write parsed_*.parquet (or arrow / sqlite)
+    python parse_rkl_games.py --db ../rkl.db        # also load games into the review app's database
 """
 
 import re
 import json
 import csv
 import argparse
+import hashlib
+import heapq
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from typing import Optional
+import sqlite3
+import typing
+from typing import Iterable, Iterator, Optional
 from collections import defaultdict
 from zoneinfo import ZoneInfo
+import sys
+
+# Shared extraction code lives in rkl_extract/ at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from rkl_extract import (  # noqa: E402
+    detect_captains, detect_content_type, detect_postseason_info, extract_game_result,
+    extract_mentions_by_team, guess_teams, init_review_schema, parse_score, rebuild_team_aliases,
+)
+from rkl_extract.patterns import MENTION_RE, VS_ANY_RE  # noqa: E402
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 EASTERN = ZoneInfo("America/New_York")
 
 # ============================================================================
-# REGEX PATTERNS (adapted from app.py with enhancements)
+# REGEX PATTERNS (shared tables live in rkl_extract.patterns)
 # ============================================================================
 
-# Core patterns
-MENTION_RE = re.compile(r"@([A-Za-z0-9._]+)")
-VS_ANY_RE = re.compile(r"\bvs\.?\b", re.IGNORECASE)
-STANDALONE_VS_RE = re.compile(r"^\s*vs\.?\s*$", re.IGNORECASE)
-
-# Score patterns
-SCORE_NUM_RE = re.compile(r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b|\b\d{4,6}(?:\.\d+)?\b")
-SCORE_EXTRACT_RE = re.compile(r"([\d,]+(?:\.\d+)?)")
-
-# Team patterns
-TEAM_RECORD_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)")
-# Result line patterns - support optional separator between record and score
-RESULT_LINE_RE = re.compile(r"^(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]?\s*[\d,]+\s*[✅❌]", re.UNICODE)
-RESULT_FULL_RE = re.compile(
-    r"^\s*(?:\((\d+)\)\s*|(\d+)\.\s*)?(.+?)\s*\((\d+)-(\d+)(?:-\d+)?\)\s*[-–:]?\s*([\d,]+(?:\.\d+)?)\s*(.*)$",
-    re.UNICODE
-)
-LEADERBOARD_LINE_RE = re.compile(r"^\d+\.\s*(.+?)\s*\(\d+-\d+(?:-\d+)?\)\s*[-–]\s*[\d,]+", re.UNICODE)
-
-# Content detection
-TOP_SCORES_RE = re.compile(r"top\s+team\s+scores", re.IGNORECASE)
-MEDIAN_RE = re.compile(r"\bmedian\b", re.IGNORECASE)
-WINLOSS_MARK_RE = re.compile(r"[✅❌🏆]|:check_mark_button|:cross_mark")
-LINEUPS_WORD_RE = re.compile(r"\blineups?\b", re.IGNORECASE)
-RECORD_PATTERN_RE = re.compile(r"\(\d+-\d+(?:-\d+)?\)")
-GOTD_RE = re.compile(r"\bGOTD\b", re.IGNORECASE)
-SEPARATOR_RE = re.compile(r"^[-–—~]{3,}$")
-
-# Captain detection
-CAPTAIN_EXPLICIT_RE = re.compile(r"@([A-Za-z0-9._]+)\s*\([cC]\)")
-CAPTAIN_PLAIN_C_RE = re.compile(r"@([A-Za-z0-9._]+)\s+[cC](?:\s|$)")
-MENTION_WITH_TRAIL_RE = re.compile(r"@([A-Za-z0-9._]+)(.*?)(?=@[A-Za-z0-9._]+|$)", re.DOTALL)
-REALAPP_EMOJI_RE = re.compile(r":[a-z_0-9]+")
-
-# Postseason patterns
-ROUND_NAME_RE = re.compile(
-    r"(RKL\s+Finals?|Finals?|Semi\s*-?\s*Finals?|Quarter\s*-?\s*Finals?|"
-    r"Round\s+\d+|Playoffs?\s+Round\s+\d+|Wild\s*Card|Game\s+\d+)",
-    re.IGNORECASE
-)
-SEED_TEAM_RE = re.compile(r"^\s*(?:\((\d+)\)|(\d+)\.?\s+)(.+?)(?:\s*\(\d+-\d+\))?\s*$")
-
-# Win/loss detection - includes (W)/(L) text markers
-WIN_INDICATOR_RE = re.compile(r"(✅+|:check_mark_button|🏆|\(W\))")
-LOSS_INDICATOR_RE = re.compile(r"(❌|:cross_mark|\(L\))")
-
-# Adjustment patterns
-ADJUSTMENT_LINE_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9\s]+?)\s+([+-]?\d[\d,]*(?:\.\d+)?)\s*$")
-ADJUSTMENT_HEADER_RE = re.compile(r"(advent\s+deduction|deduction|adjustment|penalty|bonus)", re.IGNORECASE)
-
 # Individual player stats: @handle (score, rankth) or @handle (score*1.5, rankth)
 PLAYER_STATS_RE = re.compile(
     r"@([A-Za-z0-9._]+)\s*\((\d{1,3}(?:,\d{3})*(?:\.\d+)?)"
@@ -231,6 +205,9 @@ class CompleteGame:
 
 class CommentRecord:
     """Represents a parsed comment record from SQL."""
+    __slots__ = ("comment_id", "group_id", "source", "created_at_ts", "reply_count",
+                 "depth", "parent_comment_id", "thread_root_id", "plain_text")
+
     def __init__(self, comment_id: int, group_id: int, source: str, created_at_ts: str,
                  reply_count: int, depth: int, parent_comment_id: Optional[int],
                  thread_root_id: int, plain_text: str):
@@ -245,71 +222,114 @@ class CommentRecord:
         self.plain_text = plain_text
 
 
-def parse_sql_dump(sql_path: Path, progress_callback=None) -> list[CommentRecord]:
-    """Parse the PostgreSQL dump and extract comment records."""
-    comments = []
-
-    # Pattern to match INSERT statements
-    insert_pattern = re.compile(
-        r"INSERT INTO rkl_comments.*?VALUES\s*\("
-        r"(\d+),"           # comment_id
-        r"(\d+),"           # group_id
-        r"'([^']*)',"       # source
-        r"'([^']*)',"       # created_at_ts
-        r"'[^']*',"         # created_at_text (skip)
-        r"([^,]*),"         # pin_priority
-        r"(\d+|NULL),"      # reply_count
-        r"(\d+),"           # depth
-        r"(\d+|NULL),"      # parent_comment_id
-        r"(\d+|NULL),"      # replying_to_comment_id (skip)
-        r"(\d+|NULL),"      # reply_num (skip)
-        r"(\d+|NULL),"      # user_id (skip)
-        r"(\d+),"           # thread_root_id
-        r"'((?:[^']|'')*)'", # plain_text (handle escaped quotes)
-        re.DOTALL
-    )
+# Pattern to match a single rkl_comments INSERT statement
+INSERT_PATTERN_RE = re.compile(
+    r"INSERT INTO rkl_comments.*?VALUES\s*\("
+    r"(\d+),"           # comment_id
+    r"(\d+),"           # group_id
+    r"'([^']*)',"       # source
+    r"'([^']*)',"       # created_at_ts
+    r"'[^']*',"         # created_at_text (skip)
+    r"([^,]*),"         # pin_priority
+    r"(\d+|NULL),"      # reply_count
+    r"(\d+),"           # depth
+    r"(\d+|NULL),"      # parent_comment_id
+    r"(\d+|NULL),"      # replying_to_comment_id (skip)
+    r"(\d+|NULL),"      # reply_num (skip)
+    r"(\d+|NULL),"      # user_id (skip)
+    r"(\d+),"           # thread_root_id
+    r"'((?:[^']|'')*)'", # plain_text (handle escaped quotes)
+    re.DOTALL
+)
 
-    print(f"Reading SQL dump from {sql_path}...")
+INSERT_PREFIX = b"INSERT INTO rkl_comments"
 
-    with open(sql_path, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    print(f"Parsing {len(content):,} bytes...")
+def iter_sql_statements(f) -> Iterator[str]:
+    """Yield complete rkl_comments INSERT statements from a binary dump stream.
 
-    # Find all INSERT statements
-    matches = insert_pattern.findall(content)
+    Reads line by line and tracks single-quote parity so a statement only ends
+    at a ';' outside a string literal. Escaped quotes ('') add two to the count,
+    so parity stays correct even when a literal (or an escape) spans lines.
+    Only the statement currently being assembled is held in memory.
+    """
+    parts = []
+    in_statement = False
+    keep = False
+    quotes = 0
+
+    for raw in f:
+        if not in_statement:
+            head = raw.lstrip()
+            if not head or head.startswith(b"--"):
+                continue
+            in_statement = True
+            keep = head.startswith(INSERT_PREFIX)
+            quotes = 0
 
-    for i, m in enumerate(matches):
-        if progress_callback and i % 10000 == 0:
-            progress_callback(i, len(matches))
+        quotes += raw.count(b"'")
+        if keep:
+            parts.append(raw)
 
-        try:
-            comment_id = int(m[0])
-            group_id = int(m[1])
-            source = m[2]
-            created_at_ts = m[3]
-            reply_count = int(m[5]) if m[5] != 'NULL' else 0
-            depth = int(m[6])
-            parent_comment_id = int(m[7]) if m[7] != 'NULL' else None
-            thread_root_id = int(m[11])
-            plain_text = m[12].replace("''", "'")  # Unescape SQL quotes
-
-            comments.append(CommentRecord(
-                comment_id=comment_id,
-                group_id=group_id,
-                source=source,
-                created_at_ts=created_at_ts,
-                reply_count=reply_count,
-                depth=depth,
-                parent_comment_id=parent_comment_id,
-                thread_root_id=thread_root_id,
-                plain_text=plain_text
-            ))
-        except (ValueError, IndexError) as e:
-            continue  # Skip malformed records
+        if quotes % 2 == 0 and raw.rstrip().endswith(b";"):
+            if keep:
+                yield b"".join(parts).decode("utf-8")
+                parts = []
+            in_statement = False
+
+    # Unterminated trailing statement (truncated dump) - try it anyway
+    if in_statement and keep and parts:
+        yield b"".join(parts).decode("utf-8", errors="replace")
 
-    print(f"Parsed {len(comments):,} comments")
-    return comments
+
+def parse_insert_statement(statement: str) -> Optional[CommentRecord]:
+    """Parse one INSERT statement into a CommentRecord, or None if malformed."""
+    m = INSERT_PATTERN_RE.match(statement)
+    if not m:
+        return None
+
+    try:
+        return CommentRecord(
+            comment_id=int(m.group(1)),
+            group_id=int(m.group(2)),
+            source=m.group(3),
+            created_at_ts=m.group(4),
+            reply_count=int(m.group(6)) if m.group(6) != 'NULL' else 0,
+            depth=int(m.group(7)),
+            parent_comment_id=int(m.group(8)) if m.group(8) != 'NULL' else None,
+            thread_root_id=int(m.group(12)),
+            plain_text=m.group(13).replace("''", "'")  # Unescape SQL quotes
+        )
+    except (ValueError, IndexError):
+        return None  # Skip malformed records
+
+
+def iter_sql_dump(sql_path: Path, progress_callback=None) -> Iterator[CommentRecord]:
+    """Stream comment records from the PostgreSQL dump in bounded memory.
+
+    progress_callback, if given, is called every 10,000 records with
+    (bytes_read, total_bytes).
+    """
+    total_bytes = sql_path.stat().st_size
+    print(f"Streaming SQL dump from {sql_path} ({total_bytes:,} bytes)...")
+
+    count = 0
+    with open(sql_path, 'rb') as raw:
+        for statement in iter_sql_statements(raw):
+            record = parse_insert_statement(statement)
+            if record is None:
+                continue
+            count += 1
+            if progress_callback and count % 10000 == 0:
+                progress_callback(raw.tell(), total_bytes)
+            yield record
+
+    print(f"Parsed {count:,} comments")
+
+
+def parse_sql_dump(sql_path: Path, progress_callback=None) -> list[CommentRecord]:
+    """Parse the PostgreSQL dump and extract comment records."""
+    return list(iter_sql_dump(sql_path, progress_callback))
 
 
 # ============================================================================
@@ -328,390 +348,10 @@ def parse_timestamp_to_date(ts_str: str) -> Optional[str]:
         return None
 
 
-def parse_score(score_str: str) -> Optional[float]:
-    """Parse a score string like '34,565' to float."""
-    if not score_str:
-        return None
-    try:
-        return float(score_str.replace(",", ""))
-    except ValueError:
-        return None
-
-
-def clean_team_name(name: str) -> str:
-    """Clean up a team name."""
-    if not name:
-        return ""
-    name = name.strip()
-    name = re.sub(r"^\s*(?:\(\d+\)\s*|\d+\.\s*|\d+\s+)", "", name)
-    name = re.sub(r"\s*\(\d+-\d+(?:-\d+)?\)\s*$", "", name)
-    name = re.sub(r"\s*[-–]\s*[\d,]+\s*[✅❌]?\s*$", "", name)
-    name = re.sub(r"^\d+\.\s*", "", name)
-    name = name.strip(" \t\n-–:•~")
-    return name[:80] if name else ""
-
-
-def is_captain_marker(text_after: str) -> bool:
-    """Check if text following a mention indicates captain status."""
-    if not text_after:
-        return False
-    text = text_after.strip()
-    if re.match(r"^\s*\([cC]\)", text):
-        return True
-    if re.match(r"^\s*[cC](?:\s|$)", text):
-        return True
-    until_next = re.split(r"[@\n]", text)[0]
-    if until_next.strip():
-        cleaned = REALAPP_EMOJI_RE.sub("", until_next).strip()
-        if not cleaned or not any(c.isalnum() for c in cleaned):
-            return True
-    return False
-
-
-# ============================================================================
-# CONTENT TYPE DETECTION
-# ============================================================================
-
-def detect_content_type(text: str) -> str:
-    """Detect if text is a lineup, result, leaderboard, or other."""
-    if not text:
-        return "other"
-
-    # Check for leaderboard first
-    if TOP_SCORES_RE.search(text) or MEDIAN_RE.search(text):
-        return "leaderboard"
-
-    # Count key indicators
-    has_winloss = WINLOSS_MARK_RE.search(text)
-    has_scores = SCORE_NUM_RE.search(text)
-    has_records = RECORD_PATTERN_RE.search(text)
-    has_separator = bool(re.search(r"^[-–—~]{3,}$", text, re.MULTILINE))
-    record_count = len(RECORD_PATTERN_RE.findall(text))
-    mention_count = len(MENTION_RE.findall(text))
-    has_vs = VS_ANY_RE.search(text)
-    has_gotd = GOTD_RE.search(text)
-    has_lineups_word = LINEUPS_WORD_RE.search(text)
-
-    # Result detection - need win/loss markers OR team records with scores
-    if has_winloss and has_scores:
-        return "result"
-    # Two team records with large scores (not lineup mentions) = result
-    if record_count >= 2 and has_scores:
-        # Check for large scores (team scores are typically 30000+)
-        large_scores = re.findall(r"\b\d{2},\d{3}\b|\b[3-9]\d{4}\b", text)
-        if large_scores:
-            return "result"
-    if has_records and has_separator and has_scores:
-        return "result"
-
-    # Lineup detection - GOTD posts or lineup threads with multiple mentions
-    # GOTD posts are lineups even without explicit "vs" word
-    if has_gotd and mention_count >= 4:
-        return "lineup"
-
-    # Standard lineup detection
-    if has_vs and mention_count >= 2:
-        return "lineup"
-
-    # Posts with "Lineups" in header and mentions
-    if has_lineups_word and mention_count >= 2:
-        return "lineup"
-
-    # Posts with team records and multiple mentions (likely lineup)
-    if has_records and mention_count >= 4 and has_separator:
-        return "lineup"
-
-    # Postseason lineups
-    if ROUND_NAME_RE.search(text) and mention_count >= 2 and (has_vs or has_separator):
-        return "lineup"
-
-    # If we have many mentions with separators, likely a lineup
-    if mention_count >= 6 and has_separator:
-        return "lineup"
-
-    return "other"
-
-
 # ============================================================================
 # LINEUP EXTRACTION
 # ============================================================================
 
-def extract_mentions_by_team(text: str) -> tuple[list[str], list[str]]:
-    """Split mentions into Team A and Team B based on vs divider."""
-    if not text:
-        return ([], [])
-
-    lines = text.splitlines()
-
-    # Strategy 1: Find standalone vs line (common in GOTD posts)
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        ln_stripped = ln.strip()
-        # Check for standalone "vs" or "vs." or lines with only separators + vs
-        if STANDALONE_VS_RE.match(ln_stripped):
-            vs_line_idx = i
-            break
-        # Also check for vs surrounded by separator characters
-        if re.match(r"^[-–—~]*\s*vs\.?\s*[-–—~]*$", ln_stripped, re.IGNORECASE):
-            vs_line_idx = i
-            break
-
-    if vs_line_idx is not None:
-        text_before = "\n".join(lines[:vs_line_idx])
-        text_after = "\n".join(lines[vs_line_idx + 1:])
-        mentions_a = MENTION_RE.findall(text_before)
-        mentions_b = MENTION_RE.findall(text_after)
-        if mentions_a or mentions_b:
-            return (mentions_a, mentions_b)
-
-    # Strategy 2: Look for separator lines (------) as team dividers
-    separator_indices = [i for i, ln in enumerate(lines) if SEPARATOR_RE.match(ln.strip())]
-    if len(separator_indices) >= 2:
-        # Take the middle separator as divider
-        mid_idx = separator_indices[len(separator_indices) // 2]
-        text_before = "\n".join(lines[:mid_idx])
-        text_after = "\n".join(lines[mid_idx + 1:])
-        mentions_a = MENTION_RE.findall(text_before)
-        mentions_b = MENTION_RE.findall(text_after)
-        if mentions_a and mentions_b:
-            return (mentions_a, mentions_b)
-
-    # Strategy 3: Look for team name patterns as dividers
-    # Pattern: "TeamName (W-L)" on its own line
-    team_header_indices = []
-    for i, ln in enumerate(lines):
-        ln_stripped = ln.strip()
-        # Skip lines that are mentions
-        if ln_stripped.startswith("@"):
-            continue
-        # Check for team name with record
-        if TEAM_RECORD_RE.match(ln_stripped):
-            team_header_indices.append(i)
-
-    if len(team_header_indices) >= 2:
-        # Split between first and second team header
-        first_team_idx = team_header_indices[0]
-        second_team_idx = team_header_indices[1]
-        text_before = "\n".join(lines[first_team_idx:second_team_idx])
-        text_after = "\n".join(lines[second_team_idx:])
-        mentions_a = MENTION_RE.findall(text_before)
-        mentions_b = MENTION_RE.findall(text_after)
-        if mentions_a or mentions_b:
-            return (mentions_a, mentions_b)
-
-    # Strategy 4: Inline vs split
-    for ln in lines:
-        if VS_ANY_RE.search(ln):
-            parts = re.split(r"\bvs\.?\b", ln, maxsplit=1, flags=re.IGNORECASE)
-            if len(parts) == 2:
-                mentions_a = MENTION_RE.findall(parts[0])
-                mentions_b = MENTION_RE.findall(parts[1])
-                if mentions_a or mentions_b:
-                    return (mentions_a, mentions_b)
-
-    return ([], [])
-
-
-def detect_captains(text: str) -> tuple[Optional[str], Optional[str], list[str]]:
-    """Detect captain candidates from text."""
-    if not text:
-        return (None, None, [])
-
-    lines = text.splitlines()
-
-    explicit = CAPTAIN_EXPLICIT_RE.findall(text)
-    plain_c = CAPTAIN_PLAIN_C_RE.findall(text)
-
-    implicit = []
-    for m in MENTION_WITH_TRAIL_RE.finditer(text):
-        username = m.group(1)
-        trailing = m.group(2)
-        if username not in explicit and username not in plain_c and is_captain_marker(trailing):
-            implicit.append(username)
-
-    all_candidates = list(dict.fromkeys(explicit + plain_c + implicit))
-
-    # Try to assign to teams by vs split
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-
-    captain_a, captain_b = None, None
-
-    if vs_line_idx is not None:
-        text_before = "\n".join(lines[:vs_line_idx])
-        text_after = "\n".join(lines[vs_line_idx + 1:])
-
-        for cap in all_candidates:
-            pattern = rf"@{re.escape(cap)}"
-            if re.search(pattern, text_before) and captain_a is None:
-                captain_a = cap
-            elif re.search(pattern, text_after) and captain_b is None:
-                captain_b = cap
-    else:
-        if len(all_candidates) >= 1:
-            captain_a = all_candidates[0]
-        if len(all_candidates) >= 2:
-            captain_b = all_candidates[1]
-
-    return (captain_a, captain_b, all_candidates)
-
-
-def guess_teams(text: str) -> tuple[Optional[str], Optional[str]]:
-    """Extract team names from text."""
-    if not text:
-        return (None, None)
-
-    lines = text.splitlines()
-
-    # Strategy 1: Result format - "Team (W-L) - score ✅"
-    result_teams = []
-    for ln in lines:
-        m = RESULT_LINE_RE.match(ln.strip())
-        if m:
-            team = clean_team_name(m.group(1))
-            if team:
-                result_teams.append(team)
-        if len(result_teams) >= 2:
-            break
-    if len(result_teams) >= 2:
-        return (result_teams[0], result_teams[1])
-
-    # Strategy 2: Team record format - "Team (W-L)" on its own line
-    # Common in GOTD posts
-    team_record_teams = []
-    for ln in lines:
-        ln_stripped = ln.strip()
-        # Skip lines that start with @, are separators, or are too long
-        if ln_stripped.startswith("@") or SEPARATOR_RE.match(ln_stripped) or len(ln_stripped) > 50:
-            continue
-        m = TEAM_RECORD_RE.match(ln_stripped)
-        if m:
-            team = clean_team_name(m.group(1))
-            if team and len(team) > 1:
-                team_record_teams.append(team)
-        if len(team_record_teams) >= 2:
-            break
-    if len(team_record_teams) >= 2:
-        return (team_record_teams[0], team_record_teams[1])
-
-    # Strategy 3: Leaderboard format
-    lb_teams = []
-    for ln in lines:
-        m = LEADERBOARD_LINE_RE.match(ln.strip())
-        if m:
-            team = clean_team_name(m.group(1))
-            if team:
-                lb_teams.append(team)
-        if len(lb_teams) >= 2:
-            break
-    if len(lb_teams) >= 2:
-        return (lb_teams[0], lb_teams[1])
-
-    # Strategy 4: Multi-line with vs or separator divider
-    # Find the divider line
-    divider_idx = None
-    for i, ln in enumerate(lines):
-        ln_stripped = ln.strip()
-        if STANDALONE_VS_RE.match(ln_stripped):
-            divider_idx = i
-            break
-        # Also check for vs surrounded by separators
-        if re.match(r"^[-–—~]*\s*vs\.?\s*[-–—~]*$", ln_stripped, re.IGNORECASE):
-            divider_idx = i
-            break
-
-    # If no vs found, look for separator pattern (separators around "vs" or between teams)
-    if divider_idx is None:
-        separator_indices = [i for i, ln in enumerate(lines) if SEPARATOR_RE.match(ln.strip())]
-        if len(separator_indices) >= 2:
-            # Use middle separator as divider
-            divider_idx = separator_indices[len(separator_indices) // 2]
-
-    if divider_idx is not None:
-        team_a, team_b = None, None
-
-        # Search backward for team A
-        for i in range(divider_idx - 1, max(0, divider_idx - 15) - 1, -1):
-            ln = lines[i].strip()
-            if not ln or ln.startswith("@"):
-                continue
-            if SEPARATOR_RE.match(ln):
-                continue
-            m = TEAM_RECORD_RE.match(ln)
-            if m:
-                team_a = clean_team_name(m.group(1))
-                break
-            elif len(ln) < 50:
-                team_a = clean_team_name(ln)
-                break
-
-        # Search forward for team B
-        for i in range(divider_idx + 1, min(len(lines), divider_idx + 15)):
-            ln = lines[i].strip()
-            if not ln or ln.startswith("@"):
-                continue
-            if SEPARATOR_RE.match(ln):
-                continue
-            m = TEAM_RECORD_RE.match(ln)
-            if m:
-                team_b = clean_team_name(m.group(1))
-                break
-            elif len(ln) < 50:
-                team_b = clean_team_name(ln)
-                break
-
-        if team_a or team_b:
-            return (team_a, team_b)
-
-    return (None, None)
-
-
-def detect_postseason_info(text: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
-    """Detect postseason round name and seeds."""
-    if not text:
-        return (None, None, None)
-
-    lines = text.splitlines()
-    round_name = None
-    seed_a, seed_b = None, None
-
-    for ln in lines[:5]:
-        m = ROUND_NAME_RE.search(ln.strip())
-        if m:
-            round_name = ln.strip()
-            break
-
-    vs_line_idx = None
-    for i, ln in enumerate(lines):
-        if STANDALONE_VS_RE.match(ln):
-            vs_line_idx = i
-            break
-
-    if vs_line_idx is not None:
-        for i in range(vs_line_idx - 1, max(0, vs_line_idx - 10) - 1, -1):
-            ln = lines[i].strip()
-            if ln.startswith("@"):
-                continue
-            m = SEED_TEAM_RE.match(ln)
-            if m:
-                seed_a = m.group(1) or m.group(2)
-                break
-
-        for i in range(vs_line_idx + 1, min(len(lines), vs_line_idx + 10)):
-            ln = lines[i].strip()
-            if ln.startswith("@"):
-                continue
-            m = SEED_TEAM_RE.match(ln)
-            if m:
-                seed_b = m.group(1) or m.group(2)
-                break
-
-    return (round_name, seed_a, seed_b)
-
-
 def extract_lineup(comment: CommentRecord, thread_text: str = "") -> Optional[GameLineup]:
     """Extract lineup data from a comment."""
     text = comment.plain_text
@@ -762,42 +402,6 @@ def extract_lineup(comment: CommentRecord, thread_text: str = "") -> Optional[Ga
 # RESULT EXTRACTION
 # ============================================================================
 
-def detect_winner(line: str) -> Optional[str]:
-    """Detect if a line indicates a win or loss."""
-    if WIN_INDICATOR_RE.search(line):
-        return "win"
-    if LOSS_INDICATOR_RE.search(line):
-        return "loss"
-    return None
-
-
-def parse_result_line(line: str) -> Optional[dict]:
-    """Parse a single result line."""
-    line = line.strip()
-    if not line:
-        return None
-
-    m = RESULT_FULL_RE.match(line)
-    if m:
-        seed = m.group(1) or m.group(2)
-        team = m.group(3).strip()
-        team = re.sub(r"^\d+\.\s*", "", team).strip()
-        record_w = int(m.group(4))
-        record_l = int(m.group(5))
-        score_str = m.group(6)
-        trailing = m.group(7) or ""
-
-        return {
-            "team": team,
-            "record_w": record_w,
-            "record_l": record_l,
-            "score": parse_score(score_str),
-            "seed": seed,
-            "winner": detect_winner(trailing),
-        }
-    return None
-
-
 def extract_player_stats(text: str, team_a: str, team_b: str) -> list[PlayerStat]:
     """Extract individual player statistics from result text."""
     stats = []
@@ -830,96 +434,6 @@ def extract_player_stats(text: str, team_a: str, team_b: str) -> list[PlayerStat
     return stats
 
 
-def extract_game_result_data(text: str) -> Optional[dict]:
-    """Extract game result data from text."""
-    if not text:
-        return None
-
-    lines = text.splitlines()
-    result_lines = []
-    adjustments = []
-    in_adj_section = False
-    round_name = None
-
-    for ln in lines:
-        ln_stripped = ln.strip()
-
-        if len(result_lines) == 0 and not round_name:
-            m = ROUND_NAME_RE.search(ln_stripped)
-            if m:
-                round_name = ln_stripped
-                continue
-
-        if SEPARATOR_RE.match(ln_stripped):
-            continue
-
-        if ADJUSTMENT_HEADER_RE.search(ln_stripped):
-            in_adj_section = True
-            continue
-
-        parsed = parse_result_line(ln_stripped)
-        if parsed:
-            result_lines.append(parsed)
-            continue
-
-        if in_adj_section or len(result_lines) >= 2:
-            adj_m = ADJUSTMENT_LINE_RE.match(ln_stripped)
-            if adj_m:
-                team = adj_m.group(1).strip()
-                adj_str = adj_m.group(2).replace(",", "")
-                try:
-                    adjustments.append({"team": team, "adjustment": float(adj_str)})
-                except ValueError:
-                    pass
-
-    if len(result_lines) < 2:
-        return None
-
-    team_a_data = result_lines[0]
-    team_b_data = result_lines[1]
-
-    # Determine winner
-    winner = None
-    if team_a_data.get("winner") == "win":
-        winner = "A"
-    elif team_b_data.get("winner") == "win":
-        winner = "B"
-    elif team_a_data.get("winner") == "loss":
-        winner = "B"
-    elif team_b_data.get("winner") == "loss":
-        winner = "A"
-    elif team_a_data.get("score") and team_b_data.get("score"):
-        if team_a_data["score"] > team_b_data["score"]:
-            winner = "A"
-        elif team_b_data["score"] > team_a_data["score"]:
-            winner = "B"
-
-    # Match adjustments
-    adj_a, adj_b = None, None
-    ta_lower = team_a_data["team"].lower()
-    tb_lower = team_b_data["team"].lower()
-
-    for adj in adjustments:
-        adj_team = adj["team"].lower()
-        if adj_team in ta_lower or ta_lower in adj_team:
-            adj_a = adj["adjustment"]
-        elif adj_team in tb_lower or tb_lower in adj_team:
-            adj_b = adj["adjustment"]
-
-    return {
-        "team_a": team_a_data["team"],
-        "team_b": team_b_data["team"],
-        "score_a": team_a_data.get("score"),
-        "score_b": team_b_data.get("score"),
-        "seed_a": team_a_data.get("seed"),
-        "seed_b": team_b_data.get("seed"),
-        "winner": winner,
-        "adjustment_a": adj_a,
-        "adjustment_b": adj_b,
-        "round_name": round_name,
-    }
-
-
 def extract_result(comment: CommentRecord, thread_text: str = "") -> Optional[GameResult]:
     """Extract result data from a comment."""
     text = comment.plain_text
@@ -934,7 +448,7 @@ def extract_result(comment: CommentRecord, thread_text: str = "") -> Optional[Ga
     if content_type != "result":
         return None
 
-    result_data = extract_game_result_data(text)
+    result_data = extract_game_result(text)
     if not result_data:
         return None
 
@@ -1015,28 +529,78 @@ def fuzzy_team_match(name1: str, name2: str) -> bool:
     return False
 
 
-def link_results_to_lineups(lineups: list[GameLineup], results: list[GameResult]) -> list[CompleteGame]:
-    """Link results to their corresponding lineups and create complete games."""
-    games = []
-    used_lineup_ids = set()
-    game_id = 1
+class LineupIndex:
+    """Date-bucketed lookup tables for linking results to lineups.
 
-    # Index lineups by date for faster lookup
-    lineups_by_date = defaultdict(list)
-    for lu in lineups:
-        lineups_by_date[lu.game_date].append(lu)
+    Team names are normalized (and stripped to alphanumerics) once per lineup
+    instead of once per comparison, and every lookup is restricted to the
+    date buckets a match could come from, so linking cost grows with the
+    number of games per week rather than with the size of the season.
+    """
+
+    def __init__(self, lineups: list[GameLineup]):
+        self.by_date = defaultdict(list)           # game_date -> [(pos, lineup, norm_a, norm_b)]
+        self.by_team_key_date = defaultdict(dict)  # team_key -> game_date -> [(pos, lineup)]
+        self.team_key_order = {}                   # team_key -> first-seen ordinal
+        self._cleaned = {}                         # normalized name -> alphanumeric-only name
+
+        for pos, lu in enumerate(lineups):
+            norm_a = normalize_team_name(lu.team_a)
+            norm_b = normalize_team_name(lu.team_b)
+            self.by_date[lu.game_date].append((pos, lu, norm_a, norm_b))
+            if norm_a and norm_b:
+                # Store in canonical order
+                team_key = tuple(sorted([norm_a, norm_b]))
+                self.team_key_order.setdefault(team_key, len(self.team_key_order))
+                self.by_team_key_date[team_key].setdefault(lu.game_date, []).append((pos, lu))
+
+    def cleaned(self, name: str) -> str:
+        """Alphanumeric-only form of a normalized name (cached)."""
+        cleaned = self._cleaned.get(name)
+        if cleaned is None:
+            cleaned = self._cleaned[name] = re.sub(r"[^a-z0-9]", "", name)
+        return cleaned
+
+    def names_match(self, n1: str, n2: str) -> bool:
+        """fuzzy_team_match for already-normalized names."""
+        if not n1 or not n2:
+            return False
+        if n1 == n2 or n1 in n2 or n2 in n1:
+            return True
+        return self.cleaned(n1) == self.cleaned(n2)
+
+
+def _nearby_dates(game_date: str, days: int) -> list[str]:
+    """All YYYY-MM-DD dates within +/- days of game_date (empty if unparseable)."""
+    if not game_date:
+        return []
+    try:
+        d = datetime.fromisoformat(game_date)
+    except ValueError:
+        return []
+    return [(d + timedelta(days=offset)).date().isoformat() for offset in range(-days, days + 1)]
+
+
+def pair_results_with_lineups(lineups: list[GameLineup], results: list[GameResult],
+                              used_lineup_ids: set = None) -> dict[int, GameLineup]:
+    """Greedily pair results with lineups.
+
+    Returns a dict of result index -> matched lineup. Lineups whose comment_id
+    is in used_lineup_ids are never claimed (the set is updated in place).
+    """
+    pairs = {}
+    if used_lineup_ids is None:
+        used_lineup_ids = set()
+
+    index = LineupIndex(lineups)
+
+    def fuzzy(s1: str, s2: str) -> bool:
+        return bool(s1) and bool(s2) and (s1 in s2 or s2 in s1)
+
+    for idx, result in enumerate(results):
+        ra = normalize_team_name(result.team_a)
+        rb = normalize_team_name(result.team_b)
 
-    # Also index by team names for broader matching
-    lineups_by_teams = defaultdict(list)
-    for lu in lineups:
-        key_a = normalize_team_name(lu.team_a)
-        key_b = normalize_team_name(lu.team_b)
-        if key_a and key_b:
-            # Store in canonical order
-            team_key = tuple(sorted([key_a, key_b]))
-            lineups_by_teams[team_key].append(lu)
-
-    for result in results:
         # Find matching lineup with expanded date range (same day, 1-3 days before)
         potential_dates = [result.game_date]
         if result.game_date:
@@ -1048,57 +612,252 @@ def link_results_to_lineups(lineups: list[GameLineup], results: list[GameResult]
                 pass
 
         matched_lineup = None
-        best_match_score = 0
 
-        # Strategy 1: Match by date + team names
+        # Strategy 1: Match by date + team names (same rules as teams_match)
         for date in potential_dates:
-            for lu in lineups_by_date.get(date, []):
+            for _, lu, la, lb in index.by_date.get(date, ()):
                 if lu.comment_id in used_lineup_ids:
                     continue
-                if teams_match(lu.team_a, lu.team_b, result.team_a, result.team_b):
+                if ((la == ra and lb == rb) or (la == rb and lb == ra) or
+                        (fuzzy(la, ra) and fuzzy(lb, rb)) or (fuzzy(la, rb) and fuzzy(lb, ra))):
                     matched_lineup = lu
                     break
             if matched_lineup:
                 break
 
-        # Strategy 2: If no date match, try team name matching across all lineups
+        # Strategy 2: If no date match, try team name matching within 7 days
         if not matched_lineup:
-            result_team_key = tuple(sorted([
-                normalize_team_name(result.team_a),
-                normalize_team_name(result.team_b)
-            ]))
-
-            # Look for lineups with same teams, prioritize by date proximity
-            candidate_lineups = lineups_by_teams.get(result_team_key, [])
-
-            if not candidate_lineups:
-                # Try fuzzy team matching
-                for team_key, lus in lineups_by_teams.items():
-                    if (fuzzy_team_match(team_key[0], result_team_key[0]) and
-                        fuzzy_team_match(team_key[1], result_team_key[1])):
-                        candidate_lineups.extend(lus)
-                    elif (fuzzy_team_match(team_key[0], result_team_key[1]) and
-                          fuzzy_team_match(team_key[1], result_team_key[0])):
-                        candidate_lineups.extend(lus)
-
-            for lu in candidate_lineups:
-                if lu.comment_id in used_lineup_ids:
-                    continue
-                # Check date proximity (within 7 days)
-                if lu.game_date and result.game_date:
-                    try:
-                        lu_date = datetime.fromisoformat(lu.game_date)
-                        res_date = datetime.fromisoformat(result.game_date)
-                        days_diff = abs((res_date - lu_date).days)
-                        if days_diff <= 7:
-                            matched_lineup = lu
-                            break
-                    except:
-                        pass
+            result_team_key = tuple(sorted([ra, rb]))
+            nearby = _nearby_dates(result.game_date, 7)
+
+            # Exact team key if those teams ever met, otherwise fuzzy keys;
+            # earliest key first, then lineup order, as a full scan would
+            if result_team_key in index.team_key_order:
+                team_keys = [result_team_key]
+            else:
+                team_keys = {
+                    lu_key
+                    for date in nearby
+                    for _, lu, la, lb in index.by_date.get(date, ())
+                    for lu_key in [tuple(sorted([la, lb]))]
+                    if la and lb and (
+                        (index.names_match(lu_key[0], result_team_key[0]) and
+                         index.names_match(lu_key[1], result_team_key[1])) or
+                        (index.names_match(lu_key[0], result_team_key[1]) and
+                         index.names_match(lu_key[1], result_team_key[0])))
+                }
+
+            candidates = []
+            for team_key in team_keys:
+                key_dates = index.by_team_key_date[team_key]
+                for date in nearby:
+                    for pos, lu in key_dates.get(date, ()):
+                        if lu.comment_id not in used_lineup_ids:
+                            candidates.append((index.team_key_order[team_key], pos, lu))
+            if candidates:
+                matched_lineup = min(candidates, key=lambda c: (c[0], c[1]))[2]
 
         if matched_lineup:
             used_lineup_ids.add(matched_lineup.comment_id)
+            pairs[idx] = matched_lineup
+
+    return pairs
+
+
+# Widest lineup/result date gap the linker will accept (see pair_results_with_lineups)
+LINK_WINDOW_DAYS = 7
+
+# Integer edge costs for assign_results_to_lineups. A result stays unmatched
+# rather than take a lineup whose total cost is UNMATCHED_COST or more.
+COST_PER_DAY_BEFORE = 10      # lineup posted k days before the result's date
+COST_PER_DAY_AFTER = 25       # lineup dated after the result (unusual)
+COST_NAME_CLEANED = 5         # per team name equal only after stripping punctuation
+COST_NAME_SUBSTRING = 15      # per team name matched only as a substring
+COST_POSTSEASON_MISMATCH = 20
+UNMATCHED_COST = 200
+
+
+def _assignment_cost(index: LineupIndex, result: GameResult, ra: str, rb: str,
+                     lu: GameLineup, la: str, lb: str, day_gap: int) -> Optional[int]:
+    """Cost of linking result to lineup, or None if the teams don't match."""
+    def name_cost(n1: str, n2: str) -> Optional[int]:
+        if n1 == n2 and n1:
+            return 0
+        if not index.names_match(n1, n2):
+            return None
+        return COST_NAME_CLEANED if index.cleaned(n1) == index.cleaned(n2) else COST_NAME_SUBSTRING
+
+    best = None
+    for x, y in ((ra, rb), (rb, ra)):
+        cost_a, cost_b = name_cost(la, x), name_cost(lb, y)
+        if cost_a is not None and cost_b is not None and (best is None or cost_a + cost_b < best):
+            best = cost_a + cost_b
+    if best is None:
+        return None
+
+    best += COST_PER_DAY_BEFORE * day_gap if day_gap >= 0 else COST_PER_DAY_AFTER * -day_gap
+    if lu.is_postseason != result.is_postseason:
+        best += COST_POSTSEASON_MISMATCH
+    return best
+
 
+def _min_cost_matching(edges: dict[int, list[tuple[int, int]]]) -> dict[int, int]:
+    """Min-cost matching on one bipartite component via successive shortest paths.
+
+    edges maps result index -> [(lineup pos, cost)]. Each augmentation adds the
+    cheapest extra link (Dijkstra on reduced costs); marginal costs only grow,
+    so it stops once another link would cost UNMATCHED_COST or more.
+    Returns result index -> lineup pos.
+    """
+    SOURCE, SINK = ("s",), ("t",)
+    potential = defaultdict(int)
+    result_to_lineup = {}
+    lineup_to_result = {}
+    cost_of = {(r, l): c for r, adj in edges.items() for l, c in adj}
+
+    while True:
+        # Dijkstra from the source over the residual graph
+        dist = {SOURCE: 0}
+        prev = {}
+        heap = [(0, 0, SOURCE)]
+        counter = 1
+        done = set()
+        while heap:
+            d, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            if node == SINK:
+                break
+
+            if node == SOURCE:
+                out = [(("r", r), 0) for r in edges if r not in result_to_lineup]
+            elif node[0] == "r":
+                r = node[1]
+                out = [(("l", l), c) for l, c in edges[r] if result_to_lineup.get(r) != l]
+            else:
+                l = node[1]
+                if l in lineup_to_result:
+                    r = lineup_to_result[l]
+                    out = [(("r", r), -cost_of[(r, l)])]
+                else:
+                    out = [(SINK, 0)]
+
+            for nxt, c in out:
+                nd = d + c + potential[node] - potential[nxt]
+                if nxt not in done and nd < dist.get(nxt, nd + 1):
+                    dist[nxt] = nd
+                    prev[nxt] = node
+                    heapq.heappush(heap, (nd, counter, nxt))
+                    counter += 1
+
+        if SINK not in done:
+            break
+        path_cost = dist[SINK] + potential[SINK] - potential[SOURCE]
+        if path_cost >= UNMATCHED_COST:
+            break
+
+        # Keep reduced costs non-negative for the next round
+        for node in done:
+            potential[node] += dist[node] - dist[SINK]
+
+        # Flip the augmenting path: s -> r -> l -> r' -> l' ... -> t
+        node = prev[SINK]
+        while node != SOURCE:
+            l = node[1]
+            r = prev[node][1]
+            result_to_lineup[r] = l
+            lineup_to_result[l] = r
+            node = prev[prev[node]]
+
+    return result_to_lineup
+
+
+def assign_results_to_lineups(lineups: list[GameLineup], results: list[GameResult],
+                              used_lineup_ids: set = None) -> dict[int, GameLineup]:
+    """Pair results with lineups by minimum total cost instead of greedily.
+
+    Drop-in alternative to pair_results_with_lineups. Candidate links are
+    lineups within LINK_WINDOW_DAYS of the result whose teams match, costed by
+    date gap, team-name closeness and postseason agreement. The graph is split
+    into connected components (which date blocking keeps small) and each one
+    is solved exactly, so a result never loses its best lineup just because an
+    earlier result claimed it first.
+    """
+    if used_lineup_ids is None:
+        used_lineup_ids = set()
+
+    index = LineupIndex(lineups)
+    lineup_at = {}
+    edges = {}
+
+    for idx, result in enumerate(results):
+        ra = normalize_team_name(result.team_a)
+        rb = normalize_team_name(result.team_b)
+        if result.game_date:
+            nearby = _nearby_dates(result.game_date, LINK_WINDOW_DAYS)
+            result_day = datetime.fromisoformat(result.game_date).date() if nearby else None
+        else:
+            nearby, result_day = [""], None
+
+        adj = []
+        for date in nearby:
+            day_gap = (result_day - datetime.fromisoformat(date).date()).days if result_day else 0
+            for pos, lu, la, lb in index.by_date.get(date, ()):
+                if lu.comment_id in used_lineup_ids:
+                    continue
+                cost = _assignment_cost(index, result, ra, rb, lu, la, lb, day_gap)
+                if cost is not None and cost < UNMATCHED_COST:
+                    adj.append((pos, cost))
+                    lineup_at[pos] = lu
+        if adj:
+            edges[idx] = adj
+
+    # Connected components (union-find over result and lineup nodes)
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for idx, adj in edges.items():
+        for pos, _ in adj:
+            parent[find(("r", idx))] = find(("l", pos))
+
+    components = defaultdict(dict)
+    for idx, adj in edges.items():
+        components[find(("r", idx))][idx] = adj
+
+    pairs = {}
+    for component in components.values():
+        for idx, pos in _min_cost_matching(component).items():
+            pairs[idx] = lineup_at[pos]
+            used_lineup_ids.add(lineup_at[pos].comment_id)
+
+    print(f"Assigned {len(pairs)} of {len(results)} results across {len(components)} components")
+    return pairs
+
+
+LINKERS = {
+    "greedy": pair_results_with_lineups,
+    "optimal": assign_results_to_lineups,
+}
+
+
+def build_complete_games(lineups: list[GameLineup], results: list[GameResult],
+                         pairs: dict[int, GameLineup]) -> list[CompleteGame]:
+    """Create complete games from results (paired or not) plus unmatched lineups."""
+    games = []
+    used_lineup_ids = {lu.comment_id for lu in pairs.values()}
+    game_id = 1
+
+    for idx, result in enumerate(results):
+        matched_lineup = pairs.get(idx)
+
+        if matched_lineup:
             # Determine if teams are in same order or swapped
             la_norm = normalize_team_name(matched_lineup.team_a)
             ra_norm = normalize_team_name(result.team_a)
@@ -1178,6 +937,12 @@ def link_results_to_lineups(lineups: list[GameLineup], results: list[GameResult]
     return games
 
 
+def link_results_to_lineups(lineups: list[GameLineup], results: list[GameResult],
+                            link_mode: str = "greedy") -> list[CompleteGame]:
+    """Link results to their corresponding lineups and create complete games."""
+    return build_complete_games(lineups, results, LINKERS[link_mode](lineups, results))
+
+
 # ============================================================================
 # MAIN PARSING PIPELINE
 # ============================================================================
@@ -1285,12 +1050,12 @@ def match_single_team_results(single_results: list[SingleTeamResult], lineups: l
         if sr.game_date:
             by_date[sr.game_date].append(sr)
 
-    # Also index lineups by date and teams for matching
-    lineups_by_date_teams = {}
+    # Also index lineups by date (with lowercased team names) for matching
+    lineups_by_date = defaultdict(list)
     for lu in lineups:
-        if lu.game_date and lu.team_a and lu.team_b:
-            key = (lu.game_date, frozenset([lu.team_a.lower(), lu.team_b.lower()]))
-            lineups_by_date_teams[key] = lu
+        if lu.game_date in by_date:
+            lineups_by_date[lu.game_date].append(
+                (lu, lu.team_a.lower() if lu.team_a else "", lu.team_b.lower() if lu.team_b else ""))
 
     used_result_ids = set()
 
@@ -1304,13 +1069,7 @@ def match_single_team_results(single_results: list[SingleTeamResult], lineups: l
             r1_team_lower = r1.team.lower()
 
             # Look for a matching opponent in lineups
-            for lu in lineups:
-                if lu.game_date != date:
-                    continue
-
-                lu_team_a = lu.team_a.lower() if lu.team_a else ""
-                lu_team_b = lu.team_b.lower() if lu.team_b else ""
-
+            for lu, lu_team_a, lu_team_b in lineups_by_date.get(date, ()):
                 # Check if r1 matches one of the lineup teams
                 opponent_team = None
                 if r1_team_lower == lu_team_a or r1_team_lower in lu_team_a or lu_team_a in r1_team_lower:
@@ -1416,90 +1175,631 @@ def extract_leaderboard_scores(text: str, game_date: str) -> dict:
     return scores
 
 
-def process_comments(comments: list[CommentRecord]) -> tuple[list[GameLineup], list[GameResult], dict, list[SingleTeamResult]]:
-    """Process all comments and extract lineups, results, leaderboard scores, and single-team results."""
+def process_thread(tid: int, thread_comments: list[CommentRecord]) -> tuple[list, list, list, list]:
+    """Extract everything from one thread (comments sorted by created_at).
+
+    Returns (lineups, results, single_team_results, leaderboard_updates), where
+    leaderboard_updates is an ordered list of (game_date, scores) pairs.
+    """
     lineups = []
     results = []
     single_team_results = []
-    leaderboard_scores = defaultdict(dict)  # date -> team -> score_info
+    leaderboard_updates = []
+
+    # Get thread root text for context
+    root_text = ""
+    for c in thread_comments:
+        if c.comment_id == tid:
+            root_text = c.plain_text
+            break
+
+    # Skip exhibition threads
+    if is_exhibition(root_text):
+        return lineups, results, single_team_results, leaderboard_updates
+
+    # Process each comment in thread
+    for c in thread_comments:
+        game_date = parse_timestamp_to_date(c.created_at_ts)
 
-    # Group by thread for context
+        # Skip exhibition comments
+        if is_exhibition(c.plain_text):
+            continue
+
+        # Try lineup extraction
+        lineup = extract_lineup(c, root_text)
+        if lineup:
+            lineups.append(lineup)
+            continue  # If it's a lineup, don't try other extractions
+
+        # Try result extraction
+        result = extract_result(c, root_text)
+        if result:
+            results.append(result)
+            continue
+
+        # Try single-team result extraction
+        single_result = extract_single_team_result(c)
+        if single_result:
+            single_team_results.append(single_result)
+            continue
+
+        # Also extract leaderboard scores for backup matching
+        content_type = detect_content_type(c.plain_text)
+        if content_type == "leaderboard" and game_date:
+            lb_scores = extract_leaderboard_scores(c.plain_text, game_date)
+            if lb_scores:
+                leaderboard_updates.append((game_date, lb_scores))
+
+    return lineups, results, single_team_results, leaderboard_updates
+
+
+def _process_thread_batch(batch: list[tuple[int, list[CommentRecord]]]) -> list[tuple]:
+    """Worker entry point: process a shard of threads in order."""
+    return [process_thread(tid, thread_comments) for tid, thread_comments in batch]
+
+
+def _iter_thread_outputs(threads: dict, workers: int) -> Iterator[tuple]:
+    """Yield process_thread output for every thread, in thread order."""
+    if workers <= 1 or len(threads) < 2:
+        for tid, thread_comments in threads.items():
+            yield process_thread(tid, thread_comments)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Several shards per worker keeps the pool busy when thread sizes vary
+    items = list(threads.items())
+    shard_size = max(1, len(items) // (workers * 4))
+    shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+    # map() returns shards in submission order, so merging is deterministic
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard_output in pool.map(_process_thread_batch, shards):
+            yield from shard_output
+
+
+def _group_threads(comments: Iterable[CommentRecord]) -> tuple[dict, int]:
+    """Group comments by thread root, each thread sorted by created_at."""
     threads = defaultdict(list)
+    comment_count = 0
     for c in comments:
         threads[c.thread_root_id].append(c)
+        comment_count += 1
 
     # Sort each thread by created_at
     for tid in threads:
         threads[tid].sort(key=lambda x: x.created_at_ts)
 
-    print(f"Processing {len(threads)} threads...")
+    return threads, comment_count
+
+
+def _merge_thread_outputs(outputs: Iterable[tuple]) -> tuple[list[GameLineup], list[GameResult], dict, list[SingleTeamResult]]:
+    """Concatenate per-thread outputs (in thread order) into pipeline inputs."""
+    lineups = []
+    results = []
+    single_team_results = []
+    leaderboard_scores = defaultdict(dict)  # date -> team -> score_info
+
+    for t_lineups, t_results, t_single, t_leaderboard in outputs:
+        lineups.extend(t_lineups)
+        results.extend(t_results)
+        single_team_results.extend(t_single)
+        for game_date, lb_scores in t_leaderboard:
+            leaderboard_scores[game_date].update(lb_scores)
+
+    print(f"Extracted {len(lineups)} lineups and {len(results)} results")
+    print(f"Extracted {len(single_team_results)} single-team results")
+    print(f"Extracted leaderboard scores for {len(leaderboard_scores)} dates")
+    return lineups, results, leaderboard_scores, single_team_results
+
+
+def process_comments(comments: Iterable[CommentRecord], workers: int = 1) -> tuple[list[GameLineup], list[GameResult], dict, list[SingleTeamResult]]:
+    """Process all comments and extract lineups, results, leaderboard scores, and single-team results.
+
+    `comments` may be a lazy iterator (e.g. from iter_sql_dump); records are
+    grouped into threads as they arrive. With workers > 1, threads are sharded
+    across a process pool and merged back in thread order, so the output is
+    identical to a serial run.
+    """
+    threads, comment_count = _group_threads(comments)
+
+    worker_note = f" with {workers} workers" if workers > 1 else ""
+    print(f"Processing {comment_count:,} comments in {len(threads)} threads{worker_note}...")
+
+    return _merge_thread_outputs(_iter_thread_outputs(threads, workers))
+
+
+# ============================================================================
+# INCREMENTAL CHECKPOINT
+# ============================================================================
+
+CHECKPOINT_VERSION = 2
+
+
+def code_fingerprint() -> str:
+    """Hash of this parser and rkl_extract, so a checkpoint written by older
+    extraction or linking code is discarded rather than reused."""
+    h = hashlib.blake2b(digest_size=8)
+    package_dir = Path(__file__).resolve().parent.parent / "rkl_extract"
+    for path in [Path(__file__).resolve(), *sorted(package_dir.glob("*.py"))]:
+        h.update(path.name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
 
+def comment_hash(comment: CommentRecord) -> str:
+    """Content hash used to detect new or edited comments between runs."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(comment.created_at_ts.encode("utf-8"))
+    h.update(b"\0")
+    h.update(comment.plain_text.encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_checkpoint(checkpoint_path: Path, date_range: Optional[tuple[str, str]],
+                    link_mode: str = "greedy") -> dict:
+    """Load a parse checkpoint, or return {} if missing or incompatible."""
+    if not checkpoint_path.exists():
+        print(f"No checkpoint at {checkpoint_path}, running full parse")
+        return {}
+
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read checkpoint ({e}), running full parse")
+        return {}
+
+    expected_range = list(date_range) if date_range else None
+    if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("code") != code_fingerprint():
+        print("Checkpoint was written by different parser code, running full parse")
+        return {}
+    if checkpoint.get("date_range") != expected_range or checkpoint.get("link_mode", "greedy") != link_mode:
+        print("Checkpoint was written for a different date range or link mode, running full parse")
+        return {}
+
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path: Path, date_range: Optional[tuple[str, str]],
+                    thread_entries: dict, links: dict, link_mode: str = "greedy"):
+    """Persist per-thread extraction results and result->lineup links."""
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "code": code_fingerprint(),
+        "date_range": list(date_range) if date_range else None,
+        "link_mode": link_mode,
+        "threads": thread_entries,
+        "links": links,
+    }
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, separators=(",", ":"))
+    tmp_path.replace(checkpoint_path)
+    print(f"Saved checkpoint for {len(thread_entries)} threads to {checkpoint_path}")
+
+
+def _thread_entry(comment_hashes: dict, output: tuple) -> dict:
+    """Serialize one thread's comment hashes and process_thread output."""
+    t_lineups, t_results, t_single, t_leaderboard = output
+    return {
+        "comments": comment_hashes,
+        "lineups": [asdict(lu) for lu in t_lineups],
+        "results": [asdict(r) for r in t_results],
+        "single": [asdict(sr) for sr in t_single],
+        "leaderboard": [[game_date, scores] for game_date, scores in t_leaderboard],
+    }
+
+
+def _thread_output_from_entry(entry: dict) -> tuple:
+    """Rebuild process_thread output from a checkpoint entry."""
+    return (
+        [GameLineup(**d) for d in entry["lineups"]],
+        [GameResult(**d) for d in entry["results"]],
+        [SingleTeamResult(**d) for d in entry["single"]],
+        [(game_date, scores) for game_date, scores in entry["leaderboard"]],
+    )
+
+
+def _entry_links(entry: dict) -> bool:
+    """Whether a checkpoint entry has anything the linker reads."""
+    return any(entry[key] for key in ("lineups", "results", "single"))
+
+
+def process_comments_incremental(comments: Iterable[CommentRecord], checkpoint: dict,
+                                 workers: int = 1) -> tuple:
+    """Like process_comments, but only re-extracts threads with new or changed comments.
+
+    Returns (lineups, results, leaderboard_scores, single_team_results,
+    thread_entries, links_changed), where thread_entries is the updated
+    checkpoint payload and links_changed says whether any lineups, results or
+    single-team results were added, changed or removed since the checkpoint.
+    """
+    previous = checkpoint.get("threads", {})
+    threads, comment_count = _group_threads(comments)
+
+    hashes = {}
+    dirty = {}
     for tid, thread_comments in threads.items():
-        # Get thread root text for context
-        root_text = ""
-        for c in thread_comments:
-            if c.comment_id == tid:
-                root_text = c.plain_text
-                break
+        key = str(tid)
+        hashes[key] = {str(c.comment_id): comment_hash(c) for c in thread_comments}
+        old_entry = previous.get(key)
+        if old_entry is None or old_entry["comments"] != hashes[key]:
+            dirty[tid] = thread_comments
 
-        # Skip exhibition threads
-        if is_exhibition(root_text):
-            continue
+    worker_note = f" with {workers} workers" if workers > 1 else ""
+    print(f"Processing {comment_count:,} comments in {len(threads)} threads: "
+          f"{len(dirty)} new or changed{worker_note}, {len(threads) - len(dirty)} from checkpoint")
 
-        # Process each comment in thread
-        for c in thread_comments:
-            game_date = parse_timestamp_to_date(c.created_at_ts)
+    fresh = dict(zip(dirty.keys(), _iter_thread_outputs(dirty, workers)))
 
-            # Skip exhibition comments
-            if is_exhibition(c.plain_text):
-                continue
+    links_changed = False
+    thread_entries = {}
+    outputs = []
+    for tid in threads:
+        key = str(tid)
+        if tid in fresh:
+            entry = _thread_entry(hashes[key], fresh[tid])
+            old_entry = previous.get(key)
+            if _entry_links(entry) or (old_entry and _entry_links(old_entry)):
+                links_changed = True
+            outputs.append(fresh[tid])
+        else:
+            entry = previous[key]
+            outputs.append(_thread_output_from_entry(entry))
+        thread_entries[key] = entry
+
+    # Threads that disappeared from the dump count as changed too
+    for key, entry in previous.items():
+        if key not in thread_entries and _entry_links(entry):
+            links_changed = True
+
+    lineups, results, leaderboard_scores, single_team_results = _merge_thread_outputs(outputs)
+    return lineups, results, leaderboard_scores, single_team_results, thread_entries, links_changed
+
+
+def link_results_incremental(lineups: list[GameLineup], results: list[GameResult],
+                             previous_links: dict, links_changed: bool,
+                             link_mode: str = "greedy") -> tuple[list[CompleteGame], dict]:
+    """Link results to lineups, reusing the checkpoint's links when they still hold.
+
+    Links depend only on the extracted lineups and results (the checkpoint's
+    code fingerprint pins the linker), so when none were added, changed or
+    removed and every result has a link recorded, the previous links are
+    exactly what a full run would produce. Otherwise every result is linked
+    again: both linkers let one claim move another result onto a lineup up to
+    2 * LINK_WINDOW_DAYS away, and that can cascade arbitrarily far, so
+    re-linking only results near a change cannot promise the full-run output.
+    Linking is cheap next to extraction, which the checkpoint still skips.
+    Returns (games, links) where links maps result comment_id -> lineup
+    comment_id (or None) for the next checkpoint.
+    """
+    lineups_by_id = {lu.comment_id: lu for lu in lineups}
+    carried = not links_changed and all(
+        str(r.comment_id) in previous_links
+        and (previous_links[str(r.comment_id)] is None or previous_links[str(r.comment_id)] in lineups_by_id)
+        for r in results)
+
+    if carried:
+        print(f"Kept {len(results)} links from checkpoint (no lineups or results changed)")
+        pairs = {idx: lineups_by_id[previous_links[str(result.comment_id)]]
+                 for idx, result in enumerate(results)
+                 if previous_links[str(result.comment_id)] is not None}
+    else:
+        print(f"Re-linking all {len(results)} results (lineups or results changed)")
+        pairs = LINKERS[link_mode](lineups, results)
 
-            # Try lineup extraction
-            lineup = extract_lineup(c, root_text)
-            if lineup:
-                lineups.append(lineup)
-                continue  # If it's a lineup, don't try other extractions
+    links = {
+        str(result.comment_id): (pairs[idx].comment_id if idx in pairs else None)
+        for idx, result in enumerate(results)
+    }
+    return build_complete_games(lineups, results, pairs), links
 
-            # Try result extraction
-            result = extract_result(c, root_text)
-            if result:
-                results.append(result)
-                continue
 
-            # Try single-team result extraction
-            single_result = extract_single_team_result(c)
-            if single_result:
-                single_team_results.append(single_result)
-                continue
+# ============================================================================
+# COLUMNAR OUTPUT
+# ============================================================================
 
-            # Also extract leaderboard scores for backup matching
-            content_type = detect_content_type(c.plain_text)
-            if content_type == "leaderboard" and game_date:
-                lb_scores = extract_leaderboard_scores(c.plain_text, game_date)
-                if lb_scores:
-                    leaderboard_scores[game_date].update(lb_scores)
+COLUMNAR_FORMATS = ("parquet", "arrow", "sqlite")
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "sqlite": ".sqlite"}
+# Output table name -> dataclass describing its rows
+PARSED_TABLES = {"games": CompleteGame, "lineups": GameLineup, "results": GameResult}
+# Fields holding lists; everything else is a scalar column
+NESTED_FIELDS = {"players_a", "players_b", "player_stats"}
+
+
+def _scalar_type(annotation) -> type:
+    """Unwrap Optional[X] to X."""
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    return args[0] if args else annotation
+
+
+def _arrow_schema(cls) -> "pa.Schema":
+    """Arrow schema for a dataclass, with rosters and player_stats kept nested."""
+    scalar_types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string()}
+    player_stat = pa.struct([
+        (name, scalar_types[_scalar_type(hint)])
+        for name, hint in typing.get_type_hints(PlayerStat).items()
+    ])
+    fields = []
+    for name, hint in typing.get_type_hints(cls).items():
+        if name == "player_stats":
+            fields.append(pa.field(name, pa.list_(player_stat)))
+        elif name in NESTED_FIELDS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(name, scalar_types[_scalar_type(hint)]))
+    return pa.schema(fields)
 
-    print(f"Extracted {len(lineups)} lineups and {len(results)} results")
-    print(f"Extracted {len(single_team_results)} single-team results")
-    print(f"Extracted leaderboard scores for {len(leaderboard_scores)} dates")
-    return lineups, results, leaderboard_scores, single_team_results
+
+def _write_sqlite_tables(path: Path, tables: dict[str, list[dict]]):
+    """Write each table to a stdlib SQLite file; nested fields are stored as JSON text."""
+    sql_types = {int: "INTEGER", float: "REAL", bool: "INTEGER", str: "TEXT"}
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            for name, rows in tables.items():
+                hints = typing.get_type_hints(PARSED_TABLES[name])
+                columns = list(hints)
+                column_defs = ", ".join(
+                    f"{c} TEXT" if c in NESTED_FIELDS else f"{c} {sql_types[_scalar_type(hints[c])]}"
+                    for c in columns
+                )
+                conn.execute(f"CREATE TABLE {name} ({column_defs})")
+                conn.executemany(
+                    f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    (
+                        tuple(json.dumps(row[c], ensure_ascii=False) if c in NESTED_FIELDS else row[c]
+                              for c in columns)
+                        for row in rows
+                    ),
+                )
+                conn.execute(f"CREATE INDEX idx_{name}_game_date ON {name}(game_date)")
+    finally:
+        conn.close()
+    tmp_path.replace(path)
+
+
+def write_columnar_outputs(output_dir: Path, tables: dict[str, list[dict]], fmt: str) -> str:
+    """Write parsed_<table> files in a columnar format next to the JSON outputs.
+
+    tables maps "games"/"lineups"/"results" to asdict() rows. parquet and arrow
+    need pyarrow; without it the SQLite fallback is written instead.
+    Returns the format actually written.
+    """
+    if fmt in ("parquet", "arrow") and not PYARROW_AVAILABLE:
+        print(f"⚠️  pyarrow not installed (pip install pyarrow), writing sqlite instead of {fmt}")
+        fmt = "sqlite"
+
+    if fmt == "sqlite":
+        path = output_dir / f"parsed_games{COLUMNAR_EXTENSIONS[fmt]}"
+        _write_sqlite_tables(path, tables)
+        print(f"Saved {', '.join(f'{len(rows)} {name}' for name, rows in tables.items())} to {path}")
+        return fmt
+
+    for name, rows in tables.items():
+        table = pa.Table.from_pylist(rows, schema=_arrow_schema(PARSED_TABLES[name]))
+        path = output_dir / f"parsed_{name}{COLUMNAR_EXTENSIONS[fmt]}"
+        if fmt == "parquet":
+            pq.write_table(table, path)
+        else:
+            # Arrow IPC file format, so readers can memory-map it
+            with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        print(f"Saved {len(rows)} {name} to {path}")
+    return fmt
+
+
+def _columnar_paths(output_dir: Path, fmt: str) -> list[Path]:
+    if fmt == "sqlite":
+        return [output_dir / f"parsed_games{COLUMNAR_EXTENSIONS[fmt]}"]
+    return [output_dir / f"parsed_{name}{COLUMNAR_EXTENSIONS[fmt]}" for name in PARSED_TABLES]
+
+
+def remove_stale_columnar_outputs(output_dir: Path, fmt: str):
+    """Delete the fmt files about to be rewritten, so a run that fails or falls
+    back to sqlite part way leaves none of the previous parse in that format.
+    Other formats are left alone; load_parsed_table skips them once they are
+    older than the JSON outputs."""
+    for path in _columnar_paths(output_dir, fmt):
+        if path.exists():
+            path.unlink()
+            print(f"Removed stale {path}")
+
+
+def load_parsed_table(output_dir: Path, name: str, columns: list[str] = None) -> list[dict]:
+    """Load parsed games/lineups/results as dicts, reading only the requested columns.
+
+    Uses the fastest output present in output_dir that is not older than
+    parsed_<name>.json (written on every run): parquet, arrow (memory-mapped),
+    sqlite, then the JSON itself.
+    """
+    output_dir = Path(output_dir)
+    json_path = output_dir / f"parsed_{name}.json"
+    json_mtime = json_path.stat().st_mtime
+
+    def current(path: Path) -> bool:
+        return path.exists() and path.stat().st_mtime >= json_mtime
+
+    if PYARROW_AVAILABLE:
+        parquet_path = output_dir / f"parsed_{name}.parquet"
+        if current(parquet_path):
+            return pq.read_table(parquet_path, columns=columns, memory_map=True).to_pylist()
+        arrow_path = output_dir / f"parsed_{name}.arrow"
+        if current(arrow_path):
+            with pa.memory_map(str(arrow_path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+                return (table.select(columns) if columns else table).to_pylist()
+
+    sqlite_path = output_dir / "parsed_games.sqlite"
+    if current(sqlite_path):
+        conn = sqlite3.connect(f"file:{sqlite_path}?mode=ro", uri=True)
+        try:
+            hints = typing.get_type_hints(PARSED_TABLES[name])
+            columns = columns or list(hints)
+            rows = conn.execute(f"SELECT {', '.join(columns)} FROM {name} ORDER BY rowid").fetchall()
+        finally:
+            conn.close()
+        bool_columns = {c for c in columns if _scalar_type(hints[c]) is bool}
+        return [
+            {
+                c: (json.loads(v) if c in NESTED_FIELDS else bool(v) if c in bool_columns and v is not None else v)
+                for c, v in zip(columns, row)
+            }
+            for row in rows
+        ]
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    if columns:
+        rows = [{c: row.get(c) for c in columns} for row in rows]
+    return rows
 
 
-def run_parser(sql_path: Path, output_dir: Path, date_range: tuple[str, str] = None):
-    """Run the complete parsing pipeline."""
+# ============================================================================
+# RKL.DB SINK
+# ============================================================================
 
-    # Parse SQL dump
-    comments = parse_sql_dump(sql_path)
+# Written to manual_extract.notes so batch rows can be told apart from rows
+# created in the review UI ("auto-extracted" or hand-entered)
+BATCH_PARSED_NOTE = "batch-parsed"
+
+MANUAL_EXTRACT_COLUMNS = (
+    "thread_id", "comment_id", "source", "kind", "game_date", "team_a", "team_b",
+    "mentions", "notes", "raw_text", "captain_a", "captain_b", "mentions_a", "mentions_b",
+    "seed_a", "seed_b", "round_name", "score_a", "score_b", "winner", "adjustment_a", "adjustment_b",
+)
+
+
+def _manual_extract_row(game: CompleteGame, raw_text: dict[int, str]) -> tuple:
+    """One manual_extract row for a game, in MANUAL_EXTRACT_COLUMNS order.
+
+    Mirrors what the review UI stores: a lineup row that carries its linked
+    result's scores, or a standalone result row when no lineup was found.
+    """
+    if game.lineup_comment_id is not None:
+        comment_id, thread_id, kind = game.lineup_comment_id, game.lineup_thread_id, "lineup"
+    else:
+        comment_id, thread_id, kind = game.result_comment_id, game.result_thread_id, "result"
+    return (
+        thread_id, comment_id,
+        "feed" if comment_id == thread_id else "replies",
+        kind, game.game_date, game.team_a, game.team_b,
+        "", BATCH_PARSED_NOTE, raw_text.get(comment_id, ""),
+        game.captain_a, game.captain_b,
+        ", ".join(game.players_a) or None, ", ".join(game.players_b) or None,
+        game.seed_a, game.seed_b, game.round_name,
+        game.score_a, game.score_b, game.winner, game.adjustment_a, game.adjustment_b,
+    )
+
+
+def write_to_rkl_db(db_path: Path, games: list[CompleteGame], lineups: list[GameLineup],
+                    results: list[GameResult]) -> tuple[int, int, int, int]:
+    """Upsert parsed games into rkl.db's manual_extract table in one transaction.
+
+    Rows previously written by this function (notes = BATCH_PARSED_NOTE) are
+    updated in place so their ids stay stable, and deleted if this run no
+    longer produces their comment (e.g. a result now merged into its lineup);
+    comments that already have a row from the review UI are left alone.
+    Returns (inserted, updated, kept, removed).
+    """
+    raw_text = {lu.comment_id: lu.raw_text for lu in lineups}
+    raw_text.update((r.comment_id, r.raw_text) for r in results)
+
+    con = sqlite3.connect(db_path)
+    try:
+        con.execute("PRAGMA journal_mode=WAL")
+        init_review_schema(con)
+
+        existing = {}
+        for row_id, comment_id, notes in con.execute("SELECT id, comment_id, notes FROM manual_extract"):
+            if comment_id not in existing or notes != BATCH_PARSED_NOTE:
+                existing[comment_id] = (row_id, notes)
+
+        inserts, updates, kept = [], [], 0
+        seen = set()
+        for game in games:
+            row = _manual_extract_row(game, raw_text)
+            if row[1] is None or row[1] in seen:
+                continue
+            seen.add(row[1])
+            match = existing.get(row[1])
+            if match is None:
+                inserts.append(row)
+            elif match[1] == BATCH_PARSED_NOTE:
+                updates.append(row + (match[0],))
+            else:
+                kept += 1
+
+        with con:
+            con.executemany(
+                f"INSERT INTO manual_extract(created_at, {', '.join(MANUAL_EXTRACT_COLUMNS)}) "
+                f"VALUES (datetime('now'), {', '.join('?' * len(MANUAL_EXTRACT_COLUMNS))})",
+                inserts,
+            )
+            con.executemany(
+                f"UPDATE manual_extract SET {', '.join(f'{c} = ?' for c in MANUAL_EXTRACT_COLUMNS)} WHERE id = ?",
+                updates,
+            )
+            # Batch rows from earlier runs that this run no longer produces
+            stale_ids = [row_id for (row_id,) in con.execute(
+                "SELECT id FROM manual_extract WHERE notes = ? "
+                "AND (comment_id IS NULL OR comment_id NOT IN (SELECT value FROM json_each(?)))",
+                (BATCH_PARSED_NOTE, json.dumps(sorted(seen))))]
+            if stale_ids:
+                stale_json = json.dumps(stale_ids)
+                con.execute("UPDATE manual_extract SET linked_extract_id = NULL "
+                            "WHERE linked_extract_id IN (SELECT value FROM json_each(?))", (stale_json,))
+                con.execute("DELETE FROM manual_extract WHERE id IN (SELECT value FROM json_each(?))",
+                            (stale_json,))
+            # Updates can rename teams, so recount rather than adjust
+            rebuild_team_aliases(con)
+    finally:
+        con.close()
+
+    print(f"Wrote games to {db_path}: {len(inserts)} inserted, {len(updates)} updated, "
+          f"{len(stale_ids)} removed, {kept} kept from the review UI")
+    return len(inserts), len(updates), kept, len(stale_ids)
+
+
+def run_parser(sql_path: Path, output_dir: Path, date_range: tuple[str, str] = None,
+               workers: int = 1, checkpoint_path: Path = None, link_mode: str = "greedy",
+               columnar_format: Optional[str] = None, db_path: Optional[Path] = None):
+    """Run the complete parsing pipeline.
+
+    link_mode picks the result->lineup linker: "greedy" (first claim wins) or
+    "optimal" (minimum-cost assignment, see assign_results_to_lineups).
+    columnar_format additionally writes parquet, arrow or sqlite copies of the
+    JSON outputs (see write_columnar_outputs). db_path upserts the games into
+    that rkl.db for the review app (see write_to_rkl_db).
+
+    If checkpoint_path is given, runs incrementally: threads whose comments are
+    unchanged since the checkpoint are restored rather than re-extracted, links
+    are reused if no lineups or results changed (see link_results_incremental),
+    and the checkpoint is rewritten. The output is the same as a full run's.
+    """
+
+    # Stream the SQL dump; records feed straight into thread grouping
+    comments = iter_sql_dump(sql_path)
 
     # Filter by date range if specified
     if date_range:
         start_date, end_date = date_range
         print(f"Filtering to date range: {start_date} to {end_date}")
-        comments = [c for c in comments if start_date <= c.created_at_ts[:10] <= end_date]
-        print(f"Filtered to {len(comments)} comments in date range")
+        comments = (c for c in comments if start_date <= c.created_at_ts[:10] <= end_date)
 
     # Extract lineups, results, leaderboard scores, and single-team results
-    lineups, results, leaderboard_scores, single_team_results = process_comments(comments)
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = load_checkpoint(checkpoint_path, date_range, link_mode)
+        (lineups, results, leaderboard_scores, single_team_results,
+         thread_entries, links_changed) = process_comments_incremental(comments, checkpoint, workers)
+    else:
+        lineups, results, leaderboard_scores, single_team_results = process_comments(comments, workers)
 
     # Match single-team results into paired game results
     matched_single_results = match_single_team_results(single_team_results, lineups)
@@ -1508,7 +1808,14 @@ def run_parser(sql_path: Path, output_dir: Path, date_range: tuple[str, str] = N
         results.extend(matched_single_results)
 
     # Link and create complete games
-    games = link_results_to_lineups(lineups, results)
+    if checkpoint:
+        games, links = link_results_incremental(lineups, results, checkpoint.get("links", {}),
+                                                links_changed, link_mode)
+    else:
+        pairs = LINKERS[link_mode](lineups, results)
+        games = build_complete_games(lineups, results, pairs)
+        links = {str(r.comment_id): (pairs[i].comment_id if i in pairs else None)
+                 for i, r in enumerate(results)}
 
     # Fill in missing scores from leaderboard data
     games_filled = 0
@@ -1555,24 +1862,37 @@ def run_parser(sql_path: Path, output_dir: Path, date_range: tuple[str, str] = N
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    tables = {
+        "games": [asdict(g) for g in games],
+        "lineups": [asdict(lu) for lu in lineups],
+        "results": [asdict(r) for r in results],
+    }
+
     # Save outputs
     games_path = output_dir / "parsed_games.json"
     with open(games_path, 'w', encoding='utf-8') as f:
-        json.dump([asdict(g) for g in games], f, indent=2, ensure_ascii=False)
+        json.dump(tables["games"], f, indent=2, ensure_ascii=False)
     print(f"Saved {len(games)} games to {games_path}")
 
     # Save lineups separately
     lineups_path = output_dir / "parsed_lineups.json"
     with open(lineups_path, 'w', encoding='utf-8') as f:
-        json.dump([asdict(lu) for lu in lineups], f, indent=2, ensure_ascii=False)
+        json.dump(tables["lineups"], f, indent=2, ensure_ascii=False)
     print(f"Saved {len(lineups)} lineups to {lineups_path}")
 
     # Save results separately
     results_path = output_dir / "parsed_results.json"
     with open(results_path, 'w', encoding='utf-8') as f:
-        json.dump([asdict(r) for r in results], f, indent=2, ensure_ascii=False)
+        json.dump(tables["results"], f, indent=2, ensure_ascii=False)
     print(f"Saved {len(results)} results to {results_path}")
 
+    if columnar_format:
+        remove_stale_columnar_outputs(output_dir, columnar_format)
+        write_columnar_outputs(output_dir, tables, columnar_format)
+
+    if db_path:
+        write_to_rkl_db(db_path, games, lineups, results)
+
     # Save CSV summary
     csv_path = output_dir / "parsed_games.csv"
     with open(csv_path, 'w', encoding='utf-8', newline='') as f:
@@ -1600,6 +1920,9 @@ def run_parser(sql_path: Path, output_dir: Path, date_range: tuple[str, str] = N
             ])
     print(f"Saved CSV summary to {csv_path}")
 
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, date_range, thread_entries, links, link_mode)
+
     # Print summary
     print("\n" + "="*60)
     print("PARSING COMPLETE")
@@ -1636,6 +1959,18 @@ def main():
                         help="Start date filter (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=str, default=None,
                         help="End date filter (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for per-thread extraction (default: 1, serial)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-extract threads changed since the last checkpoint")
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="Checkpoint file for --incremental (default: <output-dir>/parse_checkpoint.json)")
+    parser.add_argument("--columnar", choices=COLUMNAR_FORMATS, default=None,
+                        help="Also write parquet/arrow (needs pyarrow) or sqlite copies of the JSON outputs")
+    parser.add_argument("--db", type=str, default=None,
+                        help="Also upsert parsed games into this rkl.db (manual_extract table)")
+    parser.add_argument("--link-mode", choices=sorted(LINKERS), default="greedy",
+                        help="How results are linked to lineups: greedy (default) or optimal (min-cost assignment)")
 
     args = parser.parse_args()
 
@@ -1650,7 +1985,13 @@ def main():
     if args.start_date and args.end_date:
         date_range = (args.start_date, args.end_date)
 
-    run_parser(sql_path, output_dir, date_range)
+    checkpoint_path = None
+    if args.incremental:
+        checkpoint_path = Path(args.checkpoint) if args.checkpoint else output_dir / "parse_checkpoint.json"
+
+    run_parser(sql_path, output_dir, date_range, workers=args.workers, checkpoint_path=checkpoint_path,
+               link_mode=args.link_mode, columnar_format=args.columnar,
+               db_path=Path(args.db) if args.db else None)
     return 0
 
 
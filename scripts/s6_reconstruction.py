@@ -31,6 +31,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from difflib import SequenceMatcher
 
+from karma_store import KARMA_STORE_PATH, KarmaStore
+
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -143,7 +145,8 @@ class S6Reconstructor:
                  supabase_url: str = None,
                  supabase_key: str = None,
                  rank_tolerance: int = 50,
-                 data_dir: str = None):
+                 data_dir: str = None,
+                 karma_store_path: Optional[str] = KARMA_STORE_PATH):
         """
         Initialize the reconstructor.
 
@@ -152,6 +155,7 @@ class S6Reconstructor:
             supabase_key: Supabase API key (anon or service role)
             rank_tolerance: Tolerance for rank-based matching (±ranks)
             data_dir: Directory containing data files (default: script directory)
+            karma_store_path: Local karma store read before Supabase (None disables)
         """
         self.data_dir = data_dir or SCRIPT_DIR
         self.output_dir = os.path.join(self.data_dir, "output")
@@ -166,6 +170,7 @@ class S6Reconstructor:
                 print("✅ Connected to Supabase")
             except Exception as e:
                 print(f"❌ Supabase connection failed: {e}")
+        self.karma_store = KarmaStore(karma_store_path) if karma_store_path else None
 
         # Data containers
         self.games: List[dict] = []
@@ -199,25 +204,33 @@ class S6Reconstructor:
 
         return True
 
-    def fetch_karma_for_date(self, date_str: str) -> Dict[str, dict]:
+    def fetch_karma_for_date(self, date_str: str, entries: List[dict] = None) -> Dict[str, dict]:
         """
-        Fetch all karma rankings for a date from Supabase.
+        Fetch all karma rankings for a date, from the local karma store if it
+        has the date fresh, otherwise from Supabase. entries, if given, are
+        the day's rows already loaded from the store.
         Returns: user_id -> {amount, rank, username}
         """
         if date_str in self.karma_cache:
             return self.karma_cache[date_str]
 
-        if not self.supabase:
+        if entries is None and self.karma_store:
+            entries = self.karma_store.load_day(date_str)
+        if entries is None and not self.supabase:
             return {}
 
         try:
-            response = self.supabase.table("karma_rankings") \
-                .select("user_id, username, amount, rank") \
-                .eq("scrape_date", date_str) \
-                .execute()
+            if entries is None:
+                response = self.supabase.table("karma_rankings") \
+                    .select("user_id, username, amount, rank") \
+                    .eq("scrape_date", date_str) \
+                    .execute()
+                entries = response.data
+                if self.karma_store and entries:
+                    self.karma_store.save_day(date_str, entries)
 
             karma_map = {}
-            for entry in response.data:
+            for entry in entries:
                 user_id = entry["user_id"]
                 username = entry.get("username", "").lower().strip()
 
@@ -241,10 +254,11 @@ class S6Reconstructor:
     def prefetch_karma_data(self):
         """Pre-fetch karma data for all game dates."""
         dates = set(game["game_date"] for game in self.games)
-        print(f"\n📅 Pre-fetching karma data for {len(dates)} dates...")
+        stored = self.karma_store.load_days(dates) if self.karma_store else {}
+        print(f"\n📅 Pre-fetching karma data for {len(dates)} dates ({len(stored)} from the karma store)...")
 
         for i, date_str in enumerate(sorted(dates)):
-            data = self.fetch_karma_for_date(date_str)
+            data = self.fetch_karma_for_date(date_str, stored.get(date_str))
             print(f"  [{i+1}/{len(dates)}] {date_str}: {len(data)} entries")
 
     def match_direct(self, player_id: str, game_date: str) -> Optional[dict]:
@@ -572,21 +586,24 @@ def main():
     parser.add_argument("--rank-tolerance", type=int, default=50)
     parser.add_argument("--games-file", default="s6-games-enhanced.json")
     parser.add_argument("--handle-map", default="s6-handle-to-id.json")
+    parser.add_argument("--karma-store", default=KARMA_STORE_PATH,
+                        help="Local karma store read before Supabase (see karma_store.py)")
 
     args = parser.parse_args()
 
     url = args.supabase_url or os.environ.get("SUPABASE_URL")
     key = args.supabase_key or os.environ.get("SUPABASE_KEY")
 
-    if not url or not key:
-        print("❌ Supabase credentials required.")
+    if (not url or not key) and not os.path.exists(args.karma_store):
+        print("❌ Supabase credentials or a local karma store required.")
         print("   Set SUPABASE_URL and SUPABASE_KEY environment variables.")
         return 1
 
     reconstructor = S6Reconstructor(
         supabase_url=url,
         supabase_key=key,
-        rank_tolerance=args.rank_tolerance
+        rank_tolerance=args.rank_tolerance,
+        karma_store_path=args.karma_store
     )
 
     if not reconstructor.load_data(args.games_file, args.handle_map):